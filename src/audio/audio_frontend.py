@@ -0,0 +1,188 @@
+"""
+Audio Front-End - STT oncesi ortak ses hazirligi
+================================================
+Gradio mikrofonu, konsol kaydi ve dosyadan okuma ayni yoldan gecer:
+
+- int16/int32 -> float32 donusumu tek tampon, olcekleme yerinde
+- Stereo -> mono indirgeme ara kopya olmadan (mean(dtype=float32))
+- 44.1/48 kHz -> 16 kHz polyphase resample_poly, FIR katsayilari oran basina cache'li
+- Zaten 16 kHz mono float32 olan veri kopyalanmaz
+"""
+
+from functools import lru_cache
+from math import gcd
+from typing import Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+try:
+    from scipy import signal
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+# Whisper'in bekledigi ornekleme hizi
+TARGET_SAMPLE_RATE = 16000
+
+# Tamsayi PCM -> [-1, 1] olcekleri
+_INT_SCALES = {
+    np.dtype(np.int16): 1.0 / 32768.0,
+    np.dtype(np.int32): 1.0 / 2147483648.0,
+    np.dtype(np.int8): 1.0 / 128.0,
+    np.dtype(np.uint8): 1.0 / 128.0,  # 8-bit WAV: 128 merkezli
+}
+
+
+@lru_cache(maxsize=16)
+def _polyphase_taps(up: int, down: int) -> np.ndarray:
+    """
+    resample_poly icin alcak geciren FIR (scipy varsayilani ile ayni tasarim)
+
+    44.1k -> 16k (160/441) icin ~8800 katsayi; her cagrida yeniden
+    tasarlamak yerine oran basina bir kez hesaplanir.
+    """
+    max_rate = max(up, down)
+    half_len = 10 * max_rate
+    taps = signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+    taps = taps.astype(np.float32)
+    taps.flags.writeable = False
+    return taps
+
+
+def to_mono_float32(data: np.ndarray) -> np.ndarray:
+    """
+    PCM verisini mono float32 [-1, 1] araligina getir
+
+    Args:
+        data: (n,) veya (n, kanal) -- int16/int32/int8/uint8/float
+
+    Returns:
+        Mono float32 dizi (girdi zaten mono float32 ise ayni nesne)
+    """
+
+    data = np.asarray(data)
+    scale = _INT_SCALES.get(data.dtype)
+    unsigned = data.dtype == np.uint8
+    owned = False
+
+    if data.ndim > 1:
+        if data.shape[1] == 1:
+            data = data[:, 0]
+        else:
+            # Tek cikis tamponu, float64 ara dizi yok
+            data = data.mean(axis=1, dtype=np.float32)
+            owned = True
+
+    if data.dtype != np.float32:
+        data = data.astype(np.float32)
+        owned = True
+
+    if unsigned:
+        data -= 128.0
+    if scale is not None:
+        if not owned:
+            data = data.copy()
+        data *= scale
+
+    return data
+
+
+def resample(data: np.ndarray, sample_rate: int, target_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """
+    Mono float32 sesi hedef hiza donustur (polyphase FIR)
+
+    Args:
+        data: Mono float32 dizi
+        sample_rate: Kaynak hiz
+        target_rate: Hedef hiz
+
+    Returns:
+        Yeniden orneklenmis float32 dizi (hiz ayniysa girdi aynen)
+    """
+
+    if sample_rate == target_rate or data.size == 0:
+        return data
+
+    factor = gcd(int(sample_rate), int(target_rate))
+    up, down = target_rate // factor, sample_rate // factor
+
+    if SCIPY_AVAILABLE:
+        out = signal.resample_poly(data, up, down, window=_polyphase_taps(up, down))
+        return out.astype(np.float32, copy=False)
+
+    # scipy yoksa: dogrusal interpolasyon (vektorel, kalite daha dusuk)
+    n_out = int(round(data.size * target_rate / sample_rate))
+    positions = np.arange(n_out, dtype=np.float64) * (sample_rate / target_rate)
+    return np.interp(positions, np.arange(data.size), data).astype(np.float32)
+
+
+def prepare_audio(
+    data: np.ndarray,
+    sample_rate: int,
+    target_rate: int = TARGET_SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Ham PCM -> Whisper girdisi (mono, float32, 16 kHz, C-contiguous)
+
+    Args:
+        data: Mikrofon/dosya verisi
+        sample_rate: Kaynak hiz
+
+    Returns:
+        Hazir ses dizisi
+    """
+
+    mono = resample(to_mono_float32(data), sample_rate, target_rate)
+    return np.ascontiguousarray(mono)
+
+
+def load_audio(path: str, target_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """
+    Ses dosyasini dogrudan float32 olarak oku ve hazirla
+
+    Args:
+        path: .wav/.flac/.ogg dosya yolu
+
+    Returns:
+        Mono float32 16 kHz dizi
+    """
+
+    import soundfile as sf
+
+    # float64 ara tampon yerine dogrudan float32 decode
+    data, sr = sf.read(path, dtype='float32', always_2d=False)
+    return prepare_audio(data, sr, target_rate)
+
+
+def peak_level(data: np.ndarray) -> float:
+    """Tepe genlik -- np.abs(data) gecici dizisi olmadan"""
+    if data.size == 0:
+        return 0.0
+    return float(max(data.max(), -data.min()))
+
+
+def rms_level(data: np.ndarray) -> float:
+    """RMS genlik (ara kare dizisi olmadan, BLAS dot)"""
+    if data.size == 0:
+        return 0.0
+    flat = data.reshape(-1)
+    return float(np.sqrt(np.dot(flat, flat) / flat.size))
+
+
+def split_gradio_audio(audio: Optional[Tuple[int, np.ndarray]]) -> Optional[np.ndarray]:
+    """
+    Gradio (sample_rate, data) demetini hazir sese cevir
+
+    Returns:
+        Mono float32 16 kHz dizi veya None
+    """
+
+    if audio is None:
+        return None
+    sample_rate, data = audio
+    if data is None or np.size(data) == 0:
+        logger.warning("Bos ses girdisi")
+        return None
+    return prepare_audio(data, sample_rate)
@@ -0,0 +1,200 @@
+"""
+Barge-in - Asistan konusurken araya girme
+=========================================
+Cevap uretilirken/okunurken mikrofon arka planda dinlenir. Kullanici
+konusmaya baslayinca:
+
+- on_barge_in cagrilir (TTSEngine.stop + LLMManager.cancel): oynatma,
+  kuyruktaki TTS cumleleri ve akan Ollama cevabi hemen kesilir
+- Kullanicinin yeni cumlesi (pre-roll dahil) kaydedilmeye devam eder ve
+  sessizlik gelince wait_utterance() ile bir sonraki tura verilir
+
+Ayni dinleyici surekli sesli modda capture() ile VAD uc noktali kayit icin
+de kullanilir (sabit 5 sn yerine konusma bitince durur).
+
+Not: Yanki engelleme yok; hoparlor sesi mikrofona doluyorsa energy_threshold
+yukseltilmeli (kulaklikla en iyi calisir).
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+import numpy as np
+import sounddevice as sd
+from loguru import logger
+
+from .audio_frontend import TARGET_SAMPLE_RATE, rms_level
+from .vad import FRAME_MS
+
+
+class BargeInListener:
+    """Arka plan VAD dinleyicisi (sounddevice InputStream callback'i ile)"""
+
+    def __init__(self, config: dict, on_barge_in: Callable[[], None], vad=None):
+        self.config = config.get('ui', {}).get('voice', {}).get('barge_in', {})
+        self.enabled = self.config.get('enabled', True)
+        self.on_barge_in = on_barge_in
+        self.vad = vad
+
+        self.sample_rate = TARGET_SAMPLE_RATE
+        self.frame_size = self.sample_rate * FRAME_MS // 1000
+        self.energy_threshold = self.config.get('energy_threshold', 0.02)
+        self.min_speech_frames = self._frames(self.config.get('min_speech_ms', 240))
+        self.end_silence_frames = self._frames(self.config.get('end_silence_ms', 800))
+        self.max_frames = self._frames(self.config.get('max_utterance_sec', 15) * 1000)
+        # wait_utterance icin ust sinir (max_frames dolunca cumle zaten biter)
+        self.utterance_timeout = self.config.get('max_utterance_sec', 15) + 1
+
+        self._preroll = deque(maxlen=self._frames(self.config.get('preroll_ms', 300)))
+        self._utterance: List[np.ndarray] = []
+        self._speech_run = 0
+        self._silence_run = 0
+        self._stream = None
+
+        self.triggered = threading.Event()
+        self.utterance_done = threading.Event()
+        self.triggered_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+
+    @staticmethod
+    def _frames(ms: float) -> int:
+        return max(1, int(-(-ms // FRAME_MS)))
+
+    def _is_speech(self, frame: np.ndarray) -> bool:
+        """Enerji kapisi, gecerse (varsa) webrtcvad"""
+        if rms_level(frame) < self.energy_threshold:
+            return False
+        if self.vad is None:
+            return True
+        pcm = (np.clip(frame, -1.0, 1.0) * 32767).astype(np.int16)
+        return self.vad.is_speech(pcm.tobytes(), self.sample_rate)
+
+    def feed(self, frame: np.ndarray):
+        """
+        Tek kare isle (FRAME_MS, mono float32)
+
+        Args:
+            frame: Mikrofon karesi (callback tamponu, kopyalanir)
+        """
+        if self.utterance_done.is_set():
+            return
+
+        speech = self._is_speech(frame)
+
+        if not self.triggered.is_set():
+            self._preroll.append(frame.copy())
+            self._speech_run = self._speech_run + 1 if speech else 0
+            if self._speech_run >= self.min_speech_frames:
+                self._trigger()
+            return
+
+        self._utterance.append(frame.copy())
+        self._silence_run = 0 if speech else self._silence_run + 1
+        if self._silence_run >= self.end_silence_frames or len(self._utterance) >= self.max_frames:
+            self.ended_at = time.perf_counter()
+            self.utterance_done.set()
+
+    def _trigger(self):
+        """Konusma dogrulandi: cikisi kes, kaydi pre-roll ile baslat"""
+        self._utterance = list(self._preroll)
+        self.triggered_at = time.perf_counter()
+        self.triggered.set()
+        logger.info("Kullanici konusmaya basladi")
+        try:
+            self.on_barge_in()
+        except Exception as e:
+            logger.error(f"Barge-in callback hatasi: {e}")
+
+    def _callback(self, indata, frames, time_info, status):
+        self.feed(indata[:, 0])
+
+    def start(self):
+        """Dinlemeye basla (mikrofon acilamazsa barge-in devre disi kalir)"""
+        self._reset()
+        if self.enabled:
+            self._open_stream()
+
+    def _reset(self):
+        self._preroll.clear()
+        self._utterance = []
+        self._speech_run = 0
+        self._silence_run = 0
+        self.triggered.clear()
+        self.utterance_done.clear()
+        self.triggered_at = None
+        self.ended_at = None
+
+    def _open_stream(self):
+        try:
+            self._stream = sd.InputStream(
+                samplerate=self.sample_rate,
+                channels=1,
+                dtype='float32',
+                blocksize=self.frame_size,
+                callback=self._callback
+            )
+            self._stream.start()
+        except Exception as e:
+            logger.warning(f"Barge-in dinleyici baslatilamadi: {e}")
+            self._stream = None
+
+    def stop(self):
+        """Mikrofonu kapat"""
+        if self._stream is None:
+            return
+        try:
+            self._stream.stop()
+            self._stream.close()
+        except Exception as e:
+            logger.warning(f"Barge-in dinleyici kapatma hatasi: {e}")
+        self._stream = None
+
+    def wait_utterance(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Araya giren cumlenin bitmesini bekle
+
+        Args:
+            timeout: En fazla bekleme (saniye)
+
+        Returns:
+            16 kHz mono ses (pre-roll dahil) veya barge-in olmadiysa None
+        """
+        if not self.triggered.is_set():
+            return None
+        self.utterance_done.wait(timeout)
+        self.stop()
+        if not self._utterance:
+            return None
+        return np.concatenate(self._utterance)
+
+    def capture(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Konusma baslayana kadar dinle, sessizlik gelince kaydi dondur
+
+        Args:
+            timeout: Konusmanin baslamasi icin en fazla bekleme (None = sinirsiz)
+
+        Returns:
+            16 kHz mono ses veya zaman asiminda None
+        """
+        # barge_in.enabled kapali olsa da kayit icin mikrofon acilir
+        self._reset()
+        self._open_stream()
+        if self._stream is None:
+            return None
+        if not self.triggered.wait(timeout):
+            self.stop()
+            return None
+        return self.wait_utterance(timeout=self.utterance_timeout)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        # Tetiklendiyse cumle wait_utterance() ile alinana kadar kayit surer
+        if not self.triggered.is_set():
+            self.stop()
+        return False
@@ -3,12 +3,22 @@ STT Engine - Faster-Whisper Optimized
 INT8 quantization ile 8GB VRAM'de sorunsuz çalışır
 """
 
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
 import numpy as np
 import sounddevice as sd
-import soundfile as sf
-from typing import Optional
 from loguru import logger
 
+from .audio_frontend import TARGET_SAMPLE_RATE, load_audio, prepare_audio, rms_level
+from .transcript_cache import TranscriptCache
+from .vad import apply_vad, speech_ratio
+from .wake_word import WakeWordGate
+
 try:
     from faster_whisper import WhisperModel
     WHISPER_AVAILABLE = True
@@ -16,6 +26,9 @@ except ImportError:
     WHISPER_AVAILABLE = False
     logger.warning("Faster-Whisper yüklü değil! pip install faster-whisper")
 
+# Toplu transkripsiyon girdisi: dosya yolu, 16 kHz dizi veya (sample_rate, dizi)
+BatchItem = Union[str, Path, np.ndarray, Tuple[int, np.ndarray]]
+
 
 class STTEngine:
     """Optimized Speech-to-Text"""
@@ -32,12 +45,35 @@ class STTEngine:
         except ImportError:
             logger.warning("webrtcvad yüklü değil, VAD devre dışı")
             self.vad_available = False
+        
+        # VAD kirpma: enerji kapisi + konusma bolgesi payi
+        self.vad_params = {
+            'energy_threshold': self.config.get('vad_energy_threshold', 0.005),
+            'hangover_ms': self.config.get('vad_hangover_ms', 300),
+            'preroll_ms': self.config.get('vad_preroll_ms', 90),
+        }
+        # Sadece etkilesimli transcribe() yazar (toplu is parcaciklari degil)
+        self.last_vad_regions = []
+        
+        # Toplu transkripsiyon: WhisperModel(num_workers) ile ayni sayida is parcacigi
+        self.num_workers = max(1, int(self.config.get('num_workers', 1)))
+        
+        # Ayni kayit tekrar gelirse Whisper calistirilmaz (model de yuklenmez)
+        self.transcript_cache = TranscriptCache(self.config)
+        self._model_lock = threading.Lock()
+        
+        # Surekli dinlemede hitap edilmeyen ses tam modele gitmez
+        self.wake_gate = WakeWordGate(
+            self.config, model_manager,
+            vad=self.vad if self.vad_available else None,
+            vad_params=self.vad_params
+        )
     
     def transcribe(
         self,
         audio_path: Optional[str] = None,
         audio_array: Optional[np.ndarray] = None,
-        sample_rate: int = 16000
+        sample_rate: int = TARGET_SAMPLE_RATE
     ) -> str:
         """
         Ses → Metin
@@ -55,55 +91,169 @@ class STTEngine:
             logger.error("Faster-Whisper yüklü değil!")
             return ""
         
-        # Model yükle
-        model = self.model_manager.load_model("stt")
+        # Ses dosyasını yükle (ortak front-end: mono float32 16 kHz)
+        audio = self._load_input(audio_path, audio_array, sample_rate)
         
-        # Ses dosyasını yükle
-        if audio_path:
-            audio, sr = sf.read(audio_path)
-            if sr != 16000:
-                # Resample gerekirse
-                try:
-                    from scipy import signal
-                    audio = signal.resample(audio, int(len(audio) * 16000 / sr))
-                except ImportError:
-                    logger.warning("scipy yüklü değil, resampling yapılamıyor")
-        elif audio_array is not None:
-            audio = audio_array
-        else:
-            raise ValueError("audio_path veya audio_array gerekli")
-        
-        # Mono'ya çevir (gerekirse)
-        if len(audio.shape) > 1:
-            audio = audio.mean(axis=1)
+        # Cache isabetinde model hiç yüklenmez
+        cache_key = self.transcript_cache.make_key(audio)
+        cached = self.transcript_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        model = self._load_model()
         
         # VAD ile sessizlikleri kes
         if self.config['vad_filter'] and self.vad_available:
-            audio = self._apply_vad(audio)
+            audio, self.last_vad_regions = self._apply_vad(audio)
         
         logger.info("Transkripsiyon başlıyor...")
         
         try:
-            # Faster-Whisper ile transkribe et
-            segments, info = model.transcribe(
-                audio,
-                language=self.config.get('language', 'tr'),
-                beam_size=self.config.get('beam_size', 3),
-                vad_filter=self.config.get('vad_filter', False),
-                vad_parameters=self.config.get('vad_parameters', {}),
-                word_timestamps=False  # Daha hızlı
-            )
-            
-            # Segmentleri birleştir
-            text = " ".join([segment.text for segment in segments])
-            
+            text = self._run_model(model, audio)
+            self.transcript_cache.set(cache_key, text)
             logger.success(f"Transkripsiyon: '{text}'")
-            return text.strip()
+            return text
             
         except Exception as e:
             logger.error(f"Transkripsiyon hatası: {e}")
             return ""
     
+    def _load_model(self):
+        """STT modelini ilk cache kacirmasinda yukle (toplu modda is parcaciklari tek yukleme bekler)"""
+        with self._model_lock:
+            return self.model_manager.load_model("stt")
+    
+    def transcribe_addressed(
+        self,
+        audio_array: np.ndarray,
+        sample_rate: int = TARGET_SAMPLE_RATE
+    ) -> Optional[str]:
+        """
+        Wake-word kapisindan gecen sesi transkribe et (surekli dinleme icin)
+        
+        Args:
+            audio_array: NumPy array (mikrofondan)
+            sample_rate: Örnekleme hızı
+        
+        Returns:
+            Wake ifadesi atilmis metin; asistana hitap edilmediyse None
+        """
+        
+        if not self.wake_gate.enabled:
+            return self.transcribe(audio_array=audio_array, sample_rate=sample_rate)
+        
+        if not WHISPER_AVAILABLE:
+            logger.error("Faster-Whisper yüklü değil!")
+            return None
+        
+        audio = prepare_audio(audio_array, sample_rate)
+        gate = self.wake_gate.check(audio)
+        if not gate['passed']:
+            logger.info(f"Wake-word yok, transkripsiyon atlandi ({gate['elapsed'] * 1000:.0f} ms)")
+            return None
+        
+        text = self.transcribe(audio_array=audio, sample_rate=TARGET_SAMPLE_RATE)
+        return self.wake_gate.strip_wake_phrase(text)
+    
+    def transcribe_batch(
+        self,
+        items: Iterable[BatchItem],
+        max_workers: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Cok sayida kaydi paralel transkribe et, sonuclari GIRIS SIRASIYLA akit
+        
+        Args:
+            items: Dosya yollari, 16 kHz diziler veya (sample_rate, dizi) demetleri
+            max_workers: Is parcacigi sayisi (varsayilan: stt.num_workers)
+        
+        Yields:
+            {'index', 'source', 'text', 'duration', 'elapsed', 'cached', 'error'}
+        """
+        
+        if not WHISPER_AVAILABLE:
+            logger.error("Faster-Whisper yüklü değil!")
+            return
+        
+        workers = max(1, max_workers or self.num_workers)
+        
+        logger.info(f"Toplu transkripsiyon: {workers} is parcacigi")
+        
+        # Siralama icin en fazla 2 x workers is bekletilir (bellek sinirli kalir)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stt-batch") as pool:
+            pending = deque()
+            for index, item in enumerate(items):
+                pending.append(pool.submit(self._transcribe_item, index, item))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def _transcribe_item(self, index: int, item: BatchItem) -> Dict:
+        """transcribe_batch is parcacigi: yukle + VAD + model (hata sonucu doner)"""
+        start = time.perf_counter()
+        result = {'index': index, 'source': None, 'text': "", 'duration': 0.0,
+                  'elapsed': 0.0, 'cached': False, 'error': None}
+        
+        try:
+            if isinstance(item, (str, Path)):
+                result['source'] = str(item)
+                audio = self._load_input(str(item), None, TARGET_SAMPLE_RATE)
+            elif isinstance(item, tuple):
+                result['source'] = f"array[{index}]"
+                audio = self._load_input(None, item[1], item[0])
+            else:
+                result['source'] = f"array[{index}]"
+                audio = self._load_input(None, item, TARGET_SAMPLE_RATE)
+            
+            result['duration'] = len(audio) / TARGET_SAMPLE_RATE
+            cache_key = self.transcript_cache.make_key(audio)
+            cached = self.transcript_cache.get(cache_key)
+            if cached is not None:
+                result['text'] = cached
+                result['cached'] = True
+            else:
+                model = self._load_model()
+                if self.config.get('vad_filter') and self.vad_available:
+                    # Bolgeler is parcacigina ozel: paylasilan last_vad_regions'a yazilmaz
+                    audio, _ = self._apply_vad(audio)
+                result['text'] = self._run_model(model, audio)
+                self.transcript_cache.set(cache_key, result['text'])
+        except Exception as e:
+            logger.error(f"Transkripsiyon hatası ({result['source']}): {e}")
+            result['error'] = str(e)
+        
+        result['elapsed'] = time.perf_counter() - start
+        return result
+    
+    def _load_input(
+        self,
+        audio_path: Optional[str],
+        audio_array: Optional[np.ndarray],
+        sample_rate: int
+    ) -> np.ndarray:
+        """Dosya veya diziyi ortak front-end'den gecir (mono float32 16 kHz)"""
+        if audio_path:
+            return load_audio(audio_path)
+        if audio_array is not None:
+            return prepare_audio(audio_array, sample_rate)
+        raise ValueError("audio_path veya audio_array gerekli")
+    
+    def _run_model(self, model, audio: np.ndarray) -> str:
+        """Faster-Whisper cagrisi + segment birlestirme"""
+        segments, info = model.transcribe(
+            audio,
+            language=self.config.get('language', 'tr'),
+            beam_size=self.config.get('beam_size', 3),
+            vad_filter=self.config.get('vad_filter', False),
+            vad_parameters=self.config.get('vad_parameters', {}),
+            word_timestamps=False  # Daha hızlı
+        )
+        
+        # Segmentleri birleştir
+        text = " ".join([segment.text for segment in segments])
+        return text.strip()
+    
     def record_audio(self, duration: int = 5, sample_rate: int = 16000) -> np.ndarray:
         """
         Mikrofondan ses kaydet
@@ -133,39 +283,31 @@ class STTEngine:
             logger.error(f"Ses kayıt hatası: {e}")
             return np.array([])
     
-    def _apply_vad(self, audio: np.ndarray, sample_rate: int = 16000) -> np.ndarray:
-        """Voice Activity Detection - sessizlikleri kes"""
+    def _apply_vad(self, audio: np.ndarray, sample_rate: int = 16000) -> Tuple[np.ndarray, list]:
+        """
+        Voice Activity Detection - konusma bolgelerini koru, sessizlikleri kes
+        
+        Returns:
+            (kirpilmis ses, konusma bolgeleri); bolge yoksa veya hata olursa ses aynen doner
+        """
         if not self.vad_available:
-            return audio
+            return audio, []
         
         try:
-            # Int16'ya çevir (VAD için gerekli)
-            audio_int16 = (audio * 32767).astype(np.int16)
+            trimmed, regions = apply_vad(audio, sample_rate, vad=self.vad, **self.vad_params)
             
-            frame_duration = 30  # ms (10, 20, 30 olabilir)
-            frame_size = int(sample_rate * frame_duration / 1000)
+            if not regions:
+                return audio, regions
             
-            voiced_frames = []
-            for i in range(0, len(audio_int16), frame_size):
-                frame = audio_int16[i:i+frame_size]
-                if len(frame) < frame_size:
-                    break
-                
-                # VAD kontrolü
-                is_speech = self.vad.is_speech(frame.tobytes(), sample_rate)
-                if is_speech:
-                    voiced_frames.append(frame)
-            
-            # Birleştir
-            if voiced_frames:
-                result = np.concatenate(voiced_frames)
-                return result.astype(np.float32) / 32767.0
-            else:
-                return audio
+            logger.debug(
+                f"VAD: {len(regions)} bolge, konusma orani "
+                f"%{speech_ratio(regions, len(audio)) * 100:.0f}"
+            )
+            return trimmed, regions
                 
         except Exception as e:
             logger.warning(f"VAD hatası: {e}")
-            return audio
+            return audio, []
     
     def is_audio_silent(self, audio: np.ndarray, threshold: float = 0.01) -> bool:
         """
@@ -178,5 +320,4 @@ class STTEngine:
         Returns:
             Sessiz mi?
         """
-        rms = np.sqrt(np.mean(audio**2))
-        return rms < threshold
+        return rms_level(audio) < threshold
@@ -0,0 +1,172 @@
+"""
+Transcript Cache - Ses icerik hash'i -> transkripsiyon
+======================================================
+Ayni kayit tekrar gonderildiginde (LLM hatasi sonrasi yeniden deneme, cift
+tiklama) Faster-Whisper hic calistirilmaz.
+
+- Anahtar: normalize 16 kHz float32 PCM'in blake2b ozeti + stt ayarlari
+  (model, compute_type, dil, beam, VAD ve kirpma ayarlari) -- ayar degisince eski kayitlar gecersiz
+- LRU, bellek butcesi (max_size_mb) ile sinirli
+- Diske JSON olarak kaydedilir, hit/miss sayaclari tutulur
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from loguru import logger
+
+
+# Girdi basina tahmini sabit maliyet (anahtar + dict kaydi), byte
+_ENTRY_OVERHEAD = 200
+
+_SETTING_KEYS = (
+    'model_size', 'compute_type', 'language', 'beam_size', 'vad_filter', 'vad_parameters',
+    'vad_energy_threshold', 'vad_hangover_ms', 'vad_preroll_ms',
+)
+
+
+class TranscriptCache:
+    """Ses hash'i ile STT sonuc cache'i (thread-safe)"""
+
+    def __init__(self, stt_config: dict, cache_dir: str = "cache"):
+        self.config = stt_config.get('transcript_cache', {})
+        self.enabled = self.config.get('enabled', True)
+        self.max_bytes = int(self.config.get('max_size_mb', 4) * 1024 * 1024)
+        self.persist = self.config.get('persist', True)
+
+        self.cache_file = Path(cache_dir) / "transcript_cache.json"
+        self.settings_key = self._settings_fingerprint(stt_config)
+
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+        if self.enabled and self.persist:
+            self._load()
+
+    @staticmethod
+    def _settings_fingerprint(stt_config: dict) -> str:
+        """Sonucu etkileyen stt ayarlarinin kisa ozeti"""
+        settings = {key: stt_config.get(key) for key in _SETTING_KEYS}
+        payload = json.dumps(settings, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=6).hexdigest()
+
+    def make_key(self, audio: np.ndarray) -> str:
+        """
+        Ses tamponu icin cache anahtari (kopyasiz memoryview uzerinden hash)
+
+        Args:
+            audio: prepare_audio ciktisi (mono float32 16 kHz)
+
+        Returns:
+            "<ayar ozeti>:<ses ozeti>"
+        """
+        buffer = np.ascontiguousarray(audio, dtype=np.float32)
+        digest = hashlib.blake2b(memoryview(buffer).cast('B'), digest_size=16).hexdigest()
+        return f"{self.settings_key}:{digest}"
+
+    @staticmethod
+    def _entry_size(key: str, text: str) -> int:
+        return len(key) + len(text.encode("utf-8")) + _ENTRY_OVERHEAD
+
+    def get(self, key: str) -> Optional[str]:
+        """Cache'ten transkripsiyon al (LRU sirasini gunceller)"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        logger.info(f"Transkripsiyon cache hit: '{text[:50]}'")
+        return text
+
+    def set(self, key: str, text: str):
+        """Transkripsiyonu ekle, butce asilirsa en eski girdileri at"""
+        if not self.enabled or not text:
+            return
+
+        size = self._entry_size(key, text)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= self._entry_size(key, previous)
+            self._entries[key] = text
+            self._size += size
+            while self._size > self.max_bytes:
+                old_key, old_text = self._entries.popitem(last=False)
+                self._size -= self._entry_size(old_key, old_text)
+            self._dirty = True
+
+    def _load(self):
+        """Diskteki cache'i yukle (sadece mevcut ayarlarla uretilmis girdiler)"""
+        if not self.cache_file.exists():
+            return
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            prefix = f"{self.settings_key}:"
+            for key, text in data.items():
+                if key.startswith(prefix):
+                    self.set(key, text)
+            self._dirty = False
+            logger.info(f"Transkripsiyon cache yuklendi: {len(self._entries)} kayit")
+        except Exception as e:
+            logger.error(f"Transkripsiyon cache yukleme hatasi: {e}")
+
+    def save(self):
+        """Cache'i diske kaydet (degisiklik yoksa yazmaz)"""
+        if not self.enabled or not self.persist or not self._dirty:
+            return
+
+        try:
+            with self._lock:
+                data = dict(self._entries)
+                self._dirty = False
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"Transkripsiyon cache kaydetme hatasi: {e}")
+
+    def clear(self):
+        """Tum kayitlari ve sayaclari sifirla"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self._dirty = True
+        self.save()
+
+    def get_statistics(self) -> Dict:
+        """
+        Cache istatistikleri
+
+        Returns:
+            İstatistik dict'i
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'size_kb': round(self._size / 1024, 1),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
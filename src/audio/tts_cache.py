@@ -0,0 +1,186 @@
+"""
+TTS Cache - Tekrarlayan kisa cevaplar icin hazir ses
+====================================================
+"Selam!", "Merhaba!" ve LLMManager'in sabit hata/fallback mesajlari her
+seferinde Piper'a yeniden sentezletilmez.
+
+- Anahtar: normalize metin + ses modeli + hiz
+- Ses float32 .npy olarak diske yazilir, okurken memory-map ile acilir
+- LRU byte butcesi (max_size_mb), asilinca en eski dosyalar silinir
+- Sabit sistem cumleleri acilista arka planda hazirlanir
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+from loguru import logger
+
+
+# Uygulamanin kendi urettigi sabit cumleler (LLMManager / GradioUI)
+CANNED_PHRASES = [
+    "Selam!",
+    "Merhaba!",
+    "Bir hata oluştu. Lütfen tekrar dene.",
+    "Bir sorun oluştu, lütfen tekrar dene.",
+    "Resim dosyasını bulamadım. Lütfen resmi tekrar yükle.",
+    "Görsel analizi sırasında model hatası oluştu. Lütfen tekrar dene.",
+    "Bu resmi çözümleyemedim. Farklı bir resim veya daha kısa bir soru dene.",
+    "Görselde bir sahne görülüyor ancak açıklama oluşturulamadı. Lütfen tekrar dene.",
+    "Lütfen bir resim yükle.",
+]
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_phrase(text: str) -> str:
+    """Bosluklari sadelestir (noktalama prozodiyi etkiledigi icin korunur)"""
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+class TTSCache:
+    """Disk destekli, memory-map'li LRU ses cache'i (thread-safe)"""
+
+    def __init__(self, tts_config: dict, voice_id: str, cache_dir: str = "cache/tts"):
+        self.config = tts_config.get('cache', {})
+        self.enabled = self.config.get('enabled', True)
+        self.max_bytes = int(self.config.get('max_size_mb', 64) * 1024 * 1024)
+        self.max_chars = self.config.get('max_chars', 120)
+        self.voice_id = voice_id
+
+        self.cache_dir = Path(cache_dir) / voice_id
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # dosya adi -> byte
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.enabled:
+            self._scan()
+
+    def _scan(self):
+        """Diskteki dosyalari LRU indeksine al (eskiden yeniye)"""
+        if not self.cache_dir.exists():
+            return
+        files = sorted(self.cache_dir.glob("*.npy"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._index[path.stem] = size
+            self._size += size
+        if files:
+            logger.info(f"TTS cache: {len(files)} hazir ses ({self._size / 1024 / 1024:.1f} MB)")
+
+    def _key(self, text: str, speed: float) -> str:
+        payload = f"{self.voice_id}|{speed:.2f}|{normalize_phrase(text)}".encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=12).hexdigest()
+
+    def cacheable(self, text: str) -> bool:
+        """Sadece kisa cumleler cache'lenir (uzun cevaplar nadiren tekrarlar)"""
+        return self.enabled and 0 < len(normalize_phrase(text)) <= self.max_chars
+
+    def get(self, text: str, speed: float = 1.0) -> Optional[np.ndarray]:
+        """
+        Hazir sesi al
+
+        Returns:
+            Salt-okunur, memory-map'li float32 dizi veya None
+        """
+        if not self.cacheable(text):
+            return None
+
+        key = self._key(text, speed)
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+
+        try:
+            return np.load(self.cache_dir / f"{key}.npy", mmap_mode='r')
+        except Exception as e:
+            logger.warning(f"TTS cache okuma hatasi: {e}")
+            self._forget(key)
+            return None
+
+    def set(self, text: str, audio: np.ndarray, speed: float = 1.0):
+        """Sesi diske yaz, butce asilirsa en eski sesleri sil"""
+        if not self.cacheable(text) or audio.size == 0:
+            return
+
+        key = self._key(text, speed)
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        if audio.nbytes > self.max_bytes:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.cache_dir / f"{key}.npy"
+            np.save(path, audio)
+            size = path.stat().st_size
+        except Exception as e:
+            logger.warning(f"TTS cache yazma hatasi: {e}")
+            return
+
+        evicted = []
+        with self._lock:
+            self._size -= self._index.pop(key, 0)
+            self._index[key] = size
+            self._size += size
+            while self._size > self.max_bytes and len(self._index) > 1:
+                old_key, old_size = self._index.popitem(last=False)
+                self._size -= old_size
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            (self.cache_dir / f"{old_key}.npy").unlink(missing_ok=True)
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._size -= self._index.pop(key, 0)
+
+    def prewarm(self, synthesize: Callable[[str], Optional[np.ndarray]],
+                phrases: Iterable[str], speed: float = 1.0) -> int:
+        """
+        Eksik sabit cumleleri sentezleyip cache'e koy
+
+        Args:
+            synthesize: metin -> float32 ses
+            phrases: Hazirlanacak cumleler
+
+        Returns:
+            Yeni sentezlenen cumle sayisi
+        """
+        created = 0
+        for phrase in phrases:
+            if not self.cacheable(phrase):
+                continue
+            if self._key(phrase, speed) in self._index:
+                continue
+            audio = synthesize(phrase)
+            if audio is not None and audio.size:
+                self.set(phrase, audio, speed)
+                created += 1
+        if created:
+            logger.info(f"TTS cache: {created} sabit cumle hazirlandi")
+        return created
+
+    def get_statistics(self) -> Dict:
+        """
+        Cache istatistikleri
+
+        Returns:
+            İstatistik dict'i
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._index),
+            'size_mb': round(self._size / 1024 / 1024, 2),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
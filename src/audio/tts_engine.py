@@ -4,12 +4,25 @@ TTS Engine - Piper (High-quality Turkish TTS)
 VRAM'dan hic yer kaplamaz, CPU'da calisir
 """
 
+import contextvars
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import sounddevice as sd
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from loguru import logger
 from pathlib import Path
 
+from .tts_cache import CANNED_PHRASES, TTSCache
+
+try:
+    from ..monitoring.performance import maybe_span
+except ImportError:  # src/ sys.path'te (main.py): ust paket yok
+    from monitoring.performance import maybe_span
+
 try:
     from piper import PiperVoice
     PIPER_AVAILABLE = True
@@ -17,13 +30,45 @@ except ImportError:
     PIPER_AVAILABLE = False
     logger.warning("Piper TTS yuklu degil! pip install piper-tts")
 
+try:
+    import onnxruntime
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+# OutputStream'e yazilan blok (iptal bu aralikla kontrol edilir)
+PLAYBACK_BLOCK_SEC = 0.1
+# Sentez -> oynatma arasinda bekleyen en fazla chunk
+STREAM_QUEUE_SIZE = 8
+
 
 class TTSEngine:
     """High-quality Text-to-Speech using Piper"""
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, perf_tracker=None):
         self.config = config['tts']
+        # Tur trace'inde cumle basina tts_synthesis span'i (opsiyonel)
+        self.perf_tracker = perf_tracker
         self.model_path = Path(self.config.get('model_path', "models/piper/tr_TR-fettah-medium.onnx"))
+        self.sample_rate = self.config.get('sample_rate', 22050)
+        self.speed = self.config.get('speed', 1.0)
+
+        # Cumleler paralel sentezlenir; num_threads tum worker'lar arasinda paylasilir
+        self.num_workers = max(1, int(self.config.get('num_workers', 1)))
+        self.num_threads = max(1, int(self.config.get('num_threads', 4)))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # espeak-ng (fonemlestirme) thread-safe degil, ONNX session.run ise thread-safe
+        self._phonemize_lock = threading.Lock()
+        # Metrik icin aktif kuyruklar: id -> ('tts_synthesis' | 'tts_playback', kuyruk)
+        self._queues: Dict[int, Tuple[str, Any]] = {}
+
+        # Kisa/sabit cumlelerin sesi tekrar sentezlenmez
+        self.phrase_cache = TTSCache(self.config, self.model_path.stem)
+
+        # Kullanici kesince (stop) aktif oynatma + sentez durur
+        self._cancel = threading.Event()
+        # Son oynatmada ilk sesin hoparlore yazildigi an (perf_counter)
+        self.last_playback_start: Optional[float] = None
 
         if not PIPER_AVAILABLE:
             logger.error("Piper TTS yuklu degil!")
@@ -40,12 +85,177 @@ class TTSEngine:
 
             self.model = PiperVoice.load(str(self.model_path))
             self.sample_rate = self.model.config.sample_rate
+            self._apply_session_threads()
 
-            logger.success(f"Piper hazir! (Sample rate: {self.sample_rate}Hz)")
+            logger.success(
+                f"Piper hazir! (Sample rate: {self.sample_rate}Hz, "
+                f"{self.num_workers} worker x {self._intra_op_threads()} thread)"
+            )
         except Exception as e:
             logger.error(f"Piper yukleme hatasi: {e}")
             self.model = None
+            return
+
+        if self.phrase_cache.enabled and self.phrase_cache.config.get('prewarm', True):
+            threading.Thread(target=self._prewarm, daemon=True, name="tts-prewarm").start()
+
+    def _prewarm(self):
+        """Sabit sistem cumlelerini arka planda cache'e hazirla"""
+        phrases = CANNED_PHRASES + list(self.phrase_cache.config.get('phrases', []))
+        try:
+            self.phrase_cache.prewarm(self._synthesize_full, phrases, self.speed)
+        except Exception as e:
+            logger.warning(f"TTS cache hazirlama hatasi: {e}")
+
+    def _intra_op_threads(self) -> int:
+        """Worker basina ONNX thread sayisi (4 thread / 2 worker -> 2)"""
+        return max(1, self.num_threads // self.num_workers)
+
+    def _apply_session_threads(self):
+        """PiperVoice'un varsayilan ONNX session'ini thread ayarli olanla degistir"""
+        if not ONNXRUNTIME_AVAILABLE or not hasattr(self.model, 'session'):
+            return
+
+        try:
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = self._intra_op_threads()
+            options.inter_op_num_threads = 1
+            self.model.session = onnxruntime.InferenceSession(
+                str(self.model_path), sess_options=options, providers=["CPUExecutionProvider"]
+            )
+        except Exception as e:
+            logger.warning(f"Piper thread ayari uygulanamadi: {e}")
+
+    def _parallel_enabled(self) -> bool:
+        """Paralel yol icin Piper'in cumle bazli API'si gerekli (piper-tts >= 1.3)"""
+        return self.num_workers > 1 and all(
+            hasattr(self.model, name)
+            for name in ('phonemize', 'phonemes_to_ids', 'phoneme_ids_to_audio')
+        )
+
+    def _synthesize_full(self, text: str) -> Optional[np.ndarray]:
+        """Metnin tamamini tek dizi olarak sentezle (cache'e bakmadan)"""
+        parts = list(self._synthesize_sentences(text))
+        return np.concatenate(parts) if parts else None
+
+    def _synthesize_sentences(
+        self,
+        text: str,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[np.ndarray]:
+        """Cumle sesleri SIRAYLA (worker > 1 ise paralel sentezlenir)"""
+        if self._parallel_enabled():
+            yield from self._synthesize_parallel(text, cancel_event)
+            return
+
+        for audio_chunk in self.model.synthesize(text):
+            if cancel_event is not None and cancel_event.is_set():
+                logger.info("TTS sentezi iptal edildi")
+                return
+            # AudioChunk.audio_float_array numpy array'i icerir
+            yield np.asarray(audio_chunk.audio_float_array, dtype=np.float32)
 
+    def _synthesize_parallel(
+        self,
+        text: str,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[np.ndarray]:
+        """Cumleleri worker havuzunda sentezle, giris sirasiyla akit"""
+        with self._phonemize_lock:
+            sentences = self.model.phonemize(text)
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="tts-worker")
+
+        # Siradaki cumle beklenirken en fazla 2 x worker cumle onceden sentezlenir
+        pending = deque()
+        self._queues[id(pending)] = ('tts_synthesis', pending)
+        try:
+            for phonemes in sentences:
+                pending.append(self._pool.submit(self._render_sentence, phonemes))
+                if len(pending) >= self.num_workers * 2:
+                    if cancel_event is not None and cancel_event.is_set():
+                        logger.info("TTS sentezi iptal edildi")
+                        return
+                    yield pending.popleft().result()
+            while pending:
+                if cancel_event is not None and cancel_event.is_set():
+                    logger.info("TTS sentezi iptal edildi")
+                    return
+                yield pending.popleft().result()
+        finally:
+            self._queues.pop(id(pending), None)
+            for future in pending:
+                future.cancel()
+
+    def queue_depths(self) -> Dict[str, int]:
+        """
+        Bekleyen is sayilari (metrik icin)
+
+        Returns:
+            {'tts_synthesis': siradaki cumle, 'tts_playback': oynatilmayi bekleyen chunk}
+        """
+        depths = {'tts_synthesis': 0, 'tts_playback': 0}
+        for kind, pending in list(self._queues.values()):
+            depths[kind] += pending.qsize() if isinstance(pending, queue.Queue) else len(pending)
+        return depths
+
+    def _render_sentence(self, phonemes: List[str]) -> np.ndarray:
+        """Tek cumle: fonem -> ses (PiperVoice.synthesize ile ayni normalizasyon)"""
+        phoneme_ids = self.model.phonemes_to_ids(phonemes)
+        audio = np.asarray(self.model.phoneme_ids_to_audio(phoneme_ids), dtype=np.float32)
+        peak = float(np.max(np.abs(audio))) if audio.size else 0.0
+        if peak < 1e-8:
+            return np.zeros_like(audio)
+        audio = audio / peak
+        return np.clip(audio, -1.0, 1.0, out=audio)
+
+
+    def synthesize_stream(
+        self,
+        text: str,
+        cancel_event: Optional[threading.Event] = None,
+        parent=None
+    ) -> Iterator[np.ndarray]:
+        """
+        Cumle seslerini uretildikce akit (cumle basina bir chunk, giris sirasiyla)
+
+        Args:
+            text: Okunacak metin
+            cancel_event: Set edilirse sonraki chunk uretilmez
+            parent: tts_synthesis span'larinin baglanacagi tur span'i (None =
+                baglamdaki aktif span; Gradio generator'lari icin acikca verilir)
+
+        Yields:
+            float32 mono ses parcalari
+        """
+
+        if not text or not self.model:
+            return
+
+        cached = self.phrase_cache.get(text, self.speed)
+        if cached is not None:
+            logger.debug("TTS cache hit: '{}'", text[:50])
+            yield cached
+            return
+
+        # Kisa metinler tamamlaninca cache'e yazilir
+        parts = [] if self.phrase_cache.cacheable(text) else None
+
+        sentences = self._synthesize_sentences(text, cancel_event)
+        while True:
+            # Span yield'i kapsamaz: sadece sentez suresi olculur
+            with maybe_span(self.perf_tracker, 'tts_synthesis', parent):
+                audio = next(sentences, None)
+            if audio is None:
+                break
+            if parts is not None:
+                parts.append(audio)
+            yield audio
+
+        cancelled = cancel_event is not None and cancel_event.is_set()
+        if parts and not cancelled:
+            self.phrase_cache.set(text, np.concatenate(parts), self.speed)
 
     def speak(
         self,
@@ -55,7 +265,7 @@ class TTSEngine:
         save_path: Optional[str] = None
     ):
         """
-        Metni sesli oku
+        Metni sesli oku (ilk cumle sentezlenince calmaya baslar)
 
         Args:
             text: Okunacak metin (Turkce desteklenir)
@@ -68,37 +278,118 @@ class TTSEngine:
             return
 
         logger.info(f"Piper TTS: '{text[:50]}...'")
+        self._play([text], save_path)
 
-        try:
-            # Piper ile ses uret (generator AudioChunk dondurur)
-            audio_chunks = []
-            for audio_chunk in self.model.synthesize(text):
-                # AudioChunk.audio_float_array numpy array'i icerir
-                audio_chunks.append(audio_chunk.audio_float_array)
-
-            # Tum chunk'lari birlestir
-            if not audio_chunks:
-                logger.warning("Hic audio chunk uretilmedi")
-                return
+    def speak_stream(self, sentences: Iterable[str], save_path: Optional[str] = None):
+        """
+        Cumleler geldikce sentezle ve cal (LLM akisi ile ust uste biner)
+
+        Args:
+            sentences: Cumle akisi (orn. LLMManager.generate_sentences); sentez
+                is parcaciginda tuketilir, iptalde kapatilir
+            save_path: .wav olarak kaydet (opsiyonel)
+        """
+
+        if not self.model:
+            return
+
+        self._play(sentences, save_path)
 
-            audio_array = np.concatenate(audio_chunks)
+    def _play(self, texts: Iterable[str], save_path: Optional[str] = None):
+        """Sentez is parcacigi + OutputStream tuketicisi"""
+        self._cancel.clear()
+        self.last_playback_start = None
 
-            # Oynat
-            sd.play(audio_array, self.sample_rate)
-            sd.wait()
+        # Sentez ayri is parcaciginda: oynatma sirasinda sonraki cumle hazirlanir.
+        # Baglam kopyalanir: LLM akisinin performans span'lari aktif tura baglanir
+        chunks: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self._queues[id(chunks)] = ('tts_playback', chunks)
+        producer = threading.Thread(
+            target=contextvars.copy_context().run, args=(self._produce_chunks, texts, chunks),
+            daemon=True, name="tts-synth"
+        )
+        producer.start()
 
-            logger.success("Ses calindi!")
+        saved = [] if save_path else None
+        block = max(1, int(self.sample_rate * PLAYBACK_BLOCK_SEC))
+
+        try:
+            with sd.OutputStream(samplerate=self.sample_rate, channels=1, dtype='float32') as stream:
+                while not self._cancel.is_set():
+                    try:
+                        audio = chunks.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if audio is None:
+                        break
+                    if saved is not None:
+                        saved.append(audio)
+                    if self.last_playback_start is None:
+                        self.last_playback_start = time.perf_counter()
+
+                    # Kucuk bloklar: iptal en gec PLAYBACK_BLOCK_SEC icinde fark edilir
+                    for start in range(0, len(audio), block):
+                        if self._cancel.is_set():
+                            break
+                        stream.write(audio[start:start + block].reshape(-1, 1))
+
+                if self._cancel.is_set():
+                    # Tampondaki sesi calmadan kes
+                    stream.abort()
+                    logger.info("Ses oynatma kesildi")
+                else:
+                    logger.success("Ses calindi!")
 
             # Kaydet (opsiyonel)
-            if save_path:
+            if saved:
                 import soundfile as sf
-                sf.write(save_path, audio_array, self.sample_rate)
+                sf.write(save_path, np.concatenate(saved), self.sample_rate)
                 logger.info(f"Ses kaydedildi: {save_path}")
 
+        except KeyboardInterrupt:
+            self._cancel.set()
+            logger.info("Ses oynatma kullanici tarafindan kesildi")
+            raise
         except Exception as e:
+            self._cancel.set()
             logger.error(f"Piper TTS hatasi: {e}")
             import traceback
             logger.error(traceback.format_exc())
+        finally:
+            producer.join(timeout=1.0)
+            self._queues.pop(id(chunks), None)
+
+    def _produce_chunks(self, texts: Iterable[str], chunks: queue.Queue):
+        """_play() icin sentez is parcacigi (bitince None koyar)"""
+        try:
+            for text in texts:
+                for audio in self.synthesize_stream(text, self._cancel):
+                    if not self._put(chunks, audio):
+                        return
+                if self._cancel.is_set():
+                    return
+        except Exception as e:
+            logger.error(f"Piper sentez hatasi: {e}")
+        finally:
+            # Cumle akisi bir generator ise (LLM stream) iptalde baglanti kapansin
+            close = getattr(texts, 'close', None)
+            if close:
+                close()
+        self._put(chunks, None)
+
+    def _put(self, chunks: queue.Queue, item) -> bool:
+        """Kuyruk doluysa iptali kontrol ederek bekle"""
+        while not self._cancel.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def stop(self):
+        """Aktif oynatmayi ve kalan sentezi durdur"""
+        self._cancel.set()
 
     def test_voice(self):
         """Ses testi yap"""
@@ -0,0 +1,142 @@
+"""
+VAD - Vektorel konusma bolgesi tespiti
+======================================
+STTEngine._apply_vad icin:
+
+- Ses, kopyalanmadan (n_kare, kare_boyu) 2-D gorunume alinir
+- Kare basina RMS tek numpy cagrisiyla hesaplanir; esigin altindaki kareler
+  dogrudan sessiz sayilir, webrtcvad sadece kalan (belirsiz) karelere sorulur
+- Sonuc kare torbasi degil, hangover/pre-roll payli [baslangic, bitis) bolgeleridir
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+
+FRAME_MS = 30  # webrtcvad: 10, 20 veya 30 ms
+
+Region = Tuple[int, int]
+
+
+def frame_view(audio: np.ndarray, frame_size: int) -> np.ndarray:
+    """
+    Mono sesi (n_kare, frame_size) gorunumune al (kopya yok, artik kisim atilir)
+
+    Args:
+        audio: C-contiguous mono dizi
+        frame_size: Kare basina ornek sayisi
+
+    Returns:
+        2-D gorunum
+    """
+
+    n_frames = len(audio) // frame_size
+    return audio[:n_frames * frame_size].reshape(n_frames, frame_size)
+
+
+def frame_rms(frames: np.ndarray) -> np.ndarray:
+    """Kare basina RMS (ara kare dizisi olmadan)"""
+    if frames.shape[0] == 0:
+        return np.zeros(0, dtype=np.float32)
+    energy = np.einsum('ij,ij->i', frames, frames)
+    return np.sqrt(energy / frames.shape[1])
+
+
+def _pad_mask(mask: np.ndarray, before: int, after: int) -> np.ndarray:
+    """
+    Konusma karelerini genislet: kare i, [i - after, i + before] araliginda
+    konusma varsa konusma sayilir (after = hangover, before = pre-roll)
+    """
+    if before == 0 and after == 0:
+        return mask
+    n = len(mask)
+    csum = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+    idx = np.arange(n)
+    hi = np.minimum(idx + before, n - 1) + 1
+    lo = np.maximum(idx - after, 0)
+    return (csum[hi] - csum[lo]) > 0
+
+
+def mask_to_regions(mask: np.ndarray, frame_size: int) -> List[Region]:
+    """Kare maskesini ornek indeksli [baslangic, bitis) bolgelerine cevir"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    starts, ends = edges[0::2], edges[1::2]
+    return [(int(s) * frame_size, int(e) * frame_size) for s, e in zip(starts, ends)]
+
+
+def detect_speech_regions(
+    audio: np.ndarray,
+    sample_rate: int = 16000,
+    vad=None,
+    energy_threshold: float = 0.005,
+    hangover_ms: int = 300,
+    preroll_ms: int = 90,
+    frame_ms: int = FRAME_MS
+) -> List[Region]:
+    """
+    Konusma bolgelerini bul
+
+    Args:
+        audio: Mono float32 [-1, 1] ses
+        sample_rate: 8/16/32/48 kHz (webrtcvad kisiti)
+        vad: webrtcvad.Vad benzeri nesne (None = sadece enerji kapisi)
+        energy_threshold: Bu RMS'in altindaki kareler webrtcvad'a sorulmaz
+        hangover_ms: Konusma bittikten sonra korunan sure
+        preroll_ms: Konusma baslamadan once korunan sure
+
+    Returns:
+        [(baslangic_ornek, bitis_ornek), ...] -- sirali, ortusmeyen
+    """
+
+    frame_size = int(sample_rate * frame_ms / 1000)
+    frames = frame_view(audio, frame_size)
+    if frames.shape[0] == 0:
+        return []
+
+    mask = frame_rms(frames) >= energy_threshold
+
+    if vad is not None:
+        candidates = np.flatnonzero(mask)
+        if candidates.size:
+            # Sadece aday kareler int16'ya cevrilir (fancy index zaten kopya)
+            pcm = np.clip(frames[candidates], -1.0, 1.0)
+            pcm *= 32767
+            pcm = pcm.astype(np.int16)
+            mask[candidates] = np.fromiter(
+                (vad.is_speech(row.tobytes(), sample_rate) for row in pcm),
+                dtype=bool, count=candidates.size
+            )
+
+    after = -(-hangover_ms // frame_ms)
+    before = -(-preroll_ms // frame_ms)
+    regions = mask_to_regions(_pad_mask(mask, before, after), frame_size)
+
+    # Son kare bolgedeyse artik ornekleri de dahil et
+    if regions and regions[-1][1] == frames.size:
+        regions[-1] = (regions[-1][0], len(audio))
+    return regions
+
+
+def trim_to_regions(audio: np.ndarray, regions: List[Region]) -> np.ndarray:
+    """Bolgeleri tek diziye birlestir (bolgesiz ise girdi aynen)"""
+    if not regions:
+        return audio
+    if len(regions) == 1:
+        start, end = regions[0]
+        return audio[start:end]
+    return np.concatenate([audio[start:end] for start, end in regions])
+
+
+def speech_ratio(regions: List[Region], n_samples: int) -> float:
+    """Konusma bolgelerinin toplam sese orani"""
+    if n_samples <= 0:
+        return 0.0
+    return sum(end - start for start, end in regions) / n_samples
+
+
+def apply_vad(audio: np.ndarray, sample_rate: int = 16000, vad=None,
+              **params) -> Tuple[np.ndarray, List[Region]]:
+    """detect_speech_regions + trim_to_regions (bolge yoksa ses aynen doner)"""
+    regions = detect_speech_regions(audio, sample_rate, vad=vad, **params)
+    return trim_to_regions(audio, regions), regions
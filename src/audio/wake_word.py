@@ -0,0 +1,173 @@
+"""
+Wake Word - Hitap edilmeyen sesi tam transkripsiyondan once ele
+================================================================
+Surekli dinleyen kurulumda arka plandaki her konusma icin tam Faster-Whisper
+modelini calistirmamak icin iki asamali kapi:
+
+1. Enerji + VAD: konusma bolgesi yoksa hicbir model calismaz
+2. Kisa pencerede (ilk ~2 sn) Whisper-tiny, tek beam: initial_prompt ile
+   wake kelimesine yonlendirilir, sonuc bulanik eslesme ile kontrol edilir
+
+Kapidan gecen ses tam modele gider. Gectikten (ve her cevaptan) sonra
+follow_up_sec boyunca wake kelimesi aranmaz (sohbet devam ederken tekrar
+"asistan" demek gerekmez).
+"""
+
+import re
+import time
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from .audio_frontend import TARGET_SAMPLE_RATE
+from .vad import detect_speech_regions
+
+_NON_WORD = re.compile(r'[^\w\s]')
+# normalize_words ile ayni kelime sinirlari (orijinal metinde konum icin)
+_WORD = re.compile(r'\w+')
+
+
+def normalize_words(text: str) -> List[str]:
+    """Kucuk harf (Turkce I/İ dahil), noktalamasiz kelime listesi"""
+    text = text.replace('I', 'ı').replace('İ', 'i').lower()
+    return _NON_WORD.sub(' ', text).split()
+
+
+def match_phrase(words: List[str], phrase: List[str], search_words: int = 4):
+    """
+    Wake ifadesini metnin basinda bulanik ara
+
+    Args:
+        words: Normalize metin kelimeleri
+        phrase: Normalize wake ifadesi
+        search_words: Ifadenin baslayabilecegi en gec kelime
+
+    Returns:
+        (benzerlik 0-1, ifadeden sonraki ilk kelime indeksi)
+    """
+    size = len(phrase)
+    target = " ".join(phrase)
+    best, end = 0.0, 0
+    for start in range(min(search_words, max(1, len(words) - size + 1))):
+        candidate = " ".join(words[start:start + size])
+        score = SequenceMatcher(None, candidate, target).ratio()
+        if score > best:
+            best, end = score, start + size
+    return best, end
+
+
+class WakeWordGate:
+    """Enerji/VAD + Whisper-tiny wake-word kapisi"""
+
+    def __init__(self, stt_config: dict, model_manager, vad=None, vad_params: Optional[dict] = None):
+        self.config = stt_config.get('wake_word', {})
+        self.enabled = self.config.get('enabled', False)
+        self.model_manager = model_manager
+        self.vad = vad
+        self.vad_params = vad_params or {}
+
+        self.phrases = [normalize_words(p) for p in self.config.get('phrases', ["asistan"])]
+        self.phrases = [p for p in self.phrases if p]
+        self.window_sec = self.config.get('window_sec', 2.0)
+        self.min_similarity = self.config.get('min_similarity', 0.75)
+        self.follow_up_sec = self.config.get('follow_up_sec', 8.0)
+        self.language = stt_config.get('language', 'tr')
+
+        self._last_pass: Optional[float] = None
+        self.stats = {'checked': 0, 'no_speech': 0, 'rejected': 0, 'passed': 0, 'follow_up': 0}
+
+    def check(self, audio: np.ndarray) -> Dict:
+        """
+        Ses asistana mi hitap ediyor?
+
+        Args:
+            audio: Mono float32 16 kHz ses
+
+        Returns:
+            {'passed', 'reason', 'heard', 'score', 'elapsed'}
+        """
+        start = time.perf_counter()
+        self.stats['checked'] += 1
+        result = {'passed': False, 'reason': 'no_speech', 'heard': "", 'score': 0.0, 'elapsed': 0.0}
+
+        regions = detect_speech_regions(audio, TARGET_SAMPLE_RATE, vad=self.vad, **self.vad_params)
+        if not regions:
+            self.stats['no_speech'] += 1
+        elif self._in_follow_up():
+            result.update(passed=True, reason='follow_up', score=1.0)
+            self.stats['follow_up'] += 1
+        else:
+            # Wake kelimesi konusmanin basinda: ilk bolgeden itibaren kisa pencere
+            begin = regions[0][0]
+            window = audio[begin:begin + int(self.window_sec * TARGET_SAMPLE_RATE)]
+            heard = self._decode(window)
+            score = max((match_phrase(normalize_words(heard), p)[0] for p in self.phrases), default=0.0)
+            passed = score >= self.min_similarity
+            result.update(passed=passed, reason='wake_word' if passed else 'rejected',
+                          heard=heard, score=round(score, 3))
+            self.stats['passed' if passed else 'rejected'] += 1
+
+        if result['passed']:
+            self._last_pass = time.perf_counter()
+
+        result['elapsed'] = time.perf_counter() - start
+        logger.debug(f"Wake-word: {result['reason']} ('{result['heard']}', {result['score']})")
+        return result
+
+    def _in_follow_up(self) -> bool:
+        return self._last_pass is not None and time.perf_counter() - self._last_pass < self.follow_up_sec
+
+    def _decode(self, window: np.ndarray) -> str:
+        """Whisper-tiny, tek beam, zaman damgasiz; wake ifadesine yonlendirilmis"""
+        model = self.model_manager.load_model("kws")
+        segments, _ = model.transcribe(
+            window,
+            language=self.language,
+            beam_size=1,
+            best_of=1,
+            temperature=0.0,
+            without_timestamps=True,
+            condition_on_previous_text=False,
+            initial_prompt=", ".join(" ".join(p) for p in self.phrases),
+            vad_filter=False
+        )
+        return " ".join(segment.text for segment in segments).strip()
+
+    def strip_wake_phrase(self, text: str) -> str:
+        """Transkripsiyonun basindaki wake ifadesini at ("Asistan, hava nasil?" -> "hava nasil?")"""
+        if not text:
+            return text
+
+        words = normalize_words(text)
+        for phrase in self.phrases:
+            score, end = match_phrase(words, phrase, search_words=1)
+            if score >= self.min_similarity:
+                # Orijinal metinde eslesen son kelimenin bittigi yerden kes
+                # ("Asistan,hava" gibi bosluksuz noktalamada da kelime kaybolmaz)
+                spans = list(_WORD.finditer(text))
+                cut = spans[end - 1].end() if 0 < end <= len(spans) else 0
+                return text[cut:].lstrip(" ,.!?")
+        return text
+
+    def keep_awake(self):
+        """Takip penceresini simdiden baslat (cevap okunduktan sonra cagrilir)"""
+        if self._last_pass is not None:
+            self._last_pass = time.perf_counter()
+
+    def reset(self):
+        """Takip penceresini kapat (sonraki ses wake kelimesi gerektirir)"""
+        self._last_pass = None
+
+    def get_statistics(self) -> Dict:
+        """
+        Kapi istatistikleri
+
+        Returns:
+            İstatistik dict'i
+        """
+        stats = dict(self.stats)
+        skipped = stats['no_speech'] + stats['rejected']
+        stats['skip_rate'] = round(skipped / stats['checked'], 3) if stats['checked'] else 0.0
+        return stats
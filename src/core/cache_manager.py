@@ -27,6 +27,10 @@ class CacheManager:
         
         self.cache_file = self.cache_dir / "response_cache.json"
         self.cache_data: Dict = self._load_cache()
+        
+        # Oturum sayaçları (isabet oranı metriği)
+        self.hits = 0
+        self.misses = 0
         self.cleanup_expired()
         self._enforce_size_limit()
         
@@ -108,18 +112,21 @@ class CacheManager:
         key = self._generate_key(prompt, context)
         
         if key not in self.cache_data:
+            self.misses += 1
             return None
         
         entry = self.cache_data[key]
         
         # TTL kontrolü
         if time.time() - entry['timestamp'] > self.ttl:
-            logger.debug(f"Cache expired: {key}")
+            logger.debug("Cache expired: {}", key)
             del self.cache_data[key]
+            self.misses += 1
             return None
         
-        logger.info(f"✅ Cache hit: {prompt[:50]}...")
+        logger.info("✅ Cache hit: {}...", prompt[:50])
         entry['hits'] += 1
+        self.hits += 1
         return entry['response']
     
     def set(self, prompt: str, response: str, context: Optional[str] = None):
@@ -143,7 +150,7 @@ class CacheManager:
             'hits': 0
         }
         
-        logger.debug(f"Cache'e eklendi: {key}")
+        logger.debug("Cache'e eklendi: {}", key)
         self._enforce_size_limit()
         
         # Periyodik kayıt
@@ -180,10 +187,15 @@ class CacheManager:
             İstatistik dict'i
         """
         total_hits = sum(entry['hits'] for entry in self.cache_data.values())
+        lookups = self.hits + self.misses
         
         return {
             'total_entries': len(self.cache_data),
             'total_hits': total_hits,
+            'entries': len(self.cache_data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
             'cache_file_size_mb': round(self.cache_file.stat().st_size / 1024 / 1024, 2) if self.cache_file.exists() else 0
         }
     
@@ -4,13 +4,26 @@ LLM Manager - Turkce Optimized (Qwen2.5-7B)
 Few-shot ornekler + YAML kurallari ile gelismis Turkce yanit kalitesi
 """
 
-from typing import List, Dict, Optional
+from contextlib import contextmanager
+from typing import List, Dict, Iterator, Optional, Set
 from pathlib import Path
 from loguru import logger
 import os
+import re
+import threading
 import time
 import yaml
 
+try:
+    from ..monitoring.performance import maybe_span
+except ImportError:  # src/ sys.path'te (main.py): ust paket yok
+    from monitoring.performance import maybe_span
+
+# Sesli modda cumle sonu: noktalama + bosluk veya satir sonu
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+|\n+')
+# Cince/Japonca/Korece karakterler (model dil kaydirirsa cevap orada kesilir)
+_CJK_PATTERN = re.compile(r'[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]')
+
 
 class LLMManager:
     """Qwen2.5 ile Turkce-optimized sohbet yonetimi"""
@@ -25,6 +38,14 @@ class LLMManager:
         self.conversation_history: List[Dict] = []
         self.max_history = config['memory']['max_history']
 
+        # Barge-in: her cagrinin kendi iptal bayragi (Gradio oturumlari birbirini kesmez);
+        # cancel() bu yoneticideki aktif cagrilarin hepsini keser
+        self._active_cancels: Set[threading.Event] = set()
+        self._cancel_lock = threading.Lock()
+
+        # Son istegin Ollama metrikleri (ttft, tokens_per_sec, prompt_tokens...)
+        self.last_metrics: Dict[str, float] = {}
+
         # Turkce kurallari yukle
         self.turkish_rules = self._load_turkish_rules()
         self.few_shot_examples = self._build_few_shot_messages()
@@ -35,7 +56,7 @@ class LLMManager:
         self.web_search_enabled = config.get('web_search', {}).get('enabled', True)
         if self.web_search_enabled:
             from tools.web_search import WebSearchTool
-            self.web_search = WebSearchTool(config)
+            self.web_search = WebSearchTool(config, perf_tracker)
             logger.info("Web search tool aktif")
 
     def _load_turkish_rules(self) -> dict:
@@ -89,17 +110,38 @@ class LLMManager:
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
-        stream: bool = True
+        stream: bool = True,
+        cancel_event: Optional[threading.Event] = None
     ) -> str:
         """
         Qwen2.5'ten Turkce-optimized cevap al
+
+        Args:
+            prompt: Kullanici sorusu
+            system_prompt: Ozel system prompt (opsiyonel)
+            stream: Token token akit (iptal edilebilir)
+            cancel_event: Bu cagrinin iptal bayragi (None = cagriya ozel yeni bayrak);
+                set edilirse bos metin doner
         """
 
+        with self._cancel_scope(cancel_event) as cancel:
+            return self._generate(prompt, system_prompt, stream, cancel)
+
+    def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        stream: bool,
+        cancel: threading.Event
+    ) -> str:
+        """generate() govdesi (cancel: cagriya ozel iptal bayragi)"""
+
         # Cache kontrol (web aramalari haric)
         if self.cache_manager:
-            cached = self.cache_manager.get(prompt)
+            with maybe_span(self.perf_tracker, 'cache_lookup'):
+                cached = self.cache_manager.get(prompt)
             if cached:
-                logger.info(f"Cache'ten donduruluyor: {prompt[:50]}...")
+                logger.info("Cache'ten donduruluyor: {}...", prompt[:50])
                 self._update_history(prompt, cached)
                 return cached
 
@@ -111,52 +153,54 @@ class LLMManager:
         search_context = self._check_and_search(prompt)
 
         # Model yukle (lazy loading)
-        client = self.model_manager.load_model("llm")
+        with maybe_span(self.perf_tracker, 'model_load'):
+            client = self.model_manager.load_model("llm")
 
         # Konusma gecmisi + few-shot ornekler ile mesajlari olustur
-        messages = self._build_messages(prompt, system_prompt, search_context)
+        with maybe_span(self.perf_tracker, 'prompt_build'):
+            messages = self._build_messages(prompt, system_prompt, search_context)
+
+        # Arama/model yukleme sirasinda araya girildiyse istek hic gonderilmez
+        if cancel.is_set():
+            logger.info("LLM istegi gonderilmeden iptal edildi")
+            if self.perf_tracker:
+                self.perf_tracker.end_operation('llm_inference')
+            return ""
 
-        logger.info(f"Qwen2.5'e soruluyor: {prompt[:50]}...")
+        logger.info("Qwen2.5'e soruluyor: {}...", prompt[:50])
 
         response_text = ""
 
         try:
             if stream:
-                stream_response = client.chat(
-                    model=self.config['model'],
-                    messages=messages,
-                    stream=True,
-                    options={
-                        'temperature': self.config.get('temperature', 0.4),
-                        'top_p': self.config.get('top_p', 0.85),
-                        'top_k': self.config.get('top_k', 40),
-                        'repeat_penalty': self.config.get('repeat_penalty', 1.15),
-                        'repeat_last_n': self.config.get('repeat_last_n', 128),
-                        'num_predict': self.config.get('max_tokens', 1024),
-                    }
-                )
-
-                for chunk in stream_response:
-                    if 'message' in chunk and 'content' in chunk['message']:
-                        token = chunk['message']['content']
-                        response_text += token
-                        print(token, end='', flush=True)
+                for token in self._stream_tokens(client, messages, cancel):
+                    response_text += token
+                    print(token, end='', flush=True)
 
                 print()
 
+                if cancel.is_set():
+                    logger.info(f"LLM uretimi iptal edildi ({len(response_text)} karakter sonra)")
+                    if self.perf_tracker:
+                        self.perf_tracker.end_operation('llm_inference')
+                    return ""
+
             else:
-                response = client.chat(
-                    model=self.config['model'],
-                    messages=messages,
-                    options={
-                        'temperature': self.config.get('temperature', 0.4),
-                        'top_p': self.config.get('top_p', 0.85),
-                        'top_k': self.config.get('top_k', 40),
-                        'repeat_penalty': self.config.get('repeat_penalty', 1.15),
-                        'num_predict': self.config.get('max_tokens', 1024),
-                    }
-                )
-                response_text = response['message']['content']
+                # Akissiz istekte TTFT/decode ayrimi Ollama sayaclarindan (span etiketleri)
+                with maybe_span(self.perf_tracker, 'llm_request'):
+                    response = client.chat(
+                        model=self.config['model'],
+                        messages=messages,
+                        options={
+                            'temperature': self.config.get('temperature', 0.4),
+                            'top_p': self.config.get('top_p', 0.85),
+                            'top_k': self.config.get('top_k', 40),
+                            'repeat_penalty': self.config.get('repeat_penalty', 1.15),
+                            'num_predict': self.config.get('max_tokens', 1024),
+                        }
+                    )
+                    response_text = response['message']['content']
+                    self._record_ollama_metrics(response, 'llm')
 
         except Exception as e:
             logger.error(f"LLM hatasi: {e}")
@@ -165,7 +209,8 @@ class LLMManager:
             return "Bir hata oluştu. Lütfen tekrar dene."
 
         # Post-processing: yasakli kaliplari temizle
-        response_text = self._post_process(response_text)
+        with maybe_span(self.perf_tracker, 'post_process'):
+            response_text = self._post_process(response_text)
 
         # Performans olcumu bitir
         if self.perf_tracker:
@@ -181,13 +226,238 @@ class LLMManager:
         logger.success(f"Cevap alindi ({len(response_text)} karakter)")
         return response_text
 
+    def _stream_tokens(self, client, messages: List[Dict], cancel: threading.Event) -> Iterator[str]:
+        """
+        Ollama stream'inden token akit
+
+        cancel set edilince veya generator kapatilinca baglanti kapanir; Ollama istemci
+        gidince uretimi birakir (GPU serbest kalir). Ilk token suresi (TTFT)
+        ve son chunk'taki Ollama sayaclari kapanista kaydedilir; tur trace'inde
+        first_token (istek -> ilk token) ve token_stream (decode) span'lari.
+        """
+        start = time.perf_counter()
+        ttft = None
+        final = None
+        stream_response = client.chat(
+            model=self.config['model'],
+            messages=messages,
+            stream=True,
+            options={
+                'temperature': self.config.get('temperature', 0.4),
+                'top_p': self.config.get('top_p', 0.85),
+                'top_k': self.config.get('top_k', 40),
+                'repeat_penalty': self.config.get('repeat_penalty', 1.15),
+                'repeat_last_n': self.config.get('repeat_last_n', 128),
+                'num_predict': self.config.get('max_tokens', 1024),
+            },
+            keep_alive=self.config.get('keep_alive')
+        )
+        waiting = self.perf_tracker.start_span('first_token') if self.perf_tracker else None
+        streaming = None
+
+        try:
+            for chunk in stream_response:
+                if cancel.is_set():
+                    return
+                if chunk.get('done'):
+                    final = chunk
+                if 'message' in chunk and 'content' in chunk['message']:
+                    content = chunk['message']['content']
+                    if content and ttft is None:
+                        ttft = time.perf_counter() - start
+                        if waiting is not None:
+                            waiting.end()
+                            streaming = self.perf_tracker.start_span('token_stream')
+                    yield content
+        finally:
+            close = getattr(stream_response, 'close', None)
+            if close:
+                close()
+            for span in (waiting, streaming):
+                if span is not None:
+                    span.end()
+            if ttft is not None or final is not None:
+                self._record_ollama_metrics(final, 'llm', ttft)
+
+    def _record_ollama_metrics(self, response, prefix: str, ttft: Optional[float] = None) -> Dict[str, float]:
+        """
+        Ollama cevap sayaclarini perf_tracker'a yaz
+
+        Args:
+            response: chat() cevabi veya akisin son (done) chunk'i; iptalde None
+            prefix: Metrik on eki ('llm', 'vlm')
+            ttft: Istemcide olculen ilk token suresi (akista); yoksa sunucu
+                tarafindan load + prompt_eval ile yaklasiklanir
+
+        Returns:
+            {'ttft', 'tokens_per_sec', 'prompt_tokens', 'prompt_eval', 'load', 'decode'}
+            (saniye; Ollama'nin bildirmedigi alanlar yok)
+        """
+        def field(key):
+            try:
+                return (response.get(key) if response is not None else None) or 0
+            except Exception:
+                return 0
+
+        metrics: Dict[str, float] = {}
+        load = field('load_duration') / 1e9
+        prompt_eval = field('prompt_eval_duration') / 1e9
+        decode = field('eval_duration') / 1e9
+
+        if ttft is None and (load or prompt_eval):
+            ttft = load + prompt_eval
+        if ttft is not None:
+            metrics['ttft'] = ttft
+        if load:
+            metrics['load'] = load
+        if field('prompt_eval_count'):
+            # Ollama prompt'u cache'ten aldiysa sayac gelmez
+            metrics['prompt_tokens'] = field('prompt_eval_count')
+            metrics['prompt_eval'] = prompt_eval
+        if decode and field('eval_count'):
+            metrics['decode'] = decode
+            metrics['tokens_per_sec'] = field('eval_count') / decode
+
+        self.last_metrics = metrics
+        if self.perf_tracker:
+            for key, value in metrics.items():
+                self.perf_tracker.record(f'{prefix}_{key}', value)
+            span = self.perf_tracker.current_span()
+            if span is not None:
+                span.set(**metrics)
+
+        if metrics:
+            logger.opt(lazy=True).debug(
+                "{} metrikleri: {}", lambda: prefix,
+                lambda: ", ".join(f"{k}={v:.3f}" for k, v in metrics.items())
+            )
+        return metrics
+
+    def generate_sentences(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[str]:
+        """
+        Cevabi cumle cumle akit (sesli mod: ilk cumle LLM bitmeden TTS'e gider)
+
+        Args:
+            prompt: Kullanici sorusu
+            system_prompt: Ozel system prompt (opsiyonel)
+            cancel_event: Bu cagrinin iptal bayragi (None = cagriya ozel yeni bayrak)
+
+        Yields:
+            Temizlenmis cumleler; iptal edilirse akis kesilir ve
+            cevap gecmise/cache'e yazilmaz
+        """
+
+        with self._cancel_scope(cancel_event) as cancel:
+            yield from self._generate_sentences(prompt, system_prompt, cancel)
+
+    def _generate_sentences(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        cancel: threading.Event
+    ) -> Iterator[str]:
+        """generate_sentences() govdesi (cancel: cagriya ozel iptal bayragi)"""
+
+        if self.cache_manager:
+            with maybe_span(self.perf_tracker, 'cache_lookup'):
+                cached = self.cache_manager.get(prompt)
+            if cached:
+                logger.info("Cache'ten donduruluyor: {}...", prompt[:50])
+                self._update_history(prompt, cached)
+                yield from (part.strip() for part in _SENTENCE_END.split(cached) if part.strip())
+                return
+
+        if self.perf_tracker:
+            self.perf_tracker.start_operation('llm_inference')
+
+        search_context = self._check_and_search(prompt)
+        with maybe_span(self.perf_tracker, 'model_load'):
+            client = self.model_manager.load_model("llm")
+        with maybe_span(self.perf_tracker, 'prompt_build'):
+            messages = self._build_messages(prompt, system_prompt, search_context)
+
+        if cancel.is_set():
+            logger.info("LLM istegi gonderilmeden iptal edildi")
+            if self.perf_tracker:
+                self.perf_tracker.end_operation('llm_inference')
+            return
+
+        logger.info("Qwen2.5'e soruluyor (cumle akisi): {}...", prompt[:50])
+
+        spoken: List[str] = []
+        buffer = ""
+        drifted = False
+        failed = False
+        tokens = self._stream_tokens(client, messages, cancel)
+
+        try:
+            for token in tokens:
+                buffer += token
+                *complete, buffer = _SENTENCE_END.split(buffer)
+                for sentence in complete:
+                    clean = self._clean_text(sentence)
+                    if clean:
+                        spoken.append(clean)
+                        yield clean
+                    # Model dil kaydirdiysa kalan cevap atilir
+                    if _CJK_PATTERN.search(sentence):
+                        drifted = True
+                        break
+                if drifted:
+                    break
+
+            tail = "" if drifted or cancel.is_set() else self._clean_text(buffer)
+            if tail:
+                spoken.append(tail)
+                yield tail
+        except Exception as e:
+            logger.error(f"LLM hatasi: {e}")
+            failed = True
+        finally:
+            tokens.close()
+            if self.perf_tracker:
+                self.perf_tracker.end_operation('llm_inference')
+
+        if cancel.is_set():
+            logger.info(f"LLM uretimi iptal edildi ({len(spoken)} cumle sonra)")
+            return
+
+        if failed and not spoken:
+            yield "Bir hata oluştu. Lütfen tekrar dene."
+            return
+
+        if not spoken:
+            spoken.append("Bir sorun oluştu, lütfen tekrar dene.")
+            yield spoken[0]
+
+        response_text = " ".join(spoken)
+        if self.cache_manager and not search_context and not failed:
+            self.cache_manager.set(prompt, response_text)
+        self._update_history(prompt, response_text)
+
+        logger.success(f"Cevap alindi ({len(response_text)} karakter, {len(spoken)} cumle)")
+
     def _post_process(self, text: str) -> str:
         """Yanittan yasakli kaliplari, yabanci dil ve sorunlu ifadeleri temizle"""
 
+        text = self._clean_text(text)
+
+        # 6) Eger metin tamamen bosaldiysa fallback
+        if not text:
+            text = "Bir sorun oluştu, lütfen tekrar dene."
+
+        return text
+
+    def _clean_text(self, text: str) -> str:
+        """_post_process adimlari 1-5 (fallback yok; cumle bazinda da kullanilir)"""
+
         # 1) Yabanci dil filtresi (Cince, Japonca, Korece karakterleri tespit et ve kes)
-        import re
-        # CJK Unicode bloklari
-        cjk_pattern = re.compile(r'[\u4e00-\u9fff\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]')
+        cjk_pattern = _CJK_PATTERN
 
         if cjk_pattern.search(text):
             # Cince/Japonca/Korece karakter bulundu -- o noktadan kes
@@ -231,10 +501,6 @@ class LLMManager:
         while "\n\n\n" in text:
             text = text.replace("\n\n\n", "\n\n")
 
-        # 6) Eger metin tamamen bosaldiysa fallback
-        if not text:
-            text = "Bir sorun oluştu, lütfen tekrar dene."
-
         return text
 
     def _check_and_search(self, prompt: str) -> Optional[str]:
@@ -246,7 +512,8 @@ class LLMManager:
             return None
 
         try:
-            result = self.web_search.smart_search(prompt)
+            with maybe_span(self.perf_tracker, 'web_search'):
+                result = self.web_search.smart_search(prompt)
             if result:
                 logger.info(f"Web arama sonucu alindi ({len(result)} karakter)")
             return result
@@ -306,6 +573,38 @@ class LLMManager:
         if len(self.conversation_history) > self.max_history * 2:
             self.conversation_history = self.conversation_history[-(self.max_history * 2):]
 
+    def warm_up(self):
+        """Modeli Ollama'da onceden yukle (bos istek), keep_alive suresince sicak kalir"""
+        try:
+            client = self.model_manager.load_model("llm")
+            client.generate(model=self.config['model'], prompt="", keep_alive=self.config.get('keep_alive'))
+            logger.info(f"LLM isitildi: {self.config['model']}")
+        except Exception as e:
+            logger.warning(f"LLM isitma hatasi: {e}")
+
+    def cancel(self):
+        """Bu yoneticideki aktif cagrilarin hepsini kes; generate() bos metin doner"""
+        with self._cancel_lock:
+            for event in self._active_cancels:
+                event.set()
+
+    @contextmanager
+    def _cancel_scope(self, cancel_event: Optional[threading.Event]):
+        """
+        Cagri boyunca iptal bayragini aktif tut
+
+        Turun basinda olusur; onceki turdan kalan iptal yeni turu kesmez.
+        Disaridan verilen bayrak oldugu gibi kullanilir (sahibi cagiran).
+        """
+        cancel = cancel_event if cancel_event is not None else threading.Event()
+        with self._cancel_lock:
+            self._active_cancels.add(cancel)
+        try:
+            yield cancel
+        finally:
+            with self._cancel_lock:
+                self._active_cancels.discard(cancel)
+
     def clear_history(self):
         """Gecmisi temizle"""
         self.conversation_history = []
@@ -389,6 +688,7 @@ class LLMManager:
                         }
                     )
                     result = response.get('message', {}).get('content', '').strip()
+                    self._record_ollama_metrics(response, 'vlm')
                     if result:
                         logger.success(f"Gorsel analiz tamamlandi (deneme {idx}) - Cevap: {result[:120]}...")
                         break
@@ -27,6 +27,8 @@ class ModelManager:
         self.loaded_models: Dict[str, Any] = {}
         self.last_used: Dict[str, float] = {}
         self.max_vram = config['hardware']['gpu_memory_limit']
+        # VRAMMonitor.start_sampler(): varsa son ornek okunur, NVML'e gidilmez
+        self.vram_sampler = None
 
         # NVIDIA GPU monitoring baslat
         self.gpu_handle = None
@@ -42,8 +44,25 @@ class ModelManager:
             logger.warning(f"GPU monitoring baslatilamadi: {e}")
             self.gpu_handle = None
 
-    def get_vram_usage(self) -> float:
-        """Mevcut VRAM kullanimi (GB)"""
+    def get_vram_usage(self, fresh: bool = False) -> float:
+        """
+        Mevcut VRAM kullanimi (GB)
+
+        Args:
+            fresh: Ornekleyicinin son degeri yerine simdi olc (yukleme/bosaltma
+                sonrasi; yeni ornek tampona da yazilir, sonraki karar bayat okumaz)
+        """
+        sample = None
+        if self.vram_sampler is not None and self.vram_sampler.enabled:
+            if fresh:
+                try:
+                    self.vram_sampler.sample()
+                except Exception as e:
+                    logger.debug("VRAM ornegi alinamadi: {}", e)
+            sample = self.vram_sampler.latest()
+        if sample is not None and sample['used_gb'] is not None:
+            return sample['used_gb']
+
         if self.gpu_handle is None:
             return 0.0
 
@@ -58,14 +77,14 @@ class ModelManager:
         Model yukle - gerekirse eskiyi bosalt
 
         Args:
-            model_name: 'llm', 'vlm', 'stt'
+            model_name: 'llm', 'vlm', 'stt', 'kws'
             force: Zorla yukle (bellekte baska model olsa bile)
         """
 
         # Zaten yukluyse
         if model_name in self.loaded_models and not force:
             self.last_used[model_name] = time.time()
-            logger.debug(f"{model_name} zaten bellekte")
+            logger.debug("{} zaten bellekte", model_name)
             return self.loaded_models[model_name]
 
         # VRAM kontrolu
@@ -85,13 +104,15 @@ class ModelManager:
             model = self._load_vlm()
         elif model_name == "stt":
             model = self._load_stt()
+        elif model_name == "kws":
+            model = self._load_kws()
         else:
             raise ValueError(f"Bilinmeyen model: {model_name}")
 
         self.loaded_models[model_name] = model
         self.last_used[model_name] = time.time()
 
-        new_vram = self.get_vram_usage()
+        new_vram = self.get_vram_usage(fresh=True)
         logger.success(f"{model_name} yuklendi! VRAM: {new_vram:.2f}GB (+{new_vram-current_vram:.2f}GB)")
 
         return model
@@ -119,7 +140,17 @@ class ModelManager:
             # Bellegi temizle (Ollama kendi GPU bellegini yonetir, gc yeterli)
             gc.collect()
 
-            logger.info(f"{model_name} bellekten bosaltildi. VRAM: {self.get_vram_usage():.2f}GB")
+            logger.info(f"{model_name} bellekten bosaltildi. VRAM: {self.get_vram_usage(fresh=True):.2f}GB")
+
+    def get_residency(self) -> Dict[str, float]:
+        """
+        Bellekteki modeller
+
+        Returns:
+            {model adi: son kullanimdan beri gecen saniye}
+        """
+        now = time.time()
+        return {name: round(now - self.last_used.get(name, now), 1) for name in list(self.loaded_models)}
 
     def auto_cleanup(self):
         """Timeout'a ugramis modelleri bosalt"""
@@ -166,7 +197,7 @@ class ModelManager:
         walk(models_response)
 
         if names:
-            logger.debug(f"Bulunan Ollama modelleri: {names}")
+            logger.debug("Bulunan Ollama modelleri: {}", names)
         else:
             logger.warning(f"Ollama model listesi bos! Raw response type: {type(models_response)}")
 
@@ -237,18 +268,40 @@ class ModelManager:
             default_workers = self.config.get('hardware', {}).get('cpu_threads', 4)
             num_workers = int(self.config['stt'].get('num_workers', default_workers))
             num_workers = max(1, num_workers)
+            # Varsayilan: CTranslate2'nin thread sayisi (etkilesimli tek kayit);
+            # toplu modda run_transcribe cekirdekleri worker'lara boler
+            extra = {}
+            if self.config['stt'].get('cpu_threads'):
+                extra['cpu_threads'] = int(self.config['stt']['cpu_threads'])
 
             model = WhisperModel(
                 model_size,
                 device=device,
                 compute_type=compute_type,
-                num_workers=num_workers
+                num_workers=num_workers,
+                **extra
             )
             return model
         except Exception as e:
             logger.error(f"STT yukleme hatasi: {e}")
             raise
 
+    def _load_kws(self):
+        """Wake-word icin kucuk Faster-Whisper (CPU, INT8, tek thread)"""
+        try:
+            from faster_whisper import WhisperModel
+
+            wake = self.config['stt'].get('wake_word', {})
+            return WhisperModel(
+                wake.get('model_size', 'tiny'),
+                device="cpu",
+                compute_type="int8",
+                cpu_threads=int(wake.get('cpu_threads', 1))
+            )
+        except Exception as e:
+            logger.error(f"Wake-word modeli yukleme hatasi: {e}")
+            raise
+
     def __del__(self):
         """Cleanup"""
         try:
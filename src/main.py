@@ -5,8 +5,10 @@ RTX 2060 Super Optimized
 """
 
 import argparse
+import json
 import yaml
 import sys
+import time
 from pathlib import Path
 from loguru import logger
 
@@ -30,6 +32,9 @@ from ui.gradio_ui import GradioUI
 
 from monitoring.vram_monitor import VRAMMonitor
 from monitoring.performance import PerformanceTracker
+from monitoring.metrics_server import MetricsExporter, MetricsServer
+from monitoring.trace_export import TraceExporter
+from monitoring.profiler import SamplingProfiler
 from monitoring.logger import setup_logger, log_system_info
 
 
@@ -71,6 +76,67 @@ def load_config(config_path: str = "config/settings.yaml") -> dict:
         sys.exit(1)
 
 
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.ogg', '.mp3')
+
+
+def run_transcribe(config: dict, input_dir: str, output_path: str = None):
+    """
+    Klasordeki tum kayitlari toplu transkribe et (sesli mesaj birikimi icin)
+
+    Args:
+        config: Config dict'i
+        input_dir: Ses dosyalari klasoru (alt klasorler dahil)
+        output_path: JSONL cikti dosyasi (None = sadece konsol)
+    """
+
+    files = sorted(
+        p for p in Path(input_dir).expanduser().rglob('*')
+        if p.suffix.lower() in AUDIO_EXTENSIONS
+    )
+    if not files:
+        logger.error(f"Ses dosyasi bulunamadi: {input_dir}")
+        sys.exit(1)
+
+    # Paralel transkripsiyonlar cekirdekleri paylassin (6 cekirdek / 4 worker -> 1)
+    stt_config = config['stt']
+    workers = max(1, int(stt_config.get('num_workers', 1)))
+    if not stt_config.get('cpu_threads'):
+        stt_config['cpu_threads'] = max(1, config.get('hardware', {}).get('cpu_threads', 4) // workers)
+
+    model_manager = ModelManager(config)
+    stt_engine = STTEngine(config, model_manager)
+    logger.info(
+        f"{len(files)} kayit transkribe edilecek "
+        f"({stt_engine.num_workers} worker x {stt_config['cpu_threads']} thread)"
+    )
+
+    out = open(output_path, 'w', encoding='utf-8') if output_path else None
+    start = time.perf_counter()
+    total_audio = 0.0
+    errors = 0
+
+    try:
+        for result in stt_engine.transcribe_batch(files):
+            total_audio += result['duration']
+            if result['error']:
+                errors += 1
+            print(f"[{result['index'] + 1}/{len(files)}] {result['source']}: {result['text']}")
+            if out:
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+    finally:
+        if out:
+            out.close()
+        model_manager.unload_model("stt")
+        stt_engine.transcript_cache.save()
+
+    elapsed = time.perf_counter() - start
+    logger.success(
+        f"{len(files)} kayit, {total_audio:.0f} sn ses, {elapsed:.1f} sn "
+        f"(RTF {elapsed / max(total_audio, 1e-9):.3f}, {errors} hata)"
+    )
+
+
 def main():
     """Ana fonksiyon"""
 
@@ -94,11 +160,21 @@ def main():
 
     parser.add_argument(
         "--mode",
-        choices=["console", "gui"],
+        choices=["console", "gui", "transcribe"],
         default="console",
         help="Calisma modu (default: console)"
     )
 
+    parser.add_argument(
+        "--input",
+        help="transcribe modu: ses dosyalari klasoru"
+    )
+
+    parser.add_argument(
+        "--output",
+        help="transcribe modu: JSONL cikti dosyasi (opsiyonel)"
+    )
+
     parser.add_argument(
         "--config",
         default="config/settings.yaml",
@@ -117,6 +193,12 @@ def main():
         help="VRAM monitoring'i devre disi birak"
     )
 
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Ornekleyici CPU profili (cikista logs/profiles/ altina yazilir)"
+    )
+
     args = parser.parse_args()
 
     # Config yukle
@@ -127,7 +209,7 @@ def main():
         config['logging']['level'] = 'DEBUG'
 
     # Logger kur
-    setup_logger(config)
+    log_writer = setup_logger(config)
 
     logger.info("=" * 60)
     logger.info("AI VOICE ASSISTANT BASLATILIYOR...")
@@ -135,6 +217,13 @@ def main():
     logger.info(f"Mod: {args.mode}")
     logger.info(f"Config: {args.config}")
 
+    # Toplu transkripsiyon: LLM/UI yuklenmez
+    if args.mode == "transcribe":
+        if not args.input:
+            parser.error("--mode transcribe icin --input gerekli")
+        run_transcribe(config, args.input, args.output)
+        return
+
     # Sistem bilgilerini logla
     log_system_info()
 
@@ -143,15 +232,39 @@ def main():
     if not args.no_vram_check:
         vram_monitor = VRAMMonitor(config)
         vram_monitor.print_stats()
+        vram_monitor.start_sampler()
 
     # Performance Tracker
     perf_tracker = PerformanceTracker()
 
+    # Tur trace'leri (Chrome trace JSON)
+    trace_config = config.get('monitoring', {}).get('trace_export', {})
+    if trace_config.get('enabled', False):
+        TraceExporter(
+            output_dir=trace_config.get('output_dir', 'logs/traces'),
+            sample_rate=trace_config.get('sample_rate', 0.1),
+            slow_threshold=trace_config.get('slow_threshold_sec'),
+            max_files=trace_config.get('max_files', 200)
+        ).attach(perf_tracker)
+        logger.info(f"Tur trace'leri: {trace_config.get('output_dir', 'logs/traces')} "
+                    f"(oran {trace_config.get('sample_rate', 0.1)})")
+
+    # Ornekleyici profil (--profile ile baslar; konsolda /profile ile ac/kapa)
+    profiler_config = config.get('monitoring', {}).get('profiler', {})
+    profiler = SamplingProfiler(
+        interval=profiler_config.get('interval_ms', 10) / 1000,
+        output_dir=profiler_config.get('output_dir', 'logs/profiles')
+    )
+    if args.profile:
+        profiler.start()
+
     # Core bilesenler
     logger.info("Core bilesenler yukleniyor...")
 
     try:
         model_manager = ModelManager(config)
+        if vram_monitor:
+            model_manager.vram_sampler = vram_monitor.sampler
         cache_manager = CacheManager(config)
         llm_manager = LLMManager(config, model_manager, cache_manager, perf_tracker)
 
@@ -166,7 +279,7 @@ def main():
 
     try:
         stt_engine = STTEngine(config, model_manager)
-        tts_engine = TTSEngine(config)
+        tts_engine = TTSEngine(config, perf_tracker)
 
         logger.success("Audio bilesenler hazir")
         logger.info("STT modeli ilk kullanimda yuklenecek (small model, CPU optimized)")
@@ -177,16 +290,41 @@ def main():
         stt_engine = None
         tts_engine = None
 
+    # Metrik ucu (Prometheus)
+    metrics_server = None
+    metrics_config = config.get('monitoring', {}).get('metrics_server', {})
+    if metrics_config.get('enabled', False):
+        exporter = MetricsExporter(
+            perf_tracker=perf_tracker,
+            vram_monitor=vram_monitor,
+            model_manager=model_manager,
+            caches={
+                'response': cache_manager,
+                'web_search': getattr(llm_manager, 'web_search', None),
+                'stt_transcript': stt_engine.transcript_cache if stt_engine else None,
+                'tts_phrase': tts_engine.phrase_cache if tts_engine else None,
+            }
+        )
+        if tts_engine:
+            exporter.add_queue_source(tts_engine.queue_depths)
+        metrics_server = MetricsServer(
+            exporter,
+            host=metrics_config.get('host', '127.0.0.1'),
+            port=metrics_config.get('port', 9464),
+            profiler=profiler
+        )
+        metrics_server.start()
+
     # UI baslat
     logger.info(f"{args.mode.upper()} UI baslatiliyor...")
 
     try:
         if args.mode == "console":
-            ui = ConsoleUI(config, llm_manager, stt_engine, tts_engine)
+            ui = ConsoleUI(config, llm_manager, stt_engine, tts_engine, profiler)
             ui.run()
 
         elif args.mode == "gui":
-            ui = GradioUI(config, llm_manager, stt_engine, tts_engine)
+            ui = GradioUI(config, llm_manager, stt_engine, tts_engine, vram_monitor)
             ui.launch()
 
         else:
@@ -204,6 +342,16 @@ def main():
         # Cleanup
         logger.info("Temizlik yapiliyor...")
 
+        if metrics_server:
+            metrics_server.stop()
+
+        if profiler.running:
+            profiler.stop_and_write()
+
+        web_search = getattr(llm_manager, 'web_search', None)
+        if web_search:
+            web_search.stop_weather_prefetch()
+
         # Modelleri bosalt
         if hasattr(model_manager, 'unload_model'):
             model_manager.unload_model("llm")
@@ -214,12 +362,25 @@ def main():
         if hasattr(cache_manager, '_save_cache'):
             cache_manager._save_cache()
 
+        if stt_engine:
+            stt_engine.transcript_cache.save()
+            logger.info(f"STT cache: {stt_engine.transcript_cache.get_statistics()}")
+            if stt_engine.wake_gate.enabled:
+                logger.info(f"Wake-word kapisi: {stt_engine.wake_gate.get_statistics()}")
+
+        if tts_engine:
+            logger.info(f"TTS cache: {tts_engine.phrase_cache.get_statistics()}")
+
         # Performance raporu
         if perf_tracker:
             perf_tracker.print_report()
 
+        if log_writer:
+            logger.info(f"Log yazici: {log_writer.get_statistics()}")
+
         # Final VRAM stats
         if vram_monitor:
+            vram_monitor.sampler.stop()
             vram_monitor.print_stats()
 
         logger.success("Temizlik tamamlandi")
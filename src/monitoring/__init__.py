@@ -4,6 +4,7 @@ Monitoring module initialization
 
 from .vram_monitor import VRAMMonitor
 from .performance import PerformanceTracker
+from .histogram import LatencyHistogram
 from .logger import setup_logger
 
-__all__ = ['VRAMMonitor', 'PerformanceTracker', 'setup_logger']
+__all__ = ['VRAMMonitor', 'PerformanceTracker', 'LatencyHistogram', 'setup_logger']
@@ -0,0 +1,241 @@
+"""
+Histogram - Sabit bellekli gecikme dağılımı
+Uzun süre çalışan sunucuda her süreyi listeye eklemek yerine logaritmik
+kovalar (HDR tarzı): kayıt O(1), bellek kova sayısıyla sınırlı, yüzdelik
+hatası ~%1 (growth=1.02). Aynı düzendeki histogramlar toplanarak
+birleştirilir (to_dict/from_dict ile süreçler arası).
+
+Kayan pencereler (son 1 dk / 15 dk) dilimli histogramlardır: her dilim
+kendi histogramını tutar, süresi dolan dilim düşer, sorguda kalanlar
+birleştirilir.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+
+PERCENTILES = (50, 90, 99)
+
+# Kayan pencereler: ad -> (süre sn, dilim sayısı)
+DEFAULT_WINDOWS = {'1m': (60, 12), '15m': (900, 15)}
+
+
+class LatencyHistogram:
+    """Logaritmik kovalı histogram (saniye cinsinden süreler; token/s gibi sayaçlar da olur)"""
+
+    def __init__(self, min_value: float = 1e-6, max_value: float = 1e6, growth: float = 1.02):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self._max_index = self._index(max_value)
+
+        # Seyrek kovalar: indeks -> adet (yalnız görülen aralıklar bellek tutar)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        """Kova i: [min_value * g^(i-1), min_value * g^i), 0 = min_value altı"""
+        if value < self.min_value:
+            return 0
+        return int(math.log(value / self.min_value) / self._log_growth) + 1
+
+    @property
+    def layout(self) -> Tuple[float, float, float]:
+        return (self.min_value, self.max_value, self.growth)
+
+    def record(self, value: float):
+        """
+        Süre ekle - O(1)
+
+        Args:
+            value: Süre (saniye)
+        """
+
+        index = min(self._index(value), self._max_index)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """
+        Başka histogramı bu histograma ekle
+
+        Args:
+            other: Aynı kova düzenindeki histogram
+
+        Returns:
+            self
+        """
+
+        if other.layout != self.layout:
+            raise ValueError(f"Histogram düzenleri farklı: {self.layout} != {other.layout}")
+
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, q: float) -> float:
+        """
+        Yüzdelik değer
+
+        Args:
+            q: 0-100
+
+        Returns:
+            Süre (saniye, kova orta noktası; gözlenen min/max ile sınırlı)
+        """
+
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                if index == 0:
+                    return self.min
+                value = self.min_value * self.growth ** (index - 0.5)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def cumulative(self, bounds: Iterable[float]) -> List[int]:
+        """
+        Sınırların altındaki kayıt sayıları (Prometheus 'le' kovaları)
+
+        Args:
+            bounds: Artan sınırlar
+
+        Returns:
+            Her sınır için adet (sınırı içeren kova dahil edilmez, hata < growth)
+        """
+
+        result = []
+        buckets = sorted(self.counts.items())
+        position, seen = 0, 0
+        for bound in bounds:
+            limit = self._index(bound)
+            while position < len(buckets) and buckets[position][0] < limit:
+                seen += buckets[position][1]
+                position += 1
+            result.append(seen)
+        return result
+
+    def summary(self, percentiles: Iterable[float] = PERCENTILES) -> Dict:
+        """
+        Özet istatistikler
+
+        Returns:
+            {'count', 'total_time', 'average_time', 'min_time', 'max_time', 'p50', ...}
+        """
+
+        if not self.count:
+            stats = {'count': 0, 'total_time': 0, 'average_time': 0, 'min_time': 0, 'max_time': 0}
+            stats.update({f'p{q}': 0 for q in percentiles})
+            return stats
+
+        stats = {
+            'count': self.count,
+            'total_time': round(self.total, 2),
+            'average_time': round(self.total / self.count, 2),
+            'min_time': round(self.min, 2),
+            'max_time': round(self.max, 2)
+        }
+        stats.update({f'p{q}': round(self.percentile(q), 3) for q in percentiles})
+        return stats
+
+    def copy(self) -> "LatencyHistogram":
+        return LatencyHistogram(*self.layout).merge(self)
+
+    def to_dict(self) -> Dict:
+        """JSON'a yazılabilir hali (süreçler arası birleştirme için)"""
+        return {
+            'layout': list(self.layout),
+            'counts': {str(index): count for index, count in self.counts.items()},
+            'count': self.count,
+            'total': self.total,
+            'min': self.min if self.count else None,
+            'max': self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LatencyHistogram":
+        histogram = cls(*data['layout'])
+        histogram.counts = {int(index): count for index, count in data['counts'].items()}
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min'] if data['min'] is not None else math.inf
+        histogram.max = data['max']
+        return histogram
+
+
+class SlidingWindowHistogram:
+    """Son window_sec saniyenin histogramı (slots dilim, dilim başına histogram)"""
+
+    def __init__(self, window_sec: float, slots: int, clock=time.monotonic, **layout):
+        self.window_sec = window_sec
+        self.slots = slots
+        self.slot_sec = window_sec / slots
+        self.clock = clock
+        self._layout = layout
+        self._slots: Deque[Tuple[int, LatencyHistogram]] = deque()
+
+    def _expire(self, slot: int):
+        while self._slots and self._slots[0][0] <= slot - self.slots:
+            self._slots.popleft()
+
+    def record(self, value: float):
+        """Süre ekle - O(1) (gerekirse yeni dilim açılır, eskiler düşer)"""
+        slot = int(self.clock() // self.slot_sec)
+        if not self._slots or self._slots[-1][0] != slot:
+            self._expire(slot)
+            self._slots.append((slot, LatencyHistogram(**self._layout)))
+        self._slots[-1][1].record(value)
+
+    def histogram(self) -> LatencyHistogram:
+        """Penceredeki dilimlerin birleşimi"""
+        self._expire(int(self.clock() // self.slot_sec))
+        merged = LatencyHistogram(**self._layout)
+        for _, histogram in self._slots:
+            merged.merge(histogram)
+        return merged
+
+
+class OperationMetrics:
+    """Tek işlemin tüm zamanlar + kayan pencere histogramları"""
+
+    def __init__(self, windows: Optional[Dict[str, Tuple[float, int]]] = None, clock=time.monotonic):
+        self.total = LatencyHistogram()
+        self.windows = {
+            name: SlidingWindowHistogram(seconds, slots, clock=clock)
+            for name, (seconds, slots) in (windows or DEFAULT_WINDOWS).items()
+        }
+
+    def record(self, value: float):
+        self.total.record(value)
+        for window in self.windows.values():
+            window.record(value)
+
+    @property
+    def count(self) -> int:
+        return self.total.count
+
+    def summary(self) -> Dict:
+        """Tüm zamanlar özeti + 'windows': {'1m': {...}, '15m': {...}}"""
+        stats = self.total.summary()
+        stats['windows'] = {name: window.histogram().summary() for name, window in self.windows.items()}
+        return stats
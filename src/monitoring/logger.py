@@ -1,28 +1,366 @@
 """
 Logger Setup - Structured Logging
+
+Asenkron mod (logging.async.enabled): loguru enqueue=True olsa da satırı
+ve JSON'u çağıran thread'de biçimlendirir. Bu modda dosya sink'i kaydı
+sadece kuyruğa koyar; biçimlendirme, toplu yazma, döndürme ve gzip
+sıkıştırma arka plan yazıcısında (AsyncLogWriter) yapılır. Modül başına
+hız sınırı (RateLimiter) sıcak yoldaki tekrar eden satırları atar.
 """
 
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
 import sys
+import threading
+import time
+import traceback
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from loguru import logger
 
 
-def setup_logger(config: dict):
+TEXT_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} | {message}"
+# WARNING ve üstü hız sınırına takılmaz
+RATE_LIMIT_MAX_LEVEL = 30
+
+
+class RateLimiter:
+    """Modül başına saniyede en fazla N satır (token bucket, loguru filter'ı)"""
+    
+    def __init__(self, limits: Dict[str, float], clock=time.monotonic):
+        """
+        Args:
+            limits: {modül öneki: saniyede satır} (örn: {'core.cache_manager': 5})
+            clock: Zaman kaynağı (test için)
+        """
+        
+        self.limits = dict(limits)
+        self._clock = clock
+        self._resolved: Dict[str, Optional[float]] = {}
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self.dropped: Dict[str, int] = {}
+    
+    def _limit(self, name: str) -> Optional[float]:
+        """En uzun eşleşen önekin sınırı (sonuç modül başına önbelleklenir)"""
+        if name not in self._resolved:
+            matches = [p for p in self.limits if name == p or name.startswith(p + '.')]
+            self._resolved[name] = self.limits[max(matches, key=len)] if matches else None
+        return self._resolved[name]
+    
+    def __call__(self, record) -> bool:
+        if record['level'].no >= RATE_LIMIT_MAX_LEVEL:
+            return True
+        name = record['name'] or ''
+        rate = self._limit(name)
+        if rate is None:
+            return True
+        
+        now = self._clock()
+        with self._lock:
+            tokens, last = self._buckets.get(name, (rate, now))
+            tokens = min(rate, tokens + (now - last) * rate)
+            if tokens < 1:
+                self._buckets[name] = (tokens, now)
+                self.dropped[name] = self.dropped.get(name, 0) + 1
+                return False
+            self._buckets[name] = (tokens - 1, now)
+            return True
+    
+    def take_dropped(self) -> Dict[str, int]:
+        """Atılan satır sayıları (okununca sıfırlanır)"""
+        with self._lock:
+            dropped, self.dropped = self.dropped, {}
+        return dropped
+
+
+class AsyncLogWriter:
+    """
+    Arka plan dosya yazıcısı (loguru stream sink'i)
+    
+    write() sadece kaydı kuyruğa koyar; yazıcı thread'i kayıtları toplu
+    biçimlendirip app_<gün>.log (+ .json) dosyalarına yazar. Gün değişince
+    veya dosya rotation_mb'yi aşınca eski dosya gzip'lenir.
+    """
+    
+    def __init__(
+        self,
+        save_path: str = "logs/",
+        json_output: bool = True,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        queue_size: int = 10000,
+        rotation_mb: float = 50,
+        retention_days: int = 7,
+        compress: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+        console_rate_limiter: Optional[RateLimiter] = None
+    ):
+        """
+        Args:
+            save_path: Log klasörü
+            json_output: app_<gün>.json da yazılsın mı
+            batch_size: Tek yazımda en fazla kayıt
+            flush_interval: İlk kayıt için en fazla bekleme (saniye)
+            queue_size: Kuyruk sınırı (doluysa kayıt atılır)
+            rotation_mb: Bu boyutu aşan dosya döndürülür
+            retention_days: Daha eski app_* dosyaları silinir
+            compress: Eski dosyalar gzip'lensin mi
+            rate_limiter: Dosya sink'inin filtresi (atılanlar dosyada özetlenir)
+            console_rate_limiter: Konsol sink'inin filtresi (sadece istatistikte sayılır)
+        """
+        
+        self.save_path = Path(save_path)
+        self.json_output = json_output
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rotation_bytes = int(rotation_mb * 1024 * 1024)
+        self.retention_days = retention_days
+        self.compress = compress
+        self.rate_limiter = rate_limiter
+        self.console_rate_limiter = console_rate_limiter
+        
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._files: Dict[str, object] = {}
+        self._day: Optional[str] = None
+        
+        # İstatistik
+        self.written = 0
+        self.dropped = 0
+        # take_dropped() sayaçları sıfırlar; toplamlar burada birikir
+        self.rate_limited = 0
+        self.console_rate_limited = 0
+        self.batches = 0
+        self.write_time = 0.0
+        
+        self.save_path.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="log-writer")
+        self._thread.start()
+    
+    # ─────────────────────────────────────────────
+    # SICAK YOL
+    # ─────────────────────────────────────────────
+    
+    def write(self, message):
+        """Loguru'dan gelen mesajın kaydını kuyruğa koy (doluysa at)"""
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            self.dropped += 1
+    
+    # ─────────────────────────────────────────────
+    # YAZICI THREAD'İ
+    # ─────────────────────────────────────────────
+    
+    def _loop(self):
+        while True:
+            batch = self._drain()
+            if batch or (self.rate_limiter is not None and self.rate_limiter.dropped):
+                self._write_batch(batch)
+            elif self._stop.is_set():
+                break
+        self._close_files()
+    
+    def _drain(self) -> List[Dict]:
+        """İlk kaydı flush_interval kadar bekle, sonra kuyruktakileri al"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _write_batch(self, batch: List[Dict]):
+        start = time.perf_counter()
+        try:
+            lines: Dict[str, List[str]] = {'log': [], 'json': []}
+            for record in batch:
+                day = record['time'].strftime('%Y-%m-%d')
+                if day != self._day:
+                    self._flush(lines)
+                    self._rotate(day)
+                lines['log'].append(self._format_text(record))
+                if self.json_output:
+                    lines['json'].append(self._format_json(record))
+            
+            if self.rate_limiter is not None:
+                dropped = self.rate_limiter.take_dropped()
+                self.rate_limited += sum(dropped.values())
+                if dropped and not self._files:
+                    self._rotate(time.strftime('%Y-%m-%d'))
+                for name, count in dropped.items():
+                    lines['log'].append(f"{time.strftime('%Y-%m-%d %H:%M:%S')} | INFO     | "
+                                        f"{name} | hız sınırı: {count} satır atlandı")
+            self._flush(lines)
+            
+            if self._files['log'].tell() > self.rotation_bytes:
+                self._rotate(self._day, size_exceeded=True)
+            
+            if batch:
+                self.written += len(batch)
+                self.batches += 1
+        except Exception as e:
+            sys.stderr.write(f"Log yazıcı hatası: {e}\n")
+        finally:
+            self.write_time += time.perf_counter() - start
+    
+    @staticmethod
+    def _format_text(record: Dict) -> str:
+        line = (f"{record['time']:%Y-%m-%d %H:%M:%S} | {record['level'].name: <8} | "
+                f"{record['name']}:{record['function']}:{record['line']} | {record['message']}")
+        if record['exception'] is not None:
+            line += "\n" + "".join(traceback.format_exception(*record['exception'])).rstrip()
+        return line
+    
+    @staticmethod
+    def _format_json(record: Dict) -> str:
+        data = {
+            'time': record['time'].isoformat(),
+            'level': record['level'].name,
+            'name': record['name'],
+            'function': record['function'],
+            'line': record['line'],
+            'thread': record['thread'].name,
+            'message': record['message'],
+        }
+        if record['extra']:
+            data['extra'] = record['extra']
+        if record['exception'] is not None:
+            data['exception'] = "".join(traceback.format_exception(*record['exception']))
+        return json.dumps(data, ensure_ascii=False, default=str)
+    
+    def _flush(self, lines: Dict[str, List[str]]):
+        for kind, pending in lines.items():
+            if pending:
+                handle = self._files[kind]
+                handle.write("\n".join(pending) + "\n")
+                handle.flush()
+                pending.clear()
+    
+    def _path(self, kind: str, day: str) -> Path:
+        return self.save_path / f"app_{day}.{kind}"
+    
+    def _rotate(self, day: str, size_exceeded: bool = False):
+        """Açık dosyaları kapat (eskileri sıkıştır), günün dosyalarını aç"""
+        closed = self._close_files()
+        if size_exceeded:
+            # Aynı günün dolan dosyası: app_<gün>.<saat>[-n].log
+            renamed = []
+            for path in closed:
+                target = self._rotated_path(path)
+                os.replace(path, target)
+                renamed.append(target)
+            closed = renamed
+        
+        if self.compress:
+            for path in closed:
+                if size_exceeded or path.stem != f"app_{day}":
+                    self._compress(path)
+        self._cleanup()
+        
+        self._day = day
+        kinds = ['log', 'json'] if self.json_output else ['log']
+        self._files = {kind: open(self._path(kind, day), 'a', encoding='utf-8') for kind in kinds}
+    
+    @staticmethod
+    def _rotated_path(path: Path) -> Path:
+        """Aynı saniyedeki döndürmeler birbirini ezmesin"""
+        stamp = time.strftime('%H%M%S')
+        index = 0
+        while True:
+            suffix = f"{stamp}-{index}" if index else stamp
+            target = path.with_name(f"{path.stem}.{suffix}{path.suffix}")
+            if not target.exists() and not Path(f"{target}.gz").exists():
+                return target
+            index += 1
+    
+    def _close_files(self) -> List[Path]:
+        closed = []
+        for handle in self._files.values():
+            handle.close()
+            closed.append(Path(handle.name))
+        self._files = {}
+        return closed
+    
+    @staticmethod
+    def _compress(path: Path):
+        with open(path, 'rb') as src, gzip.open(f"{path}.gz", 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        path.unlink()
+    
+    def _cleanup(self):
+        """retention_days'ten eski app_* dosyalarını sil"""
+        cutoff = time.time() - self.retention_days * 86400
+        for path in self.save_path.glob("app_*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+    
+    def stop(self):
+        """Kuyruğu boşalt ve dosyaları kapat (logger.remove() ve çıkışta çağrılır)"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+    
+    def get_statistics(self) -> Dict:
+        """
+        Yazıcı istatistikleri
+        
+        Returns:
+            {'written', 'dropped', 'rate_limited', 'console_rate_limited', 'batches',
+             'avg_batch', 'queue_depth', 'write_time'}
+        """
+        
+        if self.console_rate_limiter is not None:
+            self.console_rate_limited += sum(self.console_rate_limiter.take_dropped().values())
+        
+        return {
+            'written': self.written,
+            'dropped': self.dropped,
+            'rate_limited': self.rate_limited,
+            'console_rate_limited': self.console_rate_limited,
+            'batches': self.batches,
+            'avg_batch': round(self.written / self.batches, 1) if self.batches else 0.0,
+            'queue_depth': self._queue.qsize(),
+            'write_time': round(self.write_time, 3),
+        }
+
+
+def setup_logger(config: dict) -> Optional[AsyncLogWriter]:
     """
     Loguru logger'ı konfigure et
     
     Args:
         config: Ana config dict'i
+    
+    Returns:
+        Asenkron modda AsyncLogWriter (istatistik için), değilse None
     """
     
     log_config = config.get('logging', {})
     level = log_config.get('level', 'INFO')
     save_path = log_config.get('save_path', 'logs/')
     format_type = log_config.get('format', 'json')
+    async_config = log_config.get('async', {})
     
     # Eski logları temizle
     logger.remove()
     
+    if async_config.get('enabled', False):
+        return _setup_async_logger(level, save_path, format_type, async_config)
+    
     # Console logger
     logger.add(
         sys.stderr,
@@ -39,7 +377,7 @@ def setup_logger(config: dict):
         rotation="1 day",
         retention="7 days",
         level="DEBUG",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} | {message}",
+        format=TEXT_FORMAT,
         enqueue=True
     )
     
@@ -55,6 +393,48 @@ def setup_logger(config: dict):
         )
     
     logger.success(f"Logger configured - Level: {level}")
+    return None
+
+
+def _setup_async_logger(level: str, save_path: str, format_type: str, async_config: dict) -> AsyncLogWriter:
+    """Konsol (enqueue) + kuyruklu toplu dosya yazıcısı, modül başına hız sınırı"""
+    
+    limits = async_config.get('rate_limits', {}) or {}
+    # Sink başına ayrı kova: ortak limiter her kaydı iki kez sayardı
+    console_limiter = RateLimiter(limits) if limits else None
+    
+    logger.add(
+        sys.stderr,
+        format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{message}</cyan>",
+        level=level,
+        colorize=True,
+        filter=console_limiter,
+        enqueue=True
+    )
+    
+    writer = AsyncLogWriter(
+        save_path=save_path,
+        json_output=format_type == 'json',
+        batch_size=async_config.get('batch_size', 256),
+        flush_interval=async_config.get('flush_interval', 0.5),
+        queue_size=async_config.get('queue_size', 10000),
+        rotation_mb=async_config.get('rotation_mb', 50),
+        retention_days=async_config.get('retention_days', 7),
+        compress=async_config.get('compress', True),
+        rate_limiter=RateLimiter(limits) if limits else None,
+        console_rate_limiter=console_limiter
+    )
+    # Biçimlendirme yazıcıda: loguru'nun satır formatı en ucuzu
+    logger.add(
+        writer,
+        format="{message}",
+        level=async_config.get('file_level', 'DEBUG'),
+        filter=writer.rate_limiter
+    )
+    atexit.register(writer.stop)
+    
+    logger.success(f"Logger configured (async) - Level: {level}, dosya: {async_config.get('file_level', 'DEBUG')}")
+    return writer
 
 
 def log_system_info():
@@ -0,0 +1,285 @@
+"""
+Metrics Server - Prometheus/OpenMetrics metrik ucu
+Gradio servis olarak çalışırken performansı dışarıdan izlemek için
+hafif HTTP sunucusu (stdlib, ek bağımlılık yok): GET /metrics
+
+Profilci verilirse GET /debug/profile?seconds=N örnekleyici profili
+N saniye çalıştırıp katlanmış yığınları döndürür (flamegraph girdisi).
+
+Dışa aktarılanlar:
+- Aşama gecikme histogramları (PerformanceTracker)
+- Cache isabet oranları (CacheManager, WebSearchTool, STT/TTS cache)
+- Bellekteki modeller (ModelManager)
+- VRAM / GPU kullanımı / sıcaklık (VRAMMonitor)
+- Kuyruk derinlikleri (örn: TTSEngine.queue_depths)
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from typing import Callable, Dict, List, Optional
+from loguru import logger
+
+
+PREFIX = "asistan"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram kova sınırları (saniye)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Süre olmayan tracker metrikleri (token sayısı, token/s): özet olarak aktarılır
+VALUE_METRIC_SUFFIXES = ('_tokens', '_per_sec')
+QUANTILES = (0.5, 0.9, 0.99)
+MODEL_NAMES = ('llm', 'vlm', 'stt', 'kws')
+# /debug/profile süre sınırı (saniye)
+PROFILE_DEFAULT_SEC = 10.0
+PROFILE_MAX_SEC = 300.0
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels: Dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsExporter:
+    """Bileşenlerden anlık metrikleri toplayıp Prometheus metin formatına çevir"""
+
+    def __init__(
+        self,
+        perf_tracker=None,
+        vram_monitor=None,
+        model_manager=None,
+        caches: Optional[Dict[str, object]] = None
+    ):
+        self.perf_tracker = perf_tracker
+        self.vram_monitor = vram_monitor
+        self.model_manager = model_manager
+        # cache adı -> get_statistics() sunan nesne ('hits', 'misses', 'entries')
+        self.caches = {name: cache for name, cache in (caches or {}).items() if cache is not None}
+        self.queue_sources: List[Callable[[], Dict[str, int]]] = []
+
+    def add_queue_source(self, source: Callable[[], Dict[str, int]]):
+        """
+        Kuyruk derinliği kaynağı ekle
+
+        Args:
+            source: {kuyruk adı: bekleyen iş} döndüren çağrılabilir
+        """
+        self.queue_sources.append(source)
+
+    def render(self) -> str:
+        """
+        Tüm metrikler (Prometheus text exposition 0.0.4)
+
+        Returns:
+            Metin
+        """
+
+        lines: List[str] = []
+        for collect in (self._stages, self._caches, self._models, self._gpu, self._queues):
+            try:
+                collect(lines)
+            except Exception as e:
+                logger.warning(f"Metrik toplama hatası ({collect.__name__}): {e}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _family(lines: List[str], name: str, kind: str, help_text: str):
+        lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+    @staticmethod
+    def _sample(lines: List[str], name: str, value, **labels):
+        lines.append(f"{PREFIX}_{name}{_labels(labels)} {_number(value)}")
+
+    def _stages(self, lines: List[str]):
+        if self.perf_tracker is None:
+            return
+
+        histograms = self.perf_tracker.histograms()
+        durations = {k: v for k, v in histograms.items() if not k.endswith(VALUE_METRIC_SUFFIXES)}
+        values = {k: v for k, v in histograms.items() if k.endswith(VALUE_METRIC_SUFFIXES)}
+
+        if durations:
+            self._family(lines, "stage_duration_seconds", "histogram", "Aşama süreleri")
+            for stage, histogram in sorted(durations.items()):
+                for bound, count in zip(DURATION_BUCKETS, histogram.cumulative(DURATION_BUCKETS)):
+                    self._sample(lines, "stage_duration_seconds_bucket", count, stage=stage, le=_number(bound))
+                self._sample(lines, "stage_duration_seconds_bucket", histogram.count, stage=stage, le="+Inf")
+                self._sample(lines, "stage_duration_seconds_sum", round(histogram.total, 6), stage=stage)
+                self._sample(lines, "stage_duration_seconds_count", histogram.count, stage=stage)
+
+        if values:
+            self._family(lines, "stage_value", "summary", "Süre olmayan istek metrikleri (token, token/s)")
+            for metric, histogram in sorted(values.items()):
+                for q in QUANTILES:
+                    self._sample(lines, "stage_value", round(histogram.percentile(q * 100), 3),
+                                 metric=metric, quantile=_number(q))
+                self._sample(lines, "stage_value_sum", round(histogram.total, 3), metric=metric)
+                self._sample(lines, "stage_value_count", histogram.count, metric=metric)
+
+    def _caches(self, lines: List[str]):
+        stats = {name: cache.get_statistics() for name, cache in self.caches.items()}
+        if not stats:
+            return
+
+        for field, kind, help_text in (
+            ('hits', 'counter', "Cache isabetleri"),
+            ('misses', 'counter', "Cache ıskaları"),
+        ):
+            self._family(lines, f"cache_{field}_total", kind, help_text)
+            for name, values in stats.items():
+                self._sample(lines, f"cache_{field}_total", values.get(field, 0), cache=name)
+
+        self._family(lines, "cache_hit_ratio", "gauge", "Cache isabet oranı (0-1)")
+        for name, values in stats.items():
+            lookups = values.get('hits', 0) + values.get('misses', 0)
+            self._sample(lines, "cache_hit_ratio", round(values.get('hits', 0) / lookups, 4) if lookups else 0.0,
+                         cache=name)
+
+        self._family(lines, "cache_entries", "gauge", "Cache kayıt sayısı")
+        for name, values in stats.items():
+            self._sample(lines, "cache_entries", values.get('entries', 0), cache=name)
+
+    def _models(self, lines: List[str]):
+        if self.model_manager is None:
+            return
+
+        residency = self.model_manager.get_residency()
+        self._family(lines, "model_loaded", "gauge", "Model bellekte mi (1/0)")
+        for name in MODEL_NAMES:
+            self._sample(lines, "model_loaded", int(name in residency), model=name)
+        self._family(lines, "model_idle_seconds", "gauge", "Son kullanımdan beri geçen süre")
+        for name, idle in residency.items():
+            self._sample(lines, "model_idle_seconds", idle, model=name)
+
+    def _gpu(self, lines: List[str]):
+        if self.vram_monitor is None:
+            return
+
+        stats = self.vram_monitor.get_full_stats()
+        vram = stats.get('vram', {})
+        self._family(lines, "gpu_available", "gauge", "NVML ile GPU okunabiliyor mu")
+        self._sample(lines, "gpu_available", int(bool(vram.get('available'))))
+        if not vram.get('available'):
+            return
+
+        gib = 1024 ** 3
+        for name, key, help_text in (
+            ("gpu_memory_used_bytes", 'used_gb', "Kullanılan VRAM"),
+            ("gpu_memory_total_bytes", 'total_gb', "Toplam VRAM"),
+        ):
+            self._family(lines, name, "gauge", help_text)
+            self._sample(lines, name, int(vram.get(key, 0) * gib))
+
+        if stats.get('utilization_percent') is not None:
+            self._family(lines, "gpu_utilization_percent", "gauge", "GPU kullanım oranı")
+            self._sample(lines, "gpu_utilization_percent", stats['utilization_percent'])
+        if stats.get('temperature_celsius') is not None:
+            self._family(lines, "gpu_temperature_celsius", "gauge", "GPU sıcaklığı")
+            self._sample(lines, "gpu_temperature_celsius", stats['temperature_celsius'])
+
+    def _queues(self, lines: List[str]):
+        depths: Dict[str, int] = {}
+        for source in self.queue_sources:
+            depths.update(source())
+        if not depths:
+            return
+
+        self._family(lines, "queue_depth", "gauge", "Bekleyen iş sayısı")
+        for name, depth in sorted(depths.items()):
+            self._sample(lines, "queue_depth", depth, queue=name)
+
+
+class MetricsServer:
+    """GET /metrics sunan arka plan HTTP sunucusu"""
+
+    def __init__(self, exporter: MetricsExporter, host: str = "127.0.0.1", port: int = 9464, profiler=None):
+        self.exporter = exporter
+        self.host = host
+        self.port = port
+        # SamplingProfiler (None = /debug/profile kapalı)
+        self.profiler = profiler
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _handler(self):
+        exporter = self.exporter
+        profiler = self.profiler
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == '/metrics':
+                    self._reply(exporter.render())
+                elif url.path == '/debug/profile' and profiler is not None:
+                    self._profile(parse_qs(url.query))
+                else:
+                    self.send_error(404)
+
+            def _profile(self, query):
+                try:
+                    seconds = float(query.get('seconds', [PROFILE_DEFAULT_SEC])[0])
+                except ValueError:
+                    self.send_error(400, "seconds sayi olmali")
+                    return
+                seconds = min(max(seconds, 0.1), PROFILE_MAX_SEC)
+                try:
+                    body = profiler.profile(seconds)
+                except RuntimeError:
+                    # Durum satırı latin-1: mesaj ASCII
+                    self.send_error(409, "Profil zaten calisiyor")
+                    return
+                self._reply(body)
+
+            def _reply(self, text):
+                body = text.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Metrik isteği: {format % args}")
+
+        return Handler
+
+    def start(self) -> bool:
+        """
+        Sunucuyu başlat
+
+        Returns:
+            Başarılı mı (port doluysa False)
+        """
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        except OSError as e:
+            logger.error(f"Metrik sunucusu başlatılamadı ({self.host}:{self.port}): {e}")
+            return False
+
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name="metrics-server")
+        self._thread.start()
+        logger.success(f"Metrik ucu: http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        """Sunucuyu kapat"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
@@ -1,31 +1,233 @@
 """
 Performance Tracker - Performans Metrikleri
 LLM, STT, TTS sürelerini takip et
+
+Span tabanlı: her ölçüm kendi tutamacına (Span) sahiptir, süreler
+perf_counter_ns ile alınır. Aynı isimli eşzamanlı işlemler (iki Gradio
+kullanıcısı) birbirinin zamanlayıcısını ezmez; thread ve asyncio görevleri
+contextvars ile kendi aktif span'ını görür. İç içe span'lar ağaç oluşturur
+(voice_turn -> web_search -> llm_inference -> tts), yavaş bir turun hangi
+aşamada yavaşladığı print_report'ta görülür. Biten kök span'lar
+add_trace_listener ile dışarı aktarılabilir (trace_export.py).
+
+Süreler liste yerine sabit bellekli histogramlarda tutulur (histogram.py):
+p50/p90/p99 ve son 1 dk / 15 dk pencereleri.
 """
 
+import itertools
+import threading
 import time
-from typing import Dict, List, Optional
-from collections import defaultdict
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 from loguru import logger
 
+from .histogram import LatencyHistogram, OperationMetrics
+
+
+# Aktif span (with tracker.span(...) blokları)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("perf_current_span", default=None)
+# start_operation/end_operation ile açılmış span'lar (bağlama özel, değişmez demet)
+_open_operations: ContextVar[Tuple["Span", ...]] = ContextVar("perf_open_operations", default=())
+
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """Tek ölçüm: başlangıç/bitiş (ns), üst span, alt span'lar ve etiketler"""
+    
+    __slots__ = ('tracker', 'name', 'id', 'parent', 'attributes', 'children',
+                 'thread', 'start_ns', 'end_ns', '_token')
+    
+    def __init__(self, tracker: "PerformanceTracker", name: str,
+                 parent: Optional["Span"] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.tracker = tracker
+        self.name = name
+        self.id = next(_span_ids)
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+        self.children: List["Span"] = []
+        self.thread = threading.current_thread().name
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self._token = None
+    
+    @property
+    def duration_ns(self) -> int:
+        """Süre (ns); bitmemişse şu ana kadar geçen"""
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return end - self.start_ns
+    
+    @property
+    def duration(self) -> float:
+        """Süre (saniye)"""
+        return self.duration_ns / 1e9
+    
+    @property
+    def self_time(self) -> float:
+        """Alt span'lar dışında kalan süre (saniye)"""
+        return max(0, self.duration_ns - sum(c.duration_ns for c in self.children)) / 1e9
+    
+    def set(self, **attributes):
+        """Etiket ekle (örn: tokens=120, cached=True)"""
+        self.attributes.update(attributes)
+        return self
+    
+    @contextmanager
+    def activate(self):
+        """
+        Span'ı bitirmeden bağlamdaki aktif span yap
+        
+        Generator'a yayılan turlarda (Gradio) blok içindeki span'lar buna
+        bağlanır; span daha sonra end() ile kapatılır.
+        """
+        
+        token = _current_span.set(self)
+        try:
+            yield self
+        finally:
+            _current_span.reset(token)
+    
+    def end(self) -> float:
+        """
+        Span'ı kapat (ikinci çağrı etkisiz)
+        
+        Returns:
+            Süre (saniye)
+        """
+        
+        if self.end_ns is None:
+            self.end_ns = time.perf_counter_ns()
+            self.tracker._finish(self)
+        return self.duration
+    
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attributes.setdefault('error', exc_type.__name__)
+        _current_span.reset(self._token)
+        self.end()
+        return False
+    
+    def __repr__(self):
+        return f"Span({self.name!r}, {self.duration * 1000:.1f} ms)"
+
 
 class PerformanceTracker:
-    """Performans metrikleri takip sistemi"""
+    """Performans metrikleri takip sistemi (thread-safe)"""
+    
+    def __init__(self, trace_history: int = 50):
+        # İşlem başına sabit bellekli histogram (tüm zamanlar + son 1/15 dk)
+        self.metrics: Dict[str, OperationMetrics] = defaultdict(OperationMetrics)
+        self._lock = threading.Lock()
+        
+        # Son tamamlanan kök span'lar (alt ağaçlarıyla)
+        self.recent_traces: Deque[Span] = deque(maxlen=trace_history)
+        # Kök span bitince çağrılanlar (örn: TraceExporter)
+        self._trace_listeners: List[Callable[[Span], None]] = []
     
-    def __init__(self):
-        self.metrics: Dict[str, List[float]] = defaultdict(list)
-        self.operation_start_times: Dict[str, float] = {}
+    # ─────────────────────────────────────────────
+    # SPAN API
+    # ─────────────────────────────────────────────
+    
+    def span(self, name: str, parent: Optional[Span] = None, **attributes) -> Span:
+        """
+        İç içe ölçüm (context manager); blok içindeki span'lar buna bağlanır
+        
+        Usage:
+            with tracker.span('voice_turn'):
+                with tracker.span('stt'):
+                    ...
+        
+        Args:
+            name: İşlem adı
+            parent: Üst span (None = bağlamdaki aktif span). Başka thread'e
+                geçerken tracker.current_span() ile alınıp verilir.
+        """
+        
+        return Span(self, name, parent if parent is not None else self.current_span(), attributes)
     
-    def start_operation(self, operation_name: str):
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes) -> Span:
+        """
+        Bağlamı değiştirmeyen ölçüm tutamacı (generator, callback, thread için)
+        
+        Returns:
+            Span (bitirmek için span.end())
+        """
+        
+        return self.span(name, parent, **attributes)
+    
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        """Bu thread/görevdeki en içteki açık span"""
+        operations = _open_operations.get()
+        current = _current_span.get()
+        if operations and (current is None or operations[-1].start_ns > current.start_ns):
+            return operations[-1]
+        return current
+    
+    def add_trace_listener(self, listener: Callable[[Span], None]):
+        """
+        Kök span (tur) bitince çağrılacak fonksiyon ekle
+        
+        Args:
+            listener: Kök span'ı (alt ağacıyla) alır; span'ı bitiren thread'de çalışır
+        """
+        
+        self._trace_listeners.append(listener)
+    
+    def _finish(self, span: Span):
+        """Biten span'ı kaydet: süre metriği + ağaç"""
+        with self._lock:
+            self.metrics[span.name].record(span.duration)
+            if span.parent is not None:
+                span.parent.children.append(span)
+            else:
+                self.recent_traces.append(span)
+        logger.debug("✅ {} tamamlandı ({:.2f}s)", span.name, span.duration)
+        
+        if span.parent is None:
+            for listener in self._trace_listeners:
+                try:
+                    listener(span)
+                except Exception as e:
+                    logger.warning(f"Trace dinleyici hatası: {e}")
+    
+    def record(self, name: str, value: float):
+        """
+        Span dışı ölçüm ekle (örn: Ollama'nın bildirdiği süreler, token/s)
+        
+        Args:
+            name: Metrik adı (örn: 'llm_ttft')
+            value: Değer (süre ise saniye)
+        """
+        
+        with self._lock:
+            self.metrics[name].record(value)
+    
+    # ─────────────────────────────────────────────
+    # İSİMLE AÇ/KAPA (eski API)
+    # ─────────────────────────────────────────────
+    
+    def start_operation(self, operation_name: str) -> Span:
         """
         İşlem başlat - zamanlayıcıyı aç
         
         Args:
             operation_name: İşlem adı (örn: 'llm_inference', 'stt_transcription')
+        
+        Returns:
+            Span (end_operation aynı bağlamdaki en son açılanı kapatır)
         """
         
-        self.operation_start_times[operation_name] = time.time()
-        logger.debug(f"⏱️  {operation_name} başladı")
+        span = self.span(operation_name)
+        _open_operations.set(_open_operations.get() + (span,))
+        logger.debug("⏱️  {} başladı", operation_name)
+        return span
     
     def end_operation(self, operation_name: str):
         """
@@ -35,16 +237,22 @@ class PerformanceTracker:
             operation_name: İşlem adı
         """
         
-        if operation_name not in self.operation_start_times:
-            logger.warning(f"{operation_name} için başlangıç zamanı bulunamadı")
-            return
-        
-        duration = time.time() - self.operation_start_times[operation_name]
-        self.metrics[operation_name].append(duration)
-        
-        del self.operation_start_times[operation_name]
+        operations = _open_operations.get()
+        for index in range(len(operations) - 1, -1, -1):
+            if operations[index].name == operation_name:
+                span = operations[index]
+                _open_operations.set(operations[:index] + operations[index + 1:])
+                span.end()
+                return
         
-        logger.debug(f"✅ {operation_name} tamamlandı ({duration:.2f}s)")
+        logger.warning(f"{operation_name} için başlangıç zamanı bulunamadı")
+    
+    # ─────────────────────────────────────────────
+    # İSTATİSTİK
+    # ─────────────────────────────────────────────
+    
+    def _operation(self, operation_name: str) -> Optional[OperationMetrics]:
+        return self.metrics.get(operation_name)
     
     def get_average(self, operation_name: str) -> float:
         """
@@ -57,10 +265,11 @@ class PerformanceTracker:
             Ortalama süre (saniye)
         """
         
-        if operation_name not in self.metrics or not self.metrics[operation_name]:
-            return 0.0
-        
-        return sum(self.metrics[operation_name]) / len(self.metrics[operation_name])
+        with self._lock:
+            operation = self._operation(operation_name)
+            if operation is None or not operation.count:
+                return 0.0
+            return operation.total.total / operation.count
     
     def get_total_time(self, operation_name: str) -> float:
         """
@@ -73,10 +282,9 @@ class PerformanceTracker:
             Toplam süre (saniye)
         """
         
-        if operation_name not in self.metrics:
-            return 0.0
-        
-        return sum(self.metrics[operation_name])
+        with self._lock:
+            operation = self._operation(operation_name)
+            return operation.total.total if operation else 0.0
     
     def get_count(self, operation_name: str) -> int:
         """
@@ -89,10 +297,29 @@ class PerformanceTracker:
             Kaç kez yapıldı
         """
         
-        if operation_name not in self.metrics:
-            return 0
+        with self._lock:
+            operation = self._operation(operation_name)
+            return operation.count if operation else 0
+    
+    def get_percentile(self, operation_name: str, q: float, window: Optional[str] = None) -> float:
+        """
+        İşlem süresinin yüzdeliği
+        
+        Args:
+            operation_name: İşlem adı
+            q: Yüzdelik (0-100, örn: 99)
+            window: Kayan pencere ('1m', '15m'; None = tüm zamanlar)
+        
+        Returns:
+            Süre (saniye)
+        """
         
-        return len(self.metrics[operation_name])
+        with self._lock:
+            operation = self._operation(operation_name)
+            if operation is None:
+                return 0.0
+            histogram = operation.windows[window].histogram() if window else operation.total
+            return histogram.percentile(q)
     
     def get_statistics(self, operation_name: str) -> Dict:
         """
@@ -102,27 +329,14 @@ class PerformanceTracker:
             operation_name: İşlem adı
         
         Returns:
-            İstatistik dict'i
+            İstatistik dict'i (p50/p90/p99 ve 'windows' altında son 1/15 dk)
         """
         
-        if operation_name not in self.metrics or not self.metrics[operation_name]:
-            return {
-                'count': 0,
-                'total_time': 0,
-                'average_time': 0,
-                'min_time': 0,
-                'max_time': 0
-            }
-        
-        times = self.metrics[operation_name]
-        
-        return {
-            'count': len(times),
-            'total_time': round(sum(times), 2),
-            'average_time': round(sum(times) / len(times), 2),
-            'min_time': round(min(times), 2),
-            'max_time': round(max(times), 2)
-        }
+        with self._lock:
+            operation = self._operation(operation_name)
+            if operation is None:
+                return OperationMetrics().summary()
+            return operation.summary()
     
     def get_all_statistics(self) -> Dict:
         """
@@ -132,12 +346,67 @@ class PerformanceTracker:
             Tüm istatistikler
         """
         
-        all_stats = {}
+        with self._lock:
+            operations = list(self.metrics.keys())
         
-        for operation in self.metrics.keys():
-            all_stats[operation] = self.get_statistics(operation)
+        return {operation: self.get_statistics(operation) for operation in operations}
+    
+    def histograms(self) -> Dict[str, LatencyHistogram]:
+        """
+        Tüm zamanlar histogramlarının kopyaları (metrik ucu için)
         
-        return all_stats
+        Returns:
+            {işlem adı: LatencyHistogram}
+        """
+        
+        with self._lock:
+            return {name: operation.total.copy() for name, operation in self.metrics.items()}
+    
+    def export_histograms(self) -> Dict:
+        """
+        Tüm zamanlar histogramları (JSON'a yazılabilir)
+        
+        Returns:
+            {işlem adı: LatencyHistogram.to_dict()}
+        """
+        
+        with self._lock:
+            return {name: operation.total.to_dict() for name, operation in self.metrics.items()}
+    
+    def merge_histograms(self, exported: Dict):
+        """
+        Başka süreçten export_histograms() çıktısını ekle
+        
+        Args:
+            exported: {işlem adı: histogram dict'i}
+        """
+        
+        with self._lock:
+            for name, data in exported.items():
+                self.metrics[name].total.merge(LatencyHistogram.from_dict(data))
+    
+    def slowest_trace(self, name: Optional[str] = None) -> Optional[Span]:
+        """
+        Son kök span'lar içinde en yavaşı
+        
+        Args:
+            name: Sadece bu isimdeki kökler (örn: 'voice_turn')
+        """
+        
+        with self._lock:
+            traces = [s for s in self.recent_traces if name is None or s.name == name]
+        return max(traces, key=lambda s: s.duration_ns, default=None)
+    
+    @staticmethod
+    def format_trace(span: Span, indent: int = 0) -> List[str]:
+        """Span ağacını satırlara çevir (toplam / kendi süresi)"""
+        lines = [
+            f"{'  ' * indent}{span.name}: {span.duration * 1000:.1f} ms "
+            f"(kendi: {span.self_time * 1000:.1f} ms)"
+        ]
+        for child in sorted(span.children, key=lambda c: c.start_ns):
+            lines.extend(PerformanceTracker.format_trace(child, indent + 1))
+        return lines
     
     def print_report(self):
         """Performans raporunu yazdır"""
@@ -159,6 +428,16 @@ class PerformanceTracker:
             logger.info(f"  Average Time: {stats['average_time']}s")
             logger.info(f"  Min Time: {stats['min_time']}s")
             logger.info(f"  Max Time: {stats['max_time']}s")
+            logger.info(f"  p50/p90/p99: {stats['p50']}s / {stats['p90']}s / {stats['p99']}s")
+            recent = stats['windows']['1m']
+            if recent['count']:
+                logger.info(f"  Son 1 dk: {recent['count']} işlem, p99 {recent['p99']}s")
+        
+        slowest = self.slowest_trace()
+        if slowest is not None and slowest.children:
+            logger.info("\nEN YAVAŞ İŞLEM DÖKÜMÜ:")
+            for line in self.format_trace(slowest):
+                logger.info(f"  {line}")
         
         logger.info("="*60)
     
@@ -170,13 +449,15 @@ class PerformanceTracker:
             operation_name: Belirli bir işlem (None = tümü)
         """
         
-        if operation_name:
-            if operation_name in self.metrics:
-                self.metrics[operation_name] = []
-                logger.info(f"{operation_name} metrikleri sıfırlandı")
-        else:
-            self.metrics = defaultdict(list)
-            logger.info("Tüm metrikler sıfırlandı")
+        with self._lock:
+            if operation_name:
+                if operation_name in self.metrics:
+                    self.metrics[operation_name] = OperationMetrics()
+                    logger.info(f"{operation_name} metrikleri sıfırlandı")
+            else:
+                self.metrics = defaultdict(OperationMetrics)
+                self.recent_traces.clear()
+                logger.info("Tüm metrikler sıfırlandı")
     
     def context_timer(self, operation_name: str):
         """
@@ -187,16 +468,17 @@ class PerformanceTracker:
                 # ... işlem ...
         """
         
-        class TimerContext:
-            def __init__(self, tracker, name):
-                self.tracker = tracker
-                self.name = name
-            
-            def __enter__(self):
-                self.tracker.start_operation(self.name)
-                return self
-            
-            def __exit__(self, *args):
-                self.tracker.end_operation(self.name)
-        
-        return TimerContext(self, operation_name)
+        return self.span(operation_name)
+
+
+def maybe_span(tracker: Optional[PerformanceTracker], name: str, parent: Optional[Span] = None):
+    """
+    tracker.span() -- tracker yoksa etkisiz context manager
+
+    Args:
+        tracker: PerformanceTracker (None = ölçüm yok)
+        name: İşlem adı
+        parent: Üst span (None = bağlamdaki aktif span)
+    """
+
+    return tracker.span(name, parent) if tracker is not None else nullcontext()
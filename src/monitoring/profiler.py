@@ -0,0 +1,266 @@
+"""
+Profiler - Çalışan asistan için örnekleyici (sampling) CPU profili
+Yeniden başlatmadan Python tarafındaki sıcak noktaları bulmak için
+(prompt kurma, son işleme, ses hazırlama, JSON cache işleri):
+arka plan thread'i her interval'de tüm thread'lerin yığınını
+(sys._current_frames) okur; ölçülen kod enstrümante edilmez.
+
+Çıktılar (logs/profiles/):
+- <zaman>.collapsed     flamegraph.pl / speedscope / inferno için katlanmış yığınlar
+- <zaman>_modules.txt   modül başına kendi süresi (yığının en üstündeki modül)
+
+Bekleyen thread'ler (queue.get, Event.wait, C içinde bloklanan çağrılar...)
+CPU harcamaz; include_idle=False iken sadece iki tik arasında CPU saati
+ilerleyen thread'ler sayılır (thread başına CPU saati olmayan platformlarda
+yığının tepesindeki bilinen bekleme fonksiyonlarına bakılır).
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+from loguru import logger
+
+
+# Thread başına CPU saati (Linux/macOS); yoksa IDLE_FRAMES sezgisi
+CPU_CLOCKS_AVAILABLE = hasattr(time, 'pthread_getcpuclockid')
+
+# Yığının en üstünde bunlar varsa thread boşta bekliyordur (modül, fonksiyon)
+IDLE_FRAMES = {
+    ('threading', 'wait'),
+    ('threading', '_wait_for_tstate_lock'),
+    ('queue', 'get'),
+    ('selectors', 'select'),
+    ('socketserver', 'serve_forever'),
+    ('socket', 'accept'),
+    ('socket', 'readinto'),
+    ('concurrent.futures.thread', '_worker'),
+}
+# Katlanmış yığında en fazla derinlik (yapraktan; kök tarafı kırpılır)
+MAX_DEPTH = 128
+
+
+class SamplingProfiler:
+    """Düşük maliyetli örnekleyici profil (start/stop veya profile(saniye))"""
+
+    def __init__(
+        self,
+        interval: float = 0.01,
+        output_dir: str = "logs/profiles",
+        include_idle: bool = False
+    ):
+        """
+        Args:
+            interval: Örnekleme aralığı (saniye; 0.01 = 100 Hz)
+            output_dir: Çıktı klasörü
+            include_idle: Bekleyen thread örnekleri de sayılsın mı
+        """
+
+        self.interval = interval
+        self.output_dir = Path(output_dir)
+        self.include_idle = include_idle
+
+        self.stacks: Counter = Counter()
+        self.self_samples: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        # Son tikteki thread CPU saatleri ve örneklenmeyecek thread'ler (profile() çağıranı)
+        self._cpu_times: Dict[int, float] = {}
+        self._exclude: set = set()
+        self._thread: Optional[threading.Thread] = None
+        self._timer: Optional[threading.Timer] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: Optional[float] = None) -> bool:
+        """
+        Örneklemeyi başlat (önceki sonuçlar silinir)
+
+        Args:
+            duration: Saniye sonra otomatik durdur ve yaz (None = stop()'a kadar)
+
+        Returns:
+            Başladı mı (zaten çalışıyorsa False)
+        """
+
+        if self.running:
+            return False
+
+        with self._lock:
+            self.stacks.clear()
+            self.self_samples.clear()
+            self.samples = 0
+        self.duration = 0.0
+        self._cpu_times.clear()
+        self.started_at = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="sampling-profiler")
+        self._thread.start()
+
+        if duration:
+            self._timer = threading.Timer(duration, self.stop_and_write)
+            self._timer.daemon = True
+            self._timer.start()
+
+        logger.info(f"Profil başladı ({1 / self.interval:.0f} Hz"
+                    + (f", {duration:g} sn)" if duration else ")"))
+        return True
+
+    def stop(self) -> Dict:
+        """
+        Örneklemeyi durdur
+
+        Returns:
+            summary() çıktısı
+        """
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._thread is not None:
+            self._stop.set()
+            if self._thread is not threading.current_thread():
+                self._thread.join()
+            self._thread = None
+            self.duration = time.perf_counter() - self.started_at
+        return self.summary()
+
+    def stop_and_write(self) -> Optional[Path]:
+        """Durdur ve çıktıları yaz (örnek yoksa None)"""
+        self.stop()
+        if not self.samples:
+            logger.warning("Profil: örnek yok")
+            return None
+        return self.write()
+
+    def profile(self, seconds: float) -> str:
+        """
+        Bu thread'i bekleterek belirli süre profil al (admin ucu için)
+
+        Çağıran thread örneklenmez; stop() beklemeyi erken bitirir.
+
+        Args:
+            seconds: Süre
+
+        Returns:
+            Katlanmış yığınlar (metin)
+        """
+
+        caller = threading.get_ident()
+        self._exclude.add(caller)
+        try:
+            if not self.start():
+                raise RuntimeError("Profil zaten çalışıyor")
+            self._stop.wait(seconds)
+            self.stop()
+        finally:
+            self._exclude.discard(caller)
+        if self.samples:
+            self.write()
+        return self.collapsed()
+
+    def _loop(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            frames = sys._current_frames()
+            # Biten thread'lerin saatleri unutulur
+            for ident in self._cpu_times.keys() - frames.keys():
+                del self._cpu_times[ident]
+            for ident, frame in frames.items():
+                if ident == own or ident in self._exclude:
+                    continue
+                if self.include_idle or self._on_cpu(ident, frame):
+                    self._sample(names.get(ident, str(ident)), frame)
+
+    def _on_cpu(self, ident: int, frame) -> bool:
+        """Thread son tikten beri CPU harcadı mı"""
+        if not CPU_CLOCKS_AVAILABLE:
+            return (frame.f_globals.get('__name__', '?'), frame.f_code.co_name) not in IDLE_FRAMES
+
+        try:
+            now = time.clock_gettime(time.pthread_getcpuclockid(ident))
+        except (OSError, OverflowError):
+            return False
+        last = self._cpu_times.get(ident)
+        self._cpu_times[ident] = now
+        # İlk tikte karşılaştırılacak değer yok: sayılmaz
+        return last is not None and now > last
+
+    def _sample(self, thread_name: str, frame):
+        """Tek yığını say (yaprak -> kök yürünür, derin yığında kök tarafı kırpılır)"""
+        leaf_module = frame.f_globals.get('__name__', '?')
+
+        stack: List[str] = []
+        while frame is not None and len(stack) < MAX_DEPTH:
+            stack.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        stack.append(thread_name)
+        key = ";".join(reversed(stack))
+
+        with self._lock:
+            self.stacks[key] += 1
+            self.self_samples[leaf_module] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Katlanmış yığınlar: 'thread;modül:fonk;... örnek' satırları"""
+        with self._lock:
+            return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def summary(self, top: int = 20) -> Dict:
+        """
+        Modül başına kendi süresi
+
+        Args:
+            top: En çok örneklenen kaç modül
+
+        Returns:
+            {'samples', 'duration', 'modules': [{'module', 'samples', 'self_time', 'percent'}]}
+        """
+
+        with self._lock:
+            total = self.samples
+            modules = [
+                {
+                    'module': module,
+                    'samples': count,
+                    'self_time': round(count * self.interval, 3),
+                    'percent': round(count / total * 100, 1),
+                }
+                for module, count in self.self_samples.most_common(top)
+            ]
+        return {'samples': total, 'duration': round(self.duration, 2), 'modules': modules}
+
+    def write(self) -> Path:
+        """
+        Çıktıları yaz
+
+        Returns:
+            .collapsed dosyasının yolu
+        """
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path = self.output_dir / f"{stamp}.collapsed"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+
+        summary = self.summary()
+        lines = [f"{summary['samples']} örnek, {summary['duration']} sn, aralık {self.interval * 1000:g} ms", ""]
+        lines += [f"{m['percent']:5.1f}%  {m['self_time']:8.2f} sn  {m['module']}" for m in summary['modules']]
+        with open(self.output_dir / f"{stamp}_modules.txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        logger.info(f"Profil yazıldı: {path}")
+        for module in summary['modules'][:5]:
+            logger.info(f"  {module['percent']:5.1f}%  {module['module']}")
+        return path
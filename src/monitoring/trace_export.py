@@ -0,0 +1,180 @@
+"""
+Trace Export - Tur başına Chrome trace (Perfetto) JSON'u
+Yavaş bir tur şikayetinde loguru satırları yerine turun span ağacı
+(stt -> search_intent -> search_fetch -> cache_lookup -> model_load ->
+prompt_build -> first_token -> token_stream -> post_process -> tts_synthesis)
+chrome://tracing veya https://ui.perfetto.dev ile açılıp kritik yol görülür.
+
+Turlar örneklenir (sample_rate); slow_threshold'u aşan turlar her zaman
+yazılır. Dosyalar logs/traces/ altına, en fazla max_files adet tutulur.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+from loguru import logger
+
+from .performance import PerformanceTracker, Span
+
+
+# Kök span adları (UI'ların tur span'ları)
+TURN_SPANS = ('voice_turn', 'chat_turn', 'text_turn')
+# Ollama'nın bildirdiği sunucu süreleri (span etiketi, olay adı): akışsız
+# isteklerde istemci TTFT/decode ayıramaz, aşamalar span'ın sonuna dizilir
+SERVER_PHASES = (('load', 'ollama_load'), ('prompt_eval', 'ollama_prompt_eval'), ('decode', 'ollama_decode'))
+
+
+def _json_safe(attributes: Dict) -> Dict:
+    return {key: value if isinstance(value, (bool, int, float, str)) or value is None else str(value)
+            for key, value in attributes.items()}
+
+
+def to_chrome_trace(root: Span) -> Dict:
+    """
+    Span ağacını Chrome Trace Event formatına çevir
+
+    Args:
+        root: Kök span (bitmiş)
+
+    Returns:
+        {'traceEvents': [...], 'displayTimeUnit': 'ms', 'otherData': {...}}
+        (ts/dur mikrosaniye, tur başlangıcına göre)
+    """
+
+    pid = os.getpid()
+    threads: Dict[str, int] = {}
+    events: List[Dict] = []
+
+    def tid(name: str) -> int:
+        return threads.setdefault(name, len(threads) + 1)
+
+    def walk(span: Span):
+        thread = tid(span.thread)
+        start = (span.start_ns - root.start_ns) / 1000
+        duration = span.duration_ns / 1000
+        events.append({
+            'name': span.name, 'cat': root.name, 'ph': 'X',
+            'ts': round(start, 3), 'dur': round(duration, 3),
+            'pid': pid, 'tid': thread, 'args': _json_safe(span.attributes),
+        })
+
+        if not span.children:
+            phases = [(name, span.attributes[key] * 1e6) for key, name in SERVER_PHASES
+                      if span.attributes.get(key)]
+            offset = start + duration - sum(length for _, length in phases)
+            for name, length in phases:
+                if offset >= start:
+                    events.append({
+                        'name': name, 'cat': 'ollama', 'ph': 'X',
+                        'ts': round(offset, 3), 'dur': round(length, 3),
+                        'pid': pid, 'tid': thread, 'args': {},
+                    })
+                offset += length
+
+        for child in sorted(span.children, key=lambda c: c.start_ns):
+            walk(child)
+
+    walk(root)
+
+    for name, thread in threads.items():
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread, 'args': {'name': name}})
+
+    started_at = time.time() - (time.perf_counter_ns() - root.start_ns) / 1e9
+    return {
+        'traceEvents': events,
+        'displayTimeUnit': 'ms',
+        'otherData': {
+            'turn': root.name,
+            'duration_ms': round(root.duration * 1000, 1),
+            'started_at': time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started_at)),
+        },
+    }
+
+
+class TraceExporter:
+    """Biten turları örnekleyip Chrome trace dosyası olarak yaz"""
+
+    def __init__(
+        self,
+        output_dir: str = "logs/traces",
+        sample_rate: float = 0.1,
+        slow_threshold: Optional[float] = None,
+        max_files: int = 200,
+        turns: Sequence[str] = TURN_SPANS,
+        rng: Callable[[], float] = random.random
+    ):
+        """
+        Args:
+            output_dir: Trace klasörü
+            sample_rate: Yazılacak tur oranı (0-1)
+            slow_threshold: Bu süreyi (saniye) aşan turlar her zaman yazılır
+            max_files: Klasörde tutulacak en fazla dosya (eskiler silinir)
+            turns: Dışa aktarılan kök span adları
+            rng: [0, 1) üreteci (test için)
+        """
+
+        self.output_dir = Path(output_dir)
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.max_files = max_files
+        self.turns = set(turns)
+        self._rng = rng
+        self._lock = threading.Lock()
+
+    def attach(self, tracker: PerformanceTracker) -> "TraceExporter":
+        """Tracker'ın biten turlarını dinle"""
+        tracker.add_trace_listener(self.export)
+        return self
+
+    def should_export(self, span: Span) -> bool:
+        if span.name not in self.turns:
+            return False
+        if self.slow_threshold is not None and span.duration >= self.slow_threshold:
+            return True
+        return self._rng() < self.sample_rate
+
+    def export(self, span: Span) -> Optional[Path]:
+        """
+        Tur örneklendiyse yaz
+
+        Args:
+            span: Biten kök span
+
+        Returns:
+            Dosya yolu veya None (örneklenmedi / yazılamadı)
+        """
+
+        if not self.should_export(span):
+            return None
+        try:
+            return self.write(span)
+        except Exception as e:
+            logger.warning(f"Trace yazılamadı: {e}")
+            return None
+
+    def write(self, span: Span) -> Path:
+        """Span ağacını <zaman>_<tur>_<id>.json olarak yaz"""
+        trace = to_chrome_trace(span)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}_{span.name}_{span.id}.json"
+
+        with self._lock:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path = self.output_dir / name
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(trace, f, ensure_ascii=False)
+            self._prune()
+
+        logger.debug(f"Trace yazıldı: {path} ({trace['otherData']['duration_ms']} ms)")
+        return path
+
+    def _prune(self):
+        files = sorted(self.output_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for old in files[:max(0, len(files) - self.max_files)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
@@ -2,10 +2,18 @@
 """
 VRAM Monitor - GPU Bellek Takibi
 RTX 2060 Super icin optimizasyon amacli
+
+VRAMSampler arka planda check_interval araliginda VRAM/kullanim/sicaklik
+ornekleyip sabit boyutlu NumPy halka tamponuna yazar; ModelManager, metrik
+ucu ve Gradio sistem paneli son ornegi NVML'e dokunmadan okur. NVIDIA GPU
+yoksa NullVRAMSampler (hicbir sey yapmaz) kullanilir.
 """
 
+import threading
 import time
 from typing import Dict, Optional
+
+import numpy as np
 from loguru import logger
 
 try:
@@ -16,6 +24,128 @@ except ImportError:
     logger.warning("NVML yuklu degil! pip install nvidia-ml-py")
 
 
+# Halka tamponu sutunlari
+SAMPLE_FIELDS = ('timestamp', 'used_gb', 'total_gb', 'utilization_percent', 'temperature_celsius')
+
+
+class NullVRAMSampler:
+    """GPU yokken ornekleyici yerine: hic ornek yok, NVML cagrisi yok"""
+
+    enabled = False
+    interval = 0.0
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+    def latest(self, max_age: Optional[float] = None) -> Optional[Dict]:
+        return None
+
+    def history(self, seconds: Optional[float] = None) -> np.ndarray:
+        return np.empty((0, len(SAMPLE_FIELDS)))
+
+
+class VRAMSampler(NullVRAMSampler):
+    """Arka plan NVML ornekleyici (NumPy halka tamponu)"""
+
+    enabled = True
+
+    def __init__(self, monitor: "VRAMMonitor", interval: float, history: int = 720):
+        self.monitor = monitor
+        self.interval = max(0.1, float(interval))
+        self._buffer = np.full((max(1, int(history)), len(SAMPLE_FIELDS)), np.nan)
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Ornekleme is parcacigini baslat (zaten calisiyorsa etkisiz)"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self.sample()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="vram-sampler")
+        self._thread.start()
+        logger.info(f"VRAM ornekleyici aktif ({self.interval:g} sn aralik)")
+        return self
+
+    def stop(self):
+        """Is parcacigini durdur"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+                self.monitor.check_memory_warning()
+            except Exception as e:
+                logger.error(f"VRAM ornekleme hatasi: {e}")
+
+    def sample(self) -> np.ndarray:
+        """
+        NVML'den tek ornek al ve tampona yaz
+
+        Returns:
+            Ornek satiri (SAMPLE_FIELDS sirasinda, okunamayan alan NaN)
+        """
+
+        row = self.monitor.read_sample()
+        with self._lock:
+            self._buffer[self._count % len(self._buffer)] = row
+            self._count += 1
+        return row
+
+    def latest(self, max_age: Optional[float] = None) -> Optional[Dict]:
+        """
+        Son ornek (NVML cagrisi yok)
+
+        Args:
+            max_age: Bundan eski ornek yok sayilir (None = 2 x interval)
+
+        Returns:
+            {alan: deger} veya ornek yoksa / bayatsa / durdurulduysa None
+        """
+
+        with self._lock:
+            if not self._count or self._thread is None:
+                return None
+            row = self._buffer[(self._count - 1) % len(self._buffer)].copy()
+
+        max_age = 2 * self.interval if max_age is None else max_age
+        if time.time() - row[0] > max_age:
+            return None
+        return {field: (None if np.isnan(value) else float(value)) for field, value in zip(SAMPLE_FIELDS, row)}
+
+    def history(self, seconds: Optional[float] = None) -> np.ndarray:
+        """
+        Gecmis ornekler (eskiden yeniye)
+
+        Args:
+            seconds: Sadece son N saniye (None = tamponun tamami)
+
+        Returns:
+            (n, len(SAMPLE_FIELDS)) dizisi
+        """
+
+        with self._lock:
+            size = len(self._buffer)
+            if self._count <= size:
+                rows = self._buffer[:self._count].copy()
+            else:
+                start = self._count % size
+                rows = np.concatenate((self._buffer[start:], self._buffer[:start]))
+
+        if seconds is not None:
+            rows = rows[rows[:, 0] >= time.time() - seconds]
+        return rows
+
+
 class VRAMMonitor:
     """GPU bellek monitoru"""
 
@@ -26,6 +156,7 @@ class VRAMMonitor:
         self.check_interval = self.config.get('vram_check_interval', 5)
 
         self.gpu_handle = None
+        self.sampler = NullVRAMSampler()
 
         if PYNVML_AVAILABLE:
             self._init_nvml()
@@ -46,14 +177,80 @@ class VRAMMonitor:
             logger.error(f"NVML baslatma hatasi: {e}")
             self.gpu_handle = None
 
+    def start_sampler(self, history: Optional[int] = None):
+        """
+        Arka plan ornekleyiciyi baslat
+
+        Args:
+            history: Tampondaki ornek sayisi (None = monitoring.vram_history)
+
+        Returns:
+            VRAMSampler veya GPU yoksa NullVRAMSampler
+        """
+
+        if not self.gpu_handle:
+            logger.info("GPU yok, VRAM ornekleyici devre disi")
+            return self.sampler
+
+        if not self.sampler.enabled:
+            history = history or self.config.get('vram_history', 720)
+            self.sampler = VRAMSampler(self, self.check_interval, history)
+        return self.sampler.start()
+
+    def read_sample(self) -> np.ndarray:
+        """
+        NVML'den ham ornek (ornekleyici is parcacigi cagirir)
+
+        Returns:
+            SAMPLE_FIELDS sirasinda dizi (okunamayan alan NaN)
+        """
+
+        row = np.full(len(SAMPLE_FIELDS), np.nan)
+        row[0] = time.time()
+        if not self.gpu_handle:
+            return row
+
+        try:
+            info = pynvml.nvmlDeviceGetMemoryInfo(self.gpu_handle)
+            row[1] = info.used / 1024**3
+            row[2] = info.total / 1024**3
+        except Exception:
+            pass
+        try:
+            row[3] = pynvml.nvmlDeviceGetUtilizationRates(self.gpu_handle).gpu
+        except Exception:
+            pass
+        try:
+            row[4] = pynvml.nvmlDeviceGetTemperature(self.gpu_handle, pynvml.NVML_TEMPERATURE_GPU)
+        except Exception:
+            pass
+        return row
+
+    def _sampled_vram_info(self, sample: Dict) -> Dict:
+        """Ornekten get_vram_info() formati"""
+        if sample['used_gb'] is None or not sample['total_gb']:
+            return {'available': False}
+        used, total = sample['used_gb'], sample['total_gb']
+        return {
+            'available': True,
+            'used_gb': round(used, 2),
+            'free_gb': round(total - used, 2),
+            'total_gb': round(total, 2),
+            'usage_percent': round(used / total * 100, 2)
+        }
+
     def get_vram_info(self) -> Dict:
         """
         VRAM bilgisi al
 
         Returns:
-            VRAM istatistikleri
+            VRAM istatistikleri (ornekleyici calisiyorsa son ornekten)
         """
 
+        sample = self.sampler.latest()
+        if sample is not None:
+            return self._sampled_vram_info(sample)
+
         if not self.gpu_handle:
             return {
                 'available': False,
@@ -152,9 +349,18 @@ class VRAMMonitor:
         Tum GPU istatistikleri
 
         Returns:
-            Tam istatistik dict'i
+            Tam istatistik dict'i (ornekleyici calisiyorsa NVML cagrisi yok)
         """
 
+        sample = self.sampler.latest()
+        if sample is not None:
+            return {
+                'vram': self._sampled_vram_info(sample),
+                'utilization_percent': sample['utilization_percent'],
+                'temperature_celsius': sample['temperature_celsius'],
+                'timestamp': sample['timestamp']
+            }
+
         vram = self.get_vram_info()
         util = self.get_gpu_utilization()
         temp = self.get_temperature()
@@ -191,6 +397,7 @@ class VRAMMonitor:
 
     def __del__(self):
         """Cleanup"""
+        self.sampler.stop()
         if self.gpu_handle:
             try:
                 pynvml.nvmlShutdown()
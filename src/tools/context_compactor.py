@@ -0,0 +1,152 @@
+"""
+Context Compactor - Arama sonucu -> kompakt LLM baglami
+=======================================================
+smart_search metni system prompt'a eklenmeden once sikistirilir:
+
+- Neredeyse ayni snippet'ler tekillestirilir (kelime kumesi Jaccard)
+- Snippet'lerden sadece sorguyla ilgili / sayi iceren cumleler alinir
+- API bloklarindaki "Anahtar: deger" satirlari oldugu gibi kalir
+  (birlestirmek token kazandirmaz: "\n" -> " | ")
+- Niyet basina token butcesi uygulanir (fazla snippet atilir)
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .utils import TURKISH_TOKEN_REGEX, normalize_turkish
+
+
+# Niyet basina varsayilan token butcesi (web_search.context_budget ile ezilebilir)
+DEFAULT_CONTEXT_BUDGET = {
+    'hava': 250, 'doviz': 120, 'kripto': 150, 'altin': 200, 'spor': 250,
+    'haber': 350, 'zaman': 60, 'bilgi': 350, 'soru': 250,
+    'default': 300,
+}
+
+# Qwen tokenizer'i Turkce metinde ortalama ~3 karakter/token
+CHARS_PER_TOKEN = 3
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+_DIGIT = re.compile(r'\d')
+_STOPWORDS = {
+    've', 'ile', 'bir', 'bu', 'su', 'da', 'de', 'mi', 'mu', 'ne', 'icin',
+    'gibi', 'daha', 'cok', 'en', 'ya', 'veya', 'ki', 'the', 'of', 'and',
+}
+
+MAX_SENTENCES_PER_SNIPPET = 2
+MAX_TITLE_CHARS = 80
+DUPLICATE_THRESHOLD = 0.7
+
+
+def estimate_tokens(text: str) -> int:
+    """Yaklasik token sayisi (tokenizer yuklemeden)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+
+def _stems(text: str) -> set:
+    """Karsilastirma icin kaba govde kumesi (ilk 5 harf)"""
+    return {
+        token[:5] for token in TURKISH_TOKEN_REGEX.findall(normalize_turkish(text))
+        if token not in _STOPWORDS and len(token) > 1
+    }
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _relevant_sentences(snippet: str, query_stems: set) -> str:
+    """Snippet'ten sorguyla ilgili (veya sayi iceren) cumleleri sec"""
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(snippet) if s.strip()]
+    if len(sentences) <= 1:
+        return snippet.strip()
+
+    scored = []
+    for idx, sentence in enumerate(sentences):
+        score = len(_stems(sentence) & query_stems)
+        if _DIGIT.search(sentence):
+            score += 1
+        scored.append((score, idx, sentence))
+
+    best = sorted(
+        (item for item in scored if item[0] > 0),
+        key=lambda item: (-item[0], item[1])
+    )[:MAX_SENTENCES_PER_SNIPPET]
+    if not best:
+        return sentences[0]
+
+    # Orijinal sirayi koru
+    return " ".join(sentence for _, _, sentence in sorted(best, key=lambda item: item[1]))
+
+
+def compact_context(text: str, query: str, budget_tokens: int) -> Tuple[str, Dict]:
+    """
+    Arama sonucunu butceye sigacak sekilde sikistir
+
+    Args:
+        text: smart_search ciktisi
+        query: Kullanici sorgusu
+        budget_tokens: Izin verilen yaklasik token sayisi
+
+    Returns:
+        (kompakt metin, istatistik dict'i)
+    """
+
+    query_stems = _stems(query)
+    output: List[str] = []
+    kept_snippets: List[Tuple[int, set]] = []
+    duplicates = 0
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        if line.startswith("- "):
+            body = line[2:]
+            title, sep, snippet = body.partition(": ")
+            if not sep:
+                title, snippet = "", body
+
+            stems = _stems(snippet)
+            if any(_jaccard(stems, seen) >= DUPLICATE_THRESHOLD for _, seen in kept_snippets):
+                duplicates += 1
+                continue
+
+            snippet = _relevant_sentences(snippet, query_stems)
+            title = title[:MAX_TITLE_CHARS]
+            output.append(f"- {title}: {snippet}" if title else f"- {snippet}")
+            kept_snippets.append((len(output) - 1, stems))
+            continue
+
+        output.append(line)
+
+    # Butce: once sondaki snippet'leri at, sonra gerekirse kes
+    snippet_rows = [row for row, _ in kept_snippets]
+    while snippet_rows and estimate_tokens("\n".join(output)) > budget_tokens and len(snippet_rows) > 1:
+        del output[snippet_rows.pop()]
+
+    compacted = "\n".join(output)
+    max_chars = budget_tokens * CHARS_PER_TOKEN
+    if len(compacted) > max_chars:
+        compacted = compacted[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+    before = estimate_tokens(text)
+    after = estimate_tokens(compacted)
+    stats = {
+        'tokens_before': before,
+        'tokens_after': after,
+        'tokens_saved': max(0, before - after),
+        'duplicates_removed': duplicates,
+    }
+    return compacted, stats
+
+
+def resolve_budget(intent: str, overrides: Optional[Dict] = None) -> int:
+    """Niyet icin token butcesi (config override + varsayilan)"""
+    budgets = dict(DEFAULT_CONTEXT_BUDGET)
+    if overrides:
+        budgets.update(overrides)
+    return int(budgets.get(intent, budgets['default']))
@@ -0,0 +1,260 @@
+"""
+Search Intent - Derlenmis niyet siniflandirici
+===============================================
+smart_search icin tum kategorilerin anahtar kelimeleri import sirasinda tek bir
+token indeksine derlenir; sorgu tokenlari tek geciste taranir.
+
+- Kelime siniri farkinda eslesme ('kar' -> 'karar' eslesmez, 'nem' -> 'onemli' eslesmez)
+- '*' ile isaretli anahtar kelimeler Turkce ekleri kabul eder (hava -> havasi, dolar -> dolarin)
+- Sonuc: oncelik + skor sirali niyet listesi
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .utils import (
+    MAX_SUFFIX_LEN, TURKISH_SUFFIX_REGEX, TURKISH_TOKEN_REGEX, normalize_turkish,
+)
+
+
+# ==============================================================
+# NIYET TANIMLARI (smart_search kaskad sirasi korunur)
+# ==============================================================
+# '*' -> kelime Turkce ek alabilir, aksi halde tam kelime (kesme isaretli ek serbest)
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    'hava': [
+        'hava*', 'hava durumu*', 'sicaklik*', 'sicakligi*', 'derece*',
+        'yagmur*', 'kar', 'kar yag*', 'karli', 'ruzgar*', 'nem', 'nemli',
+        'meteoroloji*',
+    ],
+    'doviz': [
+        'dolar*', 'euro*', 'sterlin*', 'kur', 'kurlar*', 'doviz*',
+        'pound*', 'yen', 'frank*',
+    ],
+    'kripto': [
+        'bitcoin*', 'btc', 'ethereum*', 'eth', 'kripto*', 'coin*', 'solana*',
+        'dogecoin*', 'doge', 'xrp', 'bnb', 'cardano*', 'avax',
+    ],
+    'altin': [
+        'altin*', 'gram altin*', 'ceyrek*', 'tam altin*', 'cumhuriyet altini*',
+        'yarim altin*', '22 ayar*', '14 ayar*',
+    ],
+    'spor': [
+        'mac*', 'skor*', 'lig*', 'sampiyonlar*', 'galatasaray*', 'fenerbahce*',
+        'besiktas*', 'trabzonspor*', 'super lig*', 'milli takim*', 'formula*',
+        'f1', 'nba', 'basketbol*',
+    ],
+    'haber': [
+        'haber*', 'son dakika*', 'guncel*', 'ne oldu', 'olay*', 'gelisme*',
+        'aciklama*', 'duyuru*',
+    ],
+    'zaman': [
+        'saat kac*', 'su an saat', 'kac oldu', 'zaman kac', 'bugunun tarihi',
+        'bugun tarih*', 'tarih nedir', 'bugun gunlerden ne', 'hangi gundayiz',
+        'hangi gundeyiz', 'hangi gun*',
+    ],
+    'bilgi': [
+        # Soru kelimeleri
+        'kimdir', 'nedir', 'ne demek', 'nasil', 'neden', 'nerede',
+        'ne zaman', 'kac', 'kaci', 'kacinci', 'hangi', 'kim',
+        'nereye', 'nereden',
+        # Arama emirleri
+        'ara', 'bul', 'internet', 'google', 'wiki', 'arastir',
+        'anlat', 'acikla', 'tanitim', 'bilgi', 'ozet',
+        # Guncel konular
+        'populer', 'trend',
+        # Eglence
+        'film', 'dizi', 'sarki', 'muzik', 'oyun',
+        # Yemek
+        'recete', 'tarif', 'kalori', 'besin',
+        # Afet
+        'deprem', 'sel', 'yangin', 'afet',
+        # Siyaset
+        'secim', 'oy', 'siyaset', 'parti',
+        # Egitim
+        'universite', 'sinav', 'yks', 'kpss', 'ales',
+        # Seyahat
+        'ucak', 'ucus', 'bilet', 'otel', 'tatil',
+        # Saglik
+        'hastane', 'ilac', 'doktor', 'hastalik',
+        # Alisveris
+        'fiyat', 'fiyati', 'kac para', 'ucuz', 'pahali',
+        'magaza', 'satis', 'indirim', 'kampanya',
+        # Teknoloji
+        'telefon', 'bilgisayar', 'laptop', 'tablet',
+        'uygulama', 'program', 'yazilim',
+    ],
+}
+
+# Kategori onceligi: API'li alanlar > zaman > genel bilgi > soru
+INTENT_TIERS = {
+    'hava': 0, 'doviz': 0, 'kripto': 0, 'altin': 0, 'spor': 0, 'haber': 0,
+    'zaman': 1,
+    'bilgi': 2,
+    'soru': 3,
+}
+
+# Sohbet / selamlasma -- sorgu tamamen bunlardan olusuyorsa arama yapilmaz
+SMALLTALK_PHRASES = [
+    'selam', 'merhaba', 'naber', 'nasilsin', 'nabersin',
+    'iyi gunler', 'iyi aksamlar', 'iyi geceler', 'gunaydin',
+    'hey', 'sa', 'as', 'slm', 'mrb', 'nbr',
+    'tesekkurler', 'sagol', 'eyv', 'tamam', 'ok', 'peki',
+    'gorusuruz', 'bye', 'hoscakal', 'hosca kal',
+    'sen nesin', 'adin ne', 'kimsin', 'ne yapabilirsin',
+    'iyiyim', 'fena degil', 'idare eder', 'iyi',
+]
+
+# Tek basina sorulunca zaman niyeti tasiyan sorgular
+TIME_ONLY_QUERIES = {'saat', 'tarih', 'zaman', 'bugunun tarihi'}
+
+def _compile_intents():
+    """
+    Anahtar kelimelerden token indeksi kur (import sirasinda bir kez)
+
+    Returns:
+        (ifade indeksi, kelime indeksi)
+        - ifade indeksi: ilk kelime -> cok kelimeli girdiler (uzun olan once)
+        - kelime indeksi: govde -> tek kelimeli girdiler
+    """
+    phrase_index: Dict[str, List[Tuple]] = {}
+    word_index: Dict[str, List[Tuple]] = {}
+
+    for intent, keywords in INTENT_KEYWORDS.items():
+        for keyword in keywords:
+            allow_suffix = keyword.endswith('*')
+            words = tuple(keyword.rstrip('*').split())
+            entry = (intent, ' '.join(words), words, allow_suffix)
+            if len(words) > 1:
+                phrase_index.setdefault(words[0], []).append(entry)
+            else:
+                word_index.setdefault(words[0], []).append(entry)
+
+    for entries in phrase_index.values():
+        entries.sort(key=lambda e: len(e[2]), reverse=True)
+
+    return phrase_index, word_index
+
+
+def _tail_ok(tail: str, allow_suffix: bool) -> bool:
+    """Govdeden sonra kalan kisim kabul edilebilir bir ek mi?"""
+    if not tail:
+        return True
+    if allow_suffix:
+        return TURKISH_SUFFIX_REGEX.fullmatch(tail) is not None
+    return tail.startswith("'")
+
+
+def _match_word(token: str, stem: str, allow_suffix: bool) -> bool:
+    return token.startswith(stem) and _tail_ok(token[len(stem):], allow_suffix)
+
+
+def _match_at(tokens: List[str], i: int) -> Optional[Tuple]:
+    """i. tokenda baslayan en uzun anahtar kelime eslesmesi"""
+    token = tokens[i]
+
+    # Cok kelimeli ifadeler: ilk kelime birebir, son kelime ek alabilir
+    for entry in _PHRASE_INDEX.get(token, ()):
+        words = entry[2]
+        end = i + len(words)
+        if end > len(tokens):
+            continue
+        if tokens[i + 1:end - 1] != list(words[1:-1]):
+            continue
+        if _match_word(tokens[end - 1], words[-1], entry[3]):
+            return entry
+
+    # Tek kelime: token = govde + ek
+    lowest = max(1, len(token) - MAX_SUFFIX_LEN)
+    for cut in range(len(token), lowest - 1, -1):
+        entries = _WORD_INDEX.get(token[:cut])
+        if not entries:
+            continue
+        tail = token[cut:]
+        for entry in entries:
+            if _tail_ok(tail, entry[3]):
+                return entry
+    return None
+
+
+def _compile_smalltalk():
+    """Sorgunun tamami sohbet kaliplarindan mi olusuyor?"""
+    phrases = sorted(SMALLTALK_PHRASES, key=len, reverse=True)
+    alternation = '|'.join(r'\s+'.join(map(re.escape, p.split())) for p in phrases)
+    # Kaliplar arasinda bosluk/noktalama sart ("selamselam", "sasa" sohbet degil)
+    return re.compile(rf"^\s*(?:(?:{alternation})(?:[?.!,]+\s*|\s+|$))+$")
+
+
+_PHRASE_INDEX, _WORD_INDEX = _compile_intents()
+_SMALLTALK_REGEX = _compile_smalltalk()
+_QUESTION_SUFFIX = re.compile(r'(?<!\w)m[iu]\??\s*$')
+_TIER_ORDER = {intent: idx for idx, intent in enumerate(INTENT_TIERS)}
+
+
+def is_smalltalk(query_norm: str) -> bool:
+    """
+    Kisa sohbet/selamlasma sorgusu mu? (en fazla 4 kelime)
+
+    Args:
+        query_norm: normalize_turkish ile normalize edilmis sorgu
+
+    Returns:
+        Arama gereksiz mi?
+    """
+
+    if len(query_norm.split()) > 4:
+        return False
+    return bool(_SMALLTALK_REGEX.match(query_norm))
+
+
+def classify_intents(query_norm: str) -> List[Dict]:
+    """
+    Sorgudaki arama niyetlerini tek geciste bul
+
+    Args:
+        query_norm: normalize_turkish ile normalize edilmis sorgu
+
+    Returns:
+        Oncelik ve skor sirasina gore niyet listesi:
+        [{'intent': 'hava', 'score': 2.0, 'keywords': ['hava durumu']}, ...]
+    """
+
+    scores: Dict[str, float] = {}
+    matched: Dict[str, List[str]] = {}
+
+    tokens = TURKISH_TOKEN_REGEX.findall(query_norm)
+    i = 0
+    while i < len(tokens):
+        entry = _match_at(tokens, i)
+        if entry is None:
+            i += 1
+            continue
+        intent, keyword, words = entry[0], entry[1], entry[2]
+        # Cok kelimeli ifade daha guclu sinyal
+        scores[intent] = scores.get(intent, 0.0) + len(words)
+        matched.setdefault(intent, []).append(keyword)
+        i += len(words)
+
+    stripped = query_norm.strip().rstrip('?.!')
+    if 'zaman' not in scores and stripped in TIME_ONLY_QUERIES:
+        scores['zaman'] = 1.0
+        matched['zaman'] = [stripped]
+
+    if '?' in query_norm or _QUESTION_SUFFIX.search(query_norm):
+        scores['soru'] = 1.0
+        matched['soru'] = ['?']
+
+    intents = [
+        {'intent': intent, 'score': score, 'keywords': matched[intent]}
+        for intent, score in scores.items()
+    ]
+    intents.sort(key=lambda m: (INTENT_TIERS[m['intent']], -m['score'], _TIER_ORDER[m['intent']]))
+    return intents
+
+
+def detect_intents(query: str) -> List[Dict]:
+    """Ham sorgu icin normalize + siniflandir (sohbet ise bos liste)"""
+    query_norm = normalize_turkish(query.strip())
+    if is_smalltalk(query_norm):
+        return []
+    return classify_intents(query_norm)
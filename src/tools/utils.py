@@ -92,6 +92,69 @@ def clean_text(text: str) -> str:
     return text
 
 
+# Turkce karakter -> ASCII tablosu (str.translate tek geciste calisir)
+_TURKISH_ASCII_TABLE = str.maketrans({
+    'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u',
+    'Ç': 'c', 'Ğ': 'g', 'İ': 'i', 'Ö': 'o', 'Ş': 's', 'Ü': 'u',
+    '\u0307': None,  # 'İ'.lower() sonrasi kalan birlesik nokta
+    '\u2019': "'",   # Tipografik kesme isareti (İzmir’de)
+})
+
+
+def normalize_turkish(text: str) -> str:
+    """
+    Metni kucuk harfli ASCII forma indir (arama/eslestirme icin)
+
+    Args:
+        text: Ham metin (örn: "İzmir'de Hava")
+
+    Returns:
+        Normalize metin (örn: "izmir'de hava")
+    """
+
+    return text.translate(_TURKISH_ASCII_TABLE).lower()
+
+
+# Normalize (ASCII) metin uzerinde Turkce cekim/yapim ekleri (en fazla 3 ek)
+TURKISH_SUFFIX_REGEX = re.compile(
+    r"(?:'?(?:lar|ler|leri|lari|nin|nun|sinin|sunun|si|su|in|un|i|u|"
+    r"nda|nde|ndan|nden|da|de|ta|te|dan|den|tan|ten|ya|ye|yi|yu|na|ne|ni|nu|a|e|"
+    r"ligi|lugu|lik|luk|li|lu|siz|suz|ki|daki|deki)){0,3}"
+)
+MAX_SUFFIX_LEN = 12
+
+# Kelime + kesme isaretli ek ("izmir'de" tek token)
+TURKISH_TOKEN_REGEX = re.compile(r"\w+(?:'\w+)?")
+
+
+def split_turkish_word(token: str, stems, allow_suffix: bool = True, suffix_regex=None):
+    """
+    Normalize kelimeyi bilinen bir govde + Turkce ek olarak ayir
+
+    Args:
+        token: Normalize kelime (örn: "izmir'de", "ankaranin")
+        stems: Govde kumesi/dict'i (uyelik kontrolu yapilir)
+        allow_suffix: False ise sadece kesme isaretli ek kabul edilir
+        suffix_regex: Kesmesiz ek kalibi (varsayilan: TURKISH_SUFFIX_REGEX)
+
+    Returns:
+        (govde, ek) veya None -- en uzun govde once denenir
+    """
+
+    suffix_regex = suffix_regex or TURKISH_SUFFIX_REGEX
+    lowest = max(1, len(token) - MAX_SUFFIX_LEN)
+    for cut in range(len(token), lowest - 1, -1):
+        stem = token[:cut]
+        if stem not in stems:
+            continue
+        tail = token[cut:]
+        if not tail:
+            return stem, tail
+        if tail.startswith("'") or (allow_suffix and suffix_regex.fullmatch(tail)):
+            return stem, tail
+    return None
+
+
 def extract_code_blocks(text: str) -> list:
     """
     Metindeki kod bloklarını çıkar (Markdown formatında)
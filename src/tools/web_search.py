@@ -12,10 +12,21 @@ Web Search Tool - Tam Optimize Versiyon
 import re
 import time
 import hashlib
+import threading
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from loguru import logger
 
+from .context_compactor import compact_context, resolve_budget
+from .search_intent import classify_intents, is_smalltalk
+from .utils import TURKISH_TOKEN_REGEX, normalize_turkish, split_turkish_word
+
+try:
+    from ..monitoring.performance import maybe_span
+except ImportError:  # src/ sys.path'te (main.py): ust paket yok
+    from monitoring.performance import maybe_span
+
 try:
     from ddgs import DDGS
     DDGS_AVAILABLE = True
@@ -31,6 +42,17 @@ except ImportError:
     logger.warning("requests yuklu degil")
 
 
+# API uc noktalari (web_search.endpoints ile ezilebilir -- orn. yerel stub sunucu)
+DEFAULT_ENDPOINTS = {
+    'open_meteo': "https://api.open-meteo.com/v1/forecast",
+    'exchange_rates': "https://open.er-api.com/v6/latest/USD",
+    'coingecko': "https://api.coingecko.com/api/v3/simple/price",
+}
+
+# Hava niyetinde her sehir bu baslikla ayri blok (butce sehir basina olceklenir)
+WEATHER_BLOCK_HEADER = "HAVA DURUMU (CANLI VERİ):"
+
+
 # ==============================================================
 # SEHIR VERITABANI (81 il + populer ilceler + alias'lar)
 # ==============================================================
@@ -96,6 +118,14 @@ SEHIR_ALIASES = {
     'sivas': 'Sivas', 'tokat': 'Tokat',
     'tunceli': 'Tunceli', 'usak': 'Usak',
     'yozgat': 'Yozgat', 'zonguldak': 'Zonguldak',
+    'adiyaman': 'Adiyaman', 'agri': 'Agri', 'aydin': 'Aydin',
+    # Populer ilceler (il merkezi koordinati kullanilir)
+    'kadikoy': 'Istanbul', 'uskudar': 'Istanbul', 'beyoglu': 'Istanbul',
+    'sisli': 'Istanbul', 'bakirkoy': 'Istanbul', 'atasehir': 'Istanbul',
+    'cankaya': 'Ankara', 'kecioren': 'Ankara',
+    'karsiyaka': 'Izmir', 'bornova': 'Izmir',
+    'nilufer': 'Bursa', 'tarsus': 'Mersin', 'iskenderun': 'Hatay',
+    'ayvalik': 'Ayvalik', 'kapadokya': 'Nevsehir', 'pamukkale': 'Denizli',
 }
 
 # Sehir koordinatlari (81 il + populer ilceler)
@@ -145,47 +175,122 @@ SEHIR_COORDS = {
     'Tokat': (40.31, 36.55), 'Tunceli': (39.11, 39.55),
     'Usak': (38.67, 29.41), 'Yozgat': (39.82, 34.80),
     'Zonguldak': (41.45, 31.80),
+    'Adiyaman': (37.76, 38.28), 'Agri': (39.72, 43.05),
+    'Aydin': (37.85, 27.85), 'Ayvalik': (39.32, 26.69),
 }
 
 
+def _build_city_index() -> Dict[str, List[Tuple[Tuple[str, ...], str]]]:
+    """
+    Sehir gazetteer indeksi (import sirasinda bir kez kurulur)
+
+    Returns:
+        ilk token -> [(alias tokenlari, alias), ...] (uzun alias once)
+    """
+    index: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+    for alias in SEHIR_ALIASES:
+        tokens = tuple(normalize_turkish(alias).split())
+        index.setdefault(tokens[0], []).append((tokens, alias))
+    for entries in index.values():
+        entries.sort(key=lambda e: len(e[0]), reverse=True)
+    return index
+
+
+_CITY_INDEX = _build_city_index()
+
+# Bu uzunluktan kisa alias'lar sadece kesme isaretli ek alir ('van', 'kas', 'mus')
+_CITY_MIN_SUFFIX_LEN = 4
+# Sehir adindan sonra kesmesiz sadece hal ekleri (-da, -dan, -a, -nin, -daki...);
+# iyelik/yapim ekleri kabul edilmez ("karsi", "agrisi", "aydinlik")
+_CITY_CASE_SUFFIX_REGEX = re.compile(
+    r"(?:da|de|ta|te)(?:ki)?|dan|den|tan|ten|ya|ye|a|e|yi|yu|"
+    r"nin|nun|in|un|yla|yle|la|le"
+)
+
+
 class WebSearchTool:
     """Tam optimize web aramasi - API'ler + DuckDuckGo + Cache"""
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, perf_tracker=None):
         self.config = config.get('web_search', {})
+        # Tur trace'inde niyet tespiti / veri cekme span'lari (opsiyonel)
+        self.perf_tracker = perf_tracker
         self.enabled = self.config.get('enabled', True)
         self.max_results = self.config.get('max_results', 5)
         self.timeout = self.config.get('timeout', 10)
+        self.endpoints = {**DEFAULT_ENDPOINTS, **self.config.get('endpoints', {})}
 
         # Cache sistemi (RAM'de)
         self._cache = {}
         self._cache_ttl = self.config.get('cache_ttl', 300)  # 5 dakika
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # LLM baglami sikistirma (niyet basina token butcesi)
+        self.compact_enabled = self.config.get('compact_context', True)
+        self.context_budget = self.config.get('context_budget', {})
+        self.last_context_stats: Optional[Dict] = None
+
+        # Hava durumu on-yukleme (en cok sorulan sehirler tek istekte);
+        # sayac _cache_lock ile korunur (on-yukleme thread'i de okur)
+        self._city_requests: Counter = Counter()
+        self.prefetch_interval = self.config.get('weather_prefetch_interval', 0)
+        self.prefetch_top = self.config.get('weather_prefetch_top', 10)
+        self._prefetch_stop = threading.Event()
+        self._prefetch_thread: Optional[threading.Thread] = None
 
         if not DDGS_AVAILABLE:
             logger.error("DuckDuckGo search yuklu degil!")
             self.enabled = False
 
+        # Arama kapaliyken arka planda ag istegi yapilmaz
+        if self.enabled and self.prefetch_interval > 0:
+            self.start_weather_prefetch()
+
     # ==============================================================
     # CACHE SİSTEMİ
     # ==============================================================
 
     def _get_cache(self, key: str) -> Optional[str]:
         """Cache'den veri al"""
-        if key in self._cache:
-            data, timestamp = self._cache[key]
-            if time.time() - timestamp < self._cache_ttl:
-                logger.info(f"Cache hit: {key}")
-                return data
-            else:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self._cache_misses += 1
+                return None
+            data, timestamp = entry
+            if time.time() - timestamp >= self._cache_ttl:
                 del self._cache[key]
-        return None
+                self._cache_misses += 1
+                return None
+            self._cache_hits += 1
+        logger.info("Cache hit: {}", key)
+        return data
 
     def _set_cache(self, key: str, value: str):
         """Cache'e veri yaz"""
-        self._cache[key] = (value, time.time())
-        if len(self._cache) > 100:
-            oldest_key = min(self._cache, key=lambda k: self._cache[k][1])
-            del self._cache[oldest_key]
+        with self._cache_lock:
+            self._cache[key] = (value, time.time())
+            if len(self._cache) > 100:
+                oldest_key = min(self._cache, key=lambda k: self._cache[k][1])
+                del self._cache[oldest_key]
+
+    def get_statistics(self) -> Dict:
+        """
+        Cache istatistikleri
+
+        Returns:
+            İstatistik dict'i
+        """
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                'entries': len(self._cache),
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'hit_rate': round(self._cache_hits / lookups, 3) if lookups else 0.0,
+            }
 
     # ==============================================================
     # HAVA DURUMU - Open-Meteo API
@@ -193,36 +298,120 @@ class WebSearchTool:
 
     def get_weather(self, city: str) -> Optional[str]:
         """Sehir icin gercek hava durumu verisi"""
-        city_query = self._resolve_city(city)
+        return self.get_weather_multi([city]).get(city)
 
-        cache_key = f"weather_{city_query}"
-        cached = self._get_cache(cache_key)
-        if cached:
-            return cached
+    def get_weather_multi(self, cities: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Birden fazla sehrin hava durumu -- cache'te olmayanlar tek istekte
 
-        coords = SEHIR_COORDS.get(city_query)
-        if not coords:
-            logger.warning(f"Koordinat bulunamadi: {city} -> {city_query}")
-            return self._weather_search_fallback(city)
+        Args:
+            cities: Sehir adlari/alias'lari (örn: ['istanbul', 'ankara'])
 
-        logger.info(f"Open-Meteo API: {city} -> {city_query} ({coords[0]}, {coords[1]})")
+        Returns:
+            {sehir: hava metni veya None} (giris sirasiyla)
+        """
+        results: Dict[str, Optional[str]] = {}
+        to_fetch: Dict[str, List[str]] = {}
 
-        weather = self._fetch_open_meteo(city_query, coords[0], coords[1])
-        if weather:
-            self._set_cache(cache_key, weather)
-            return weather
+        for city in cities:
+            city_query = self._resolve_city(city)
+            with self._cache_lock:
+                self._city_requests[city_query] += 1
 
-        return self._weather_search_fallback(city)
+            cached = self._get_cache(f"weather_{city_query}")
+            if cached:
+                results[city] = cached
+                continue
 
-    def _fetch_open_meteo(self, city: str, lat: float, lon: float) -> Optional[str]:
-        """Open-Meteo API ile gercek hava durumu"""
-        if not REQUESTS_AVAILABLE:
-            return None
+            if city_query not in SEHIR_COORDS:
+                logger.warning(f"Koordinat bulunamadi: {city} -> {city_query}")
+                results[city] = self._weather_search_fallback(city)
+                continue
+
+            to_fetch.setdefault(city_query, []).append(city)
+
+        if to_fetch:
+            fetched = self._fetch_open_meteo_batch(list(to_fetch))
+            for city_query, requested in to_fetch.items():
+                weather = fetched.get(city_query)
+                for city in requested:
+                    results[city] = weather or self._weather_search_fallback(city)
+
+        return {city: results.get(city) for city in cities}
+
+    def prefetch_weather(self, cities: Optional[List[str]] = None) -> int:
+        """
+        En cok sorulan sehirlerin hava durumunu tek istekte cache'e al
+
+        Args:
+            cities: Sehir listesi (None = en cok sorulan prefetch_top sehir)
+
+        Returns:
+            Cache'e yazilan sehir sayisi
+        """
+        if cities is None:
+            with self._cache_lock:
+                cities = [c for c, _ in self._city_requests.most_common(self.prefetch_top)]
+            if not cities:
+                cities = ['Istanbul', 'Ankara', 'Izmir']
+
+        targets = [c for c in dict.fromkeys(self._resolve_city(c) for c in cities) if c in SEHIR_COORDS]
+        if not targets:
+            return 0
+
+        fetched = self._fetch_open_meteo_batch(targets)
+        logger.debug(f"Hava durumu on-yukleme: {len(fetched)}/{len(targets)} sehir")
+        return len(fetched)
+
+    def start_weather_prefetch(self, interval: Optional[float] = None):
+        """Arka planda periyodik hava durumu on-yuklemesini baslat"""
+        if self._prefetch_thread and self._prefetch_thread.is_alive():
+            return
+
+        interval = interval or self.prefetch_interval
+        self._prefetch_stop.clear()
+
+        def _loop():
+            while not self._prefetch_stop.is_set():
+                try:
+                    self.prefetch_weather()
+                except Exception as e:
+                    logger.warning(f"Hava durumu on-yukleme hatasi: {e}")
+                self._prefetch_stop.wait(interval)
+
+        self._prefetch_thread = threading.Thread(
+            target=_loop, name="weather-prefetch", daemon=True
+        )
+        self._prefetch_thread.start()
+        logger.info(f"Hava durumu on-yukleme aktif ({interval}s)")
+
+    def stop_weather_prefetch(self, timeout: float = 2.0):
+        """Arka plan on-yuklemesini durdur (suren istek en fazla timeout beklenir)"""
+        self._prefetch_stop.set()
+        if self._prefetch_thread and self._prefetch_thread is not threading.current_thread():
+            self._prefetch_thread.join(timeout)
+        self._prefetch_thread = None
+
+    def _fetch_open_meteo_batch(self, cities: List[str]) -> Dict[str, str]:
+        """
+        Open-Meteo API ile coklu sehir -- virgullu lat/lon listesi, tek HTTP istegi
+
+        Args:
+            cities: SEHIR_COORDS anahtarlari
+
+        Returns:
+            {sehir: hava metni} (basarili olanlar; her biri cache'e de yazilir)
+        """
+        if not REQUESTS_AVAILABLE or not cities:
+            return {}
 
         try:
+            coords = [SEHIR_COORDS[c] for c in cities]
+            latitudes = ",".join(str(lat) for lat, _ in coords)
+            longitudes = ",".join(str(lon) for _, lon in coords)
             url = (
-                f"https://api.open-meteo.com/v1/forecast?"
-                f"latitude={lat}&longitude={lon}"
+                f"{self.endpoints['open_meteo']}?"
+                f"latitude={latitudes}&longitude={longitudes}"
                 f"&current=temperature_2m,relative_humidity_2m,apparent_temperature,"
                 f"weather_code,wind_speed_10m,wind_direction_10m,precipitation"
                 f"&daily=temperature_2m_max,temperature_2m_min,weather_code,"
@@ -230,64 +419,80 @@ class WebSearchTool:
                 f"&timezone=Europe/Istanbul&forecast_days=3"
             )
 
+            logger.info(f"Open-Meteo API: {len(cities)} sehir ({', '.join(cities)})")
             response = requests.get(url, timeout=8)
 
             if response.status_code != 200:
                 logger.warning(f"Open-Meteo HTTP {response.status_code}")
-                return None
+                return {}
 
             data = response.json()
-            current = data.get('current', {})
-            daily = data.get('daily', {})
-
-            temp = current.get('temperature_2m', '?')
-            feels = current.get('apparent_temperature', '?')
-            humidity = current.get('relative_humidity_2m', '?')
-            wind = current.get('wind_speed_10m', '?')
-            weather_code = current.get('weather_code', 0)
-
-            weather_desc = self._wmo_to_turkish(weather_code)
-
-            today_max = daily.get('temperature_2m_max', ['?'])[0]
-            today_min = daily.get('temperature_2m_min', ['?'])[0]
-            rain_prob = daily.get('precipitation_probability_max', [0])[0]
-
-            # Yarin tahmini
-            tomorrow_line = ""
-            max_list = daily.get('temperature_2m_max', [])
-            min_list = daily.get('temperature_2m_min', [])
-            codes = daily.get('weather_code', [])
-            rain_probs = daily.get('precipitation_probability_max', [])
-
-            if len(max_list) > 1:
-                tomorrow_desc = self._wmo_to_turkish(codes[1]) if len(codes) > 1 else ""
-                tomorrow_rain = rain_probs[1] if len(rain_probs) > 1 else 0
-                tomorrow_line = (
-                    f"\nYarın: {min_list[1]}°C / {max_list[1]}°C, "
-                    f"{tomorrow_desc}, yağış ihtimali: %{tomorrow_rain}"
-                )
-
-            result = (
-                f"Anlık sıcaklık: {temp}°C\n"
-                f"Hissedilen: {feels}°C\n"
-                f"Durum: {weather_desc}\n"
-                f"Nem: %{humidity}\n"
-                f"Rüzgar: {wind} km/sa\n"
-                f"Bugün en düşük: {today_min}°C, en yüksek: {today_max}°C\n"
-                f"Yağış ihtimali: %{rain_prob}"
-                f"{tomorrow_line}"
-            )
-
-            logger.success(f"Open-Meteo: {city} -> {temp}°C (hissedilen {feels}°C)")
-            return result
+            # Tek konumda nesne, coklu konumda liste doner
+            locations = data if isinstance(data, list) else [data]
+
+            results = {}
+            for city, location in zip(cities, locations):
+                weather = self._format_open_meteo(city, location)
+                if weather:
+                    results[city] = weather
+                    self._set_cache(f"weather_{city}", weather)
+            return results
 
         except requests.exceptions.Timeout:
             logger.warning("Open-Meteo zaman asimi!")
-            return None
+            return {}
         except Exception as e:
             logger.warning(f"Open-Meteo hatasi: {e}")
+            return {}
+
+    def _format_open_meteo(self, city: str, data: Dict) -> Optional[str]:
+        """Tek konumun Open-Meteo cevabini metne cevir"""
+        current = data.get('current', {})
+        daily = data.get('daily', {})
+        if not current:
             return None
 
+        temp = current.get('temperature_2m', '?')
+        feels = current.get('apparent_temperature', '?')
+        humidity = current.get('relative_humidity_2m', '?')
+        wind = current.get('wind_speed_10m', '?')
+        weather_code = current.get('weather_code', 0)
+
+        weather_desc = self._wmo_to_turkish(weather_code)
+
+        today_max = daily.get('temperature_2m_max', ['?'])[0]
+        today_min = daily.get('temperature_2m_min', ['?'])[0]
+        rain_prob = daily.get('precipitation_probability_max', [0])[0]
+
+        # Yarin tahmini
+        tomorrow_line = ""
+        max_list = daily.get('temperature_2m_max', [])
+        min_list = daily.get('temperature_2m_min', [])
+        codes = daily.get('weather_code', [])
+        rain_probs = daily.get('precipitation_probability_max', [])
+
+        if len(max_list) > 1:
+            tomorrow_desc = self._wmo_to_turkish(codes[1]) if len(codes) > 1 else ""
+            tomorrow_rain = rain_probs[1] if len(rain_probs) > 1 else 0
+            tomorrow_line = (
+                f"\nYarın: {min_list[1]}°C / {max_list[1]}°C, "
+                f"{tomorrow_desc}, yağış ihtimali: %{tomorrow_rain}"
+            )
+
+        result = (
+            f"Anlık sıcaklık: {temp}°C\n"
+            f"Hissedilen: {feels}°C\n"
+            f"Durum: {weather_desc}\n"
+            f"Nem: %{humidity}\n"
+            f"Rüzgar: {wind} km/sa\n"
+            f"Bugün en düşük: {today_min}°C, en yüksek: {today_max}°C\n"
+            f"Yağış ihtimali: %{rain_prob}"
+            f"{tomorrow_line}"
+        )
+
+        logger.success(f"Open-Meteo: {city} -> {temp}°C (hissedilen {feels}°C)")
+        return result
+
     def _wmo_to_turkish(self, code: int) -> str:
         """WMO hava kodu -> Türkçe açıklama"""
         wmo_codes = {
@@ -320,7 +525,7 @@ class WebSearchTool:
             return self._currency_search_fallback(query)
 
         try:
-            url = "https://open.er-api.com/v6/latest/USD"
+            url = self.endpoints['exchange_rates']
             response = requests.get(url, timeout=8)
 
             if response.status_code != 200:
@@ -402,7 +607,7 @@ class WebSearchTool:
         try:
             ids = ','.join(found_cryptos)
             url = (
-                f"https://api.coingecko.com/api/v3/simple/price?"
+                f"{self.endpoints['coingecko']}?"
                 f"ids={ids}&vs_currencies=usd,try&include_24hr_change=true"
             )
             response = requests.get(url, timeout=8)
@@ -523,45 +728,63 @@ class WebSearchTool:
         if city_lower in SEHIR_ALIASES:
             return SEHIR_ALIASES[city_lower]
 
-        normalized = self._strip_turkish(city_lower)
+        normalized = normalize_turkish(city.strip())
         if normalized in SEHIR_ALIASES:
             return SEHIR_ALIASES[normalized]
 
         return city.strip()
 
-    def _strip_turkish(self, text: str) -> str:
-        """Turkce karakterleri ASCII'ye cevir"""
-        replacements = [
-            ('\u00e7', 'c'), ('\u011f', 'g'), ('\u0131', 'i'),
-            ('\u00f6', 'o'), ('\u015f', 's'), ('\u00fc', 'u'),
-            ('\u00c7', 'c'), ('\u011e', 'g'), ('\u0130', 'i'),
-            ('\u00d6', 'o'), ('\u015e', 's'), ('\u00dc', 'u'),
-        ]
-        for tr_char, en_char in replacements:
-            text = text.replace(tr_char, en_char)
-        return text
-
-    def detect_city(self, text: str) -> Optional[str]:
-        """Metin icinden sehir adi bul"""
-        text_lower = text.lower()
-        text_normalized = self._strip_turkish(text_lower)
-
-        sorted_aliases = sorted(SEHIR_ALIASES.keys(), key=len, reverse=True)
-
-        for alias in sorted_aliases:
-            alias_lower = alias.lower()
-            alias_norm = self._strip_turkish(alias_lower)
-
-            for check_text in [text_lower, text_normalized]:
-                for check_alias in [alias_lower, alias_norm]:
-                    if (f' {check_alias} ' in f' {check_text} ' or
-                        check_text.startswith(check_alias + ' ') or
-                        check_text.endswith(' ' + check_alias) or
-                        check_text == check_alias):
-                        return alias_lower
+    def detect_cities(self, text: str) -> List[str]:
+        """
+        Metindeki tum sehir alias'larini gecis sirasiyla bul (tek gecis)
 
+        Turkce ekler desteklenir: "İzmir'de", "Ankara'nın", "ankarada"
+        """
+        tokens = TURKISH_TOKEN_REGEX.findall(normalize_turkish(text))
+        found: List[str] = []
+        i = 0
+        while i < len(tokens):
+            match = self._match_city_at(tokens, i)
+            if not match:
+                i += 1
+                continue
+            alias, span = match
+            if alias not in found:
+                found.append(alias)
+            i += span
+        return found
+
+    def _match_city_at(self, tokens: List[str], i: int) -> Optional[Tuple[str, int]]:
+        """i. tokenda baslayan en uzun alias -> (alias, token sayisi)"""
+        token = tokens[i]
+
+        # Birebir ilk kelime (cok kelimeli alias'larda son kelime ek alabilir)
+        for alias_tokens, alias in _CITY_INDEX.get(token, ()):
+            if len(alias_tokens) == 1:
+                return alias, 1
+            end = i + len(alias_tokens)
+            if end > len(tokens) or tuple(tokens[i + 1:end - 1]) != alias_tokens[1:-1]:
+                continue
+            if split_turkish_word(tokens[end - 1], {alias_tokens[-1]}, suffix_regex=_CITY_CASE_SUFFIX_REGEX):
+                return alias, len(alias_tokens)
+
+        # Tek kelime + Turkce ek
+        split = split_turkish_word(token, _CITY_INDEX, suffix_regex=_CITY_CASE_SUFFIX_REGEX)
+        if not split:
+            return None
+        stem, tail = split
+        if len(stem) < _CITY_MIN_SUFFIX_LEN and not tail.startswith("'"):
+            return None
+        for alias_tokens, alias in _CITY_INDEX[stem]:
+            if len(alias_tokens) == 1:
+                return alias, 1
         return None
 
+    def detect_city(self, text: str) -> Optional[str]:
+        """Metin icinden (ilk gecen) sehir adini bul"""
+        cities = self.detect_cities(text)
+        return cities[0] if cities else None
+
     def _weather_search_fallback(self, city: str) -> Optional[str]:
         """Web search ile hava durumu fallback"""
         try:
@@ -570,7 +793,7 @@ class WebSearchTool:
                 return None
 
             all_text = " ".join([r.get('snippet', '') for r in results])
-            normalized_text = self._strip_turkish(all_text)
+            normalized_text = normalize_turkish(all_text)
 
             temp_matches = re.findall(
                 r'(?:sicaklik[i]?\s*[:=]?\s*|hava\s+sicakligi\s*)(\-?\d+(?:[.,]\d+)?)\s*',
@@ -709,168 +932,109 @@ class WebSearchTool:
     def smart_search(self, query: str) -> Optional[str]:
         """
         Sorguyu analiz edip en uygun arama yontemini otomatik sec.
+
+        Niyetler derlenmis siniflandiricidan (search_intent) oncelik sirasiyla
+        gelir; ilk sonuc ureten niyet kazanir.
         """
-        query_lower = query.lower().strip()
-        query_norm = self._strip_turkish(query_lower)
-
-        # ---- SOHBET / SELAMLASMA — arama YAPMA ----
-        skip_patterns = [
-            'selam', 'merhaba', 'naber', 'nasilsin', 'nabersin',
-            'iyi gunler', 'iyi aksamlar', 'iyi geceler', 'gunaydin',
-            'hey', 'sa', 'as', 'slm', 'mrb', 'nbr',
-            'tesekkurler', 'sagol', 'eyv', 'tamam', 'ok', 'peki',
-            'gorusuruz', 'bye', 'hoscakal', 'hosca kal',
-            'sen nesin', 'adin ne', 'kimsin', 'ne yapabilirsin',
-            'iyiyim', 'fena degil', 'idare eder', 'iyi',
-        ]
-        # Kisa sorgu ve skip listesindeki kelimelerden olusuyorsa arama yapma
-        words = query_norm.split()
-        if len(words) <= 4 and all(
-            any(w == sp or w.rstrip('?.!,') == sp for sp in skip_patterns)
-            for w in words
-        ):
-            return None
+        with maybe_span(self.perf_tracker, 'search_intent'):
+            query_norm = normalize_turkish(query.strip())
 
-        # ---- HAVA DURUMU ----
-        hava_keywords = ['hava', 'sicaklik', 'derece', 'yagmur', 'kar',
-                         'ruzgar', 'nem', 'hava durumu', 'meteoroloji']
-        if any(kw in query_norm for kw in hava_keywords):
-            city = self.detect_city(query)
-            if not city:
-                city = 'ankara'
-            weather = self.get_weather(city)
-            if weather:
-                return f"{city.upper()} HAVA DURUMU (CANLI VERİ):\n{weather}"
-
-        # ---- DOVIZ ----
-        doviz_keywords = ['dolar', 'euro', 'sterlin', 'kur', 'doviz',
-                          'pound', 'yen', 'frank']
-        if any(kw in query_norm for kw in doviz_keywords):
-            result = self.get_exchange_rates(query)
-            if result:
-                return result
-
-        # ---- KRiPTO ----
-        kripto_keywords = ['bitcoin', 'btc', 'ethereum', 'eth', 'kripto',
-                           'coin', 'solana', 'dogecoin', 'doge', 'xrp',
-                           'bnb', 'cardano', 'avax']
-        if any(kw in query_norm for kw in kripto_keywords):
-            result = self.get_crypto_prices(query)
-            if result:
-                return result
-
-        # ---- ALTIN ----
-        altin_keywords = ['altin', 'gram altin', 'ceyrek', 'tam altin',
-                          'cumhuriyet altini', 'yarim altin', '22 ayar',
-                          '14 ayar']
-        if any(kw in query_norm for kw in altin_keywords):
-            result = self.get_gold_price()
-            if result:
-                return result
-
-        # ---- SPOR ----
-        spor_keywords = ['mac', 'skor', 'lig', 'sampiyonlar', 'galatasaray',
-                         'fenerbahce', 'besiktas', 'trabzonspor', 'super lig',
-                         'milli takim', 'formula', 'f1', 'nba', 'basketbol']
-        if any(kw in query_norm for kw in spor_keywords):
-            result = self.get_sports_results(query)
+            # ---- SOHBET / SELAMLASMA — arama YAPMA ----
+            if is_smalltalk(query_norm):
+                return None
+
+            matches = classify_intents(query_norm)
+
+        for match in matches:
+            handler = getattr(self, f"_intent_{match['intent']}")
+            with maybe_span(self.perf_tracker, f"search_fetch_{match['intent']}"):
+                result = handler(query)
             if result:
-                return result
-
-        # ---- HABER ----
-        haber_keywords = ['haber', 'son dakika', 'guncel', 'ne oldu',
-                          'olay', 'gelisme', 'aciklama', 'duyuru']
-        if any(kw in query_norm for kw in haber_keywords):
-            results = self.search_news(query, max_results=5)
-            if results:
-                text = "SON HABERLER:\n"
-                for r in results:
-                    source = f"[{r['source']}] " if r.get('source') else ""
-                    date = f" ({r['date']})" if r.get('date') else ""
-                    text += f"- {source}{r['title']}{date}: {r['snippet']}\n"
-                return text
-            else:
-                # Haber bulunamadiysa genel arama yap
-                results = self.search(f"{query} haberleri", max_results=5)
-                if results:
-                    text = "HABERLER (web'den):\n"
-                    for r in results:
-                        text += f"- {r['title']}: {r['snippet']}\n"
-                    return text
-
-        # ---- SAAT / TARiH ----
-        # Zaman niyetini diger alanlardan sonra calistirarak yanlis eslesmeyi azalt.
-        if self._is_time_query(query_norm):
-            return self._get_time_info()
-
-        # ---- GENEL BiLGi (genis kapsam) ----
-        # Kelime siniri kontrolu ile eslestir (substring degil)
-        query_words = set(query_norm.split())
-        bilgi_keywords = [
-            # Soru kelimeleri
-            'kimdir', 'nedir', 'ne demek', 'nasil', 'neden', 'nerede',
-            'ne zaman', 'kac', 'kaci', 'kacinci', 'hangi', 'kim',
-            'nereye', 'nereden',
-            # Arama emirleri
-            'ara', 'bul', 'internet', 'google', 'wiki', 'arastir',
-            'anlat', 'acikla', 'tanitim', 'bilgi', 'ozet',
-            # Guncel konular
-            'guncel', 'populer', 'trend',
-            # Eglence
-            'film', 'dizi', 'sarki', 'muzik', 'oyun',
-            # Yemek
-            'recete', 'tarif', 'kalori', 'besin',
-            # Afet
-            'deprem', 'sel', 'yangin', 'afet',
-            # Siyaset
-            'secim', 'oy', 'siyaset', 'parti',
-            # Egitim
-            'universite', 'sinav', 'yks', 'kpss', 'ales',
-            # Seyahat
-            'ucak', 'ucus', 'bilet', 'otel', 'tatil',
-            # Saglik
-            'hastane', 'ilac', 'doktor', 'hastalik',
-            # Alisveris
-            'fiyat', 'fiyati', 'kac para', 'ucuz', 'pahali',
-            'magaza', 'satis', 'indirim', 'kampanya',
-            # Teknoloji
-            'telefon', 'bilgisayar', 'laptop', 'tablet',
-            'uygulama', 'program', 'yazilim',
+                return self._compact_result(result, query, match['intent'])
+
+        return None
+
+    def _compact_result(self, result: str, query: str, intent: str) -> str:
+        """Sonucu niyet butcesine gore sikistir ve kazanilan token'i raporla"""
+        if not self.compact_enabled:
+            return result
+
+        budget = resolve_budget(intent, self.context_budget)
+        if intent == 'hava':
+            # Butce sehir basina: cok sehirli cevapta bloklar kesilmez
+            budget *= max(1, result.count(WEATHER_BLOCK_HEADER))
+        compacted, stats = compact_context(result, query, budget)
+        stats['intent'] = intent
+        self.last_context_stats = stats
+        if stats['tokens_saved']:
+            logger.info(
+                f"Arama baglami sikistirildi ({intent}): "
+                f"~{stats['tokens_before']} -> ~{stats['tokens_after']} token "
+                f"(-{stats['tokens_saved']}, {stats['duplicates_removed']} tekrar)"
+            )
+        return compacted
+
+    def _intent_hava(self, query: str) -> Optional[str]:
+        cities = self.detect_cities(query) or ['ankara']
+        if len(cities) == 1:
+            weathers = {cities[0]: self.get_weather(cities[0])}
+        else:
+            weathers = self.get_weather_multi(cities)
+        blocks = [
+            f"{city.upper()} {WEATHER_BLOCK_HEADER}\n{weather}"
+            for city, weather in weathers.items() if weather
         ]
-        # Tek kelimelik keyword'ler icin kelime siniri kontrolu
-        bilgi_single = {kw for kw in bilgi_keywords if ' ' not in kw}
-        bilgi_multi = [kw for kw in bilgi_keywords if ' ' in kw]
-        if (query_words & bilgi_single) or any(kw in query_norm for kw in bilgi_multi):
-            results = self.search(query, max_results=5)
-            if results:
-                text = "İNTERNET ARAŞTIRMA SONUÇLARI:\n"
-                for r in results:
-                    text += f"- {r['title']}: {r['snippet']}\n"
-                return text
+        return "\n\n".join(blocks) if blocks else None
 
-        # ---- SORU iSARETi VARSA YiNE DE ARA ----
-        if '?' in query or query_norm.rstrip().endswith(('mi', 'mu', 'mi?', 'mu?')):
-            results = self.search(query, max_results=3)
-            if results:
-                text = "İNTERNET ARAŞTIRMA SONUÇLARI:\n"
-                for r in results:
-                    text += f"- {r['title']}: {r['snippet']}\n"
-                return text
+    def _intent_doviz(self, query: str) -> Optional[str]:
+        return self.get_exchange_rates(query)
+
+    def _intent_kripto(self, query: str) -> Optional[str]:
+        return self.get_crypto_prices(query)
+
+    def _intent_altin(self, query: str) -> Optional[str]:
+        return self.get_gold_price()
+
+    def _intent_spor(self, query: str) -> Optional[str]:
+        return self.get_sports_results(query)
 
+    def _intent_haber(self, query: str) -> Optional[str]:
+        results = self.search_news(query, max_results=5)
+        if results:
+            text = "SON HABERLER:\n"
+            for r in results:
+                source = f"[{r['source']}] " if r.get('source') else ""
+                date = f" ({r['date']})" if r.get('date') else ""
+                text += f"- {source}{r['title']}{date}: {r['snippet']}\n"
+            return text
+
+        # Haber bulunamadiysa genel arama yap
+        results = self.search(f"{query} haberleri", max_results=5)
+        if results:
+            text = "HABERLER (web'den):\n"
+            for r in results:
+                text += f"- {r['title']}: {r['snippet']}\n"
+            return text
         return None
 
-    def _is_time_query(self, query_norm: str) -> bool:
-        """Sorgu saat/tarih bilgisi mi istiyor?"""
-        explicit_time_queries = [
-            'saat kac', 'saat kactir', 'su an saat', 'kac oldu', 'zaman kac',
-            'bugunun tarihi', 'bugun tarih', 'tarih nedir',
-            'bugun gunlerden ne', 'hangi gundayiz', 'hangi gun',
-        ]
-        if any(kw in query_norm for kw in explicit_time_queries):
-            return True
+    def _intent_zaman(self, query: str) -> Optional[str]:
+        return self._get_time_info()
+
+    def _intent_bilgi(self, query: str) -> Optional[str]:
+        return self._format_search_results(self.search(query, max_results=5))
 
-        normalized = query_norm.strip().rstrip('?.!')
-        return normalized in {'saat', 'tarih', 'zaman', 'bugunun tarihi'}
+    def _intent_soru(self, query: str) -> Optional[str]:
+        # Soru isareti / soru eki varsa yine de ara
+        return self._format_search_results(self.search(query, max_results=3))
+
+    def _format_search_results(self, results: List[Dict]) -> Optional[str]:
+        """Genel arama sonuclarini LLM baglamina cevir"""
+        if not results:
+            return None
+        text = "İNTERNET ARAŞTIRMA SONUÇLARI:\n"
+        for r in results:
+            text += f"- {r['title']}: {r['snippet']}\n"
+        return text
 
     def _get_time_info(self) -> str:
         """Guncel saat ve tarih bilgisi"""
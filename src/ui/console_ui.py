@@ -4,9 +4,15 @@ Rich library ile renkli ve interaktif konsol
 """
 
 import sys
+import threading
+import time
 from typing import Optional
+
+import numpy as np
 from loguru import logger
 
+from monitoring.performance import maybe_span
+
 try:
     from rich.console import Console
     from rich.markdown import Markdown
@@ -23,24 +29,37 @@ except ImportError:
 class ConsoleUI:
     """Renkli terminal arayüzü"""
     
-    def __init__(self, config: dict, llm_manager, stt_engine, tts_engine):
+    def __init__(self, config: dict, llm_manager, stt_engine, tts_engine, profiler=None):
         self.config = config
         self.llm_manager = llm_manager
         self.stt_engine = stt_engine
         self.tts_engine = tts_engine
+        self.perf_tracker = getattr(llm_manager, 'perf_tracker', None)
+        # /profile komutu (SamplingProfiler; None = kapalı)
+        self.profiler = profiler
         
         self.ui_config = config['ui']['console']
         self.colored = self.ui_config.get('colored_output', True)
         self.markdown = self.ui_config.get('markdown_rendering', True)
         
         # Web search tool (tek instance, cache korunsun)
-        from tools.web_search import WebSearchTool
-        self.search_tool = WebSearchTool(config)
+        self.search_tool = getattr(llm_manager, 'web_search', None)
+        if self.search_tool is None:
+            from tools.web_search import WebSearchTool
+            self.search_tool = WebSearchTool(config)
         
         if RICH_AVAILABLE:
             self.console = Console()
         else:
             self.console = None
+        
+        # Sesli modda asistan konusurken araya girilebilir
+        self.voice_config = config['ui'].get('voice', {})
+        self.barge_in_enabled = self.voice_config.get('barge_in', {}).get('enabled', True)
+        
+        # Sesli tur süreleri (perf_counter / ms)
+        self._speech_ended_at = time.perf_counter()
+        self._stt_ms = 0.0
     
     def print(self, text: str, style: str = ""):
         """
@@ -132,6 +151,7 @@ class ConsoleUI:
             "  /image <path> - Resim analizi\n"
             "  /search <query> - Web araması\n"
             "  /clear - Geçmişi temizle\n"
+            "  /profile [saniye] - CPU profilini aç/kapat\n"
             "  /exit - Çıkış\n",
             title="Hoş Geldiniz!",
             style="cyan"
@@ -189,6 +209,10 @@ class ConsoleUI:
             else:
                 self.print("❌ Kullanım: /search <sorgu>", style="red")
         
+        elif cmd == '/profile':
+            parts = command.split(maxsplit=1)
+            self._toggle_profile(parts[1] if len(parts) > 1 else None)
+        
         else:
             self.print(f"❌ Bilinmeyen komut: {cmd}", style="red")
     
@@ -206,46 +230,58 @@ class ConsoleUI:
         if thinking:
             thinking.start()
         
-        # LLM'den cevap al
-        response = self.llm_manager.generate(query, stream=False)
-        
-        if thinking:
-            thinking.stop()
-        
-        # Cevabı göster
-        self.print("\n🤖 Assistant:", style="bold cyan")
-        self.print_markdown(response)
-        
-        # Sesli okuma (opsiyonel)
-        if speak and self.tts_engine:
-            self.tts_engine.speak(response)
+        # Tur span'ı: cache_lookup -> llm_inference -> post_process -> tts_synthesis
+        with maybe_span(self.perf_tracker, 'text_turn'):
+            # LLM'den cevap al
+            response = self.llm_manager.generate(query, stream=False)
+            
+            if thinking:
+                thinking.stop()
+            
+            # Cevabı göster
+            self.print("\n🤖 Assistant:", style="bold cyan")
+            self.print_markdown(response)
+            
+            # Sesli okuma (opsiyonel)
+            if speak and self.tts_engine:
+                self.tts_engine.speak(response)
     
     def _voice_mode(self):
-        """Sesli mod - mikrofon ile konuşma"""
+        """Sesli mod - mikrofon ile konuşma (continuous_mode: eller serbest döngü)"""
+        
+        continuous = self.voice_config.get('continuous_mode', False)
+        auto_listen = self.voice_config.get('auto_listen', True)
         
-        self.print("\n🎤 Sesli Mod Aktif! (5 saniye konuşun, Ctrl+C ile çık)\n", style="yellow")
+        if continuous:
+            self.print("\n🎤 Sürekli Sesli Mod! (konuşun, susunca yanıtlarım; Ctrl+C ile çık)\n", style="yellow")
+            self._warm_up()
+        elif auto_listen:
+            self.print("\n🎤 Sesli Mod Aktif! (konuşun, susunca gönderilir; Ctrl+C ile çık)\n", style="yellow")
+        else:
+            self.print("\n🎤 Sesli Mod Aktif! (5 saniye konuşun, Ctrl+C ile çık)\n", style="yellow")
+        
+        exit_phrases = {p.lower() for p in self.voice_config.get('exit_phrases', [])}
         
         try:
-            # Mikrofon ile kaydet
-            audio = self.stt_engine.record_audio(duration=5)
-            
-            # Sessizlik kontrolü
-            if self.stt_engine.is_audio_silent(audio):
-                self.print("⚠️  Sessizlik algılandı, tekrar deneyin", style="yellow")
-                return
-            
-            # Transkribe et
-            self.print("✍️  Transkribe ediliyor...", style="cyan")
-            text = self.stt_engine.transcribe(audio_array=audio)
-            
-            if not text:
-                self.print("❌ Transkripsiyon başarısız", style="red")
-                return
-            
-            self.print(f"\n📝 Siz: {text}\n", style="green")
-            
-            # LLM'e sor ve sesli yanıt ver
-            self._process_query(text, speak=True)
+            audio = None
+            while True:
+                if audio is None:
+                    audio = self._listen(auto_listen)
+                
+                # Tur span'ı: stt -> reply (llm_inference -> web_search) dökümü
+                with maybe_span(self.perf_tracker, 'voice_turn'):
+                    text = self._transcribe_voice(audio, addressed_only=continuous)
+                    audio = None
+                    
+                    if text:
+                        if text.strip(" .!?").lower() in exit_phrases:
+                            self.print("\n👋 Sesli moddan çıkılıyor", style="yellow")
+                            return
+                        # Araya girilirse yeni cümle tuşa basmadan bir sonraki tur olur
+                        audio = self._voice_turn(text)
+                
+                if audio is None and not continuous:
+                    return
             
         except KeyboardInterrupt:
             self.print("\n⏸️  Sesli mod iptal edildi", style="yellow")
@@ -253,6 +289,166 @@ class ConsoleUI:
             logger.error(f"Sesli mod hatası: {e}")
             self.print(f"\n❌ Hata: {e}", style="red")
     
+    def _warm_up(self):
+        """Sürekli modda ilk tur beklemesin: STT ve LLM önceden yüklenir"""
+        try:
+            self.stt_engine.model_manager.load_model("stt")
+        except Exception as e:
+            logger.warning(f"STT ön yükleme hatası: {e}")
+        self.llm_manager.warm_up()
+    
+    def _vad(self):
+        """STTEngine'in webrtcvad nesnesi (yoksa sadece enerji kapısı)"""
+        return self.stt_engine.vad if getattr(self.stt_engine, 'vad_available', False) else None
+    
+    def _listen(self, auto_listen: bool) -> Optional[np.ndarray]:
+        """
+        Mikrofondan bir cümle al
+        
+        Args:
+            auto_listen: True ise konuşma bitince (VAD) durur, değilse sabit 5 sn
+        
+        Returns:
+            16 kHz mono ses veya None (zaman aşımı)
+        """
+        
+        if not auto_listen:
+            audio = self.stt_engine.record_audio(duration=5)
+            self._speech_ended_at = time.perf_counter()
+            return audio
+        
+        from audio.barge_in import BargeInListener
+        
+        self.print("👂 Dinliyorum...", style="dim")
+        listener = BargeInListener(self.config, on_barge_in=lambda: None, vad=self._vad())
+        audio = listener.capture(timeout=self.voice_config.get('listen_timeout_sec'))
+        self._speech_ended_at = listener.ended_at or time.perf_counter()
+        return audio
+    
+    def _transcribe_voice(self, audio: Optional[np.ndarray], addressed_only: bool = False) -> Optional[str]:
+        """
+        Sessizlik kontrolü + transkripsiyon (STT süresi tura yazılır)
+        
+        Args:
+            audio: 16 kHz mono ses
+            addressed_only: Sürekli dinleme: wake-word kapısından geçmeyen ses atlanır
+        
+        Returns:
+            Metin veya None
+        """
+        
+        if audio is None or audio.size == 0 or self.stt_engine.is_audio_silent(audio):
+            self.print("⚠️  Sessizlik algılandı, tekrar deneyin", style="yellow")
+            return None
+        
+        start = time.perf_counter()
+        with maybe_span(self.perf_tracker, 'stt'):
+            if addressed_only and self.stt_engine.wake_gate.enabled:
+                text = self.stt_engine.transcribe_addressed(audio)
+            else:
+                self.print("✍️  Transkribe ediliyor...", style="cyan")
+                text = self.stt_engine.transcribe(audio_array=audio)
+        self._stt_ms = (time.perf_counter() - start) * 1000
+        
+        if text is None:
+            self.print("💤 (asistana hitap edilmedi)", style="dim")
+            return None
+        
+        if not text:
+            self.print("❌ Transkripsiyon başarısız", style="red")
+            return None
+        
+        self.print(f"\n📝 Siz: {text}\n", style="green")
+        return text
+    
+    def _voice_turn(self, query: str) -> Optional[np.ndarray]:
+        """
+        Sesli tur: LLM cümle cümle akar, her cümle hazır olunca seslendirilir
+        (LLM üretimi, sentez ve oynatma üst üste biner). Bu sırada mikrofon
+        dinlenir (barge-in).
+        
+        Args:
+            query: Kullanıcı sorusu (transkripsiyon)
+        
+        Returns:
+            Araya giren yeni cümlenin sesi (16 kHz) veya None
+        """
+        
+        turn_start = time.perf_counter()
+        timings = {'stt': self._stt_ms}
+        
+        cancel = threading.Event()
+        
+        def sentences():
+            for sentence in self.llm_manager.generate_sentences(query, cancel_event=cancel):
+                if 'llm_first_sentence' not in timings:
+                    timings['llm_first_sentence'] = (time.perf_counter() - turn_start) * 1000
+                self.print(sentence)
+                yield sentence
+        
+        speaking = bool(self.tts_engine and self.tts_engine.model)
+        listener = None
+        if self.barge_in_enabled and speaking:
+            from audio.barge_in import BargeInListener
+            
+            def interrupt():
+                self.tts_engine.stop()
+                cancel.set()
+            
+            listener = BargeInListener(self.config, on_barge_in=interrupt, vad=self._vad())
+            listener.start()
+        
+        self.print("\n🤖 Assistant:", style="bold cyan")
+        try:
+            # reply: LLM + TTS üst üste (llm_inference sentez thread'inde alt span)
+            with maybe_span(self.perf_tracker, 'reply'):
+                if speaking:
+                    self.tts_engine.speak_stream(sentences())
+                else:
+                    for _ in sentences():
+                        pass
+        finally:
+            # Tetiklendiyse yeni cümle wait_utterance() ile alınana kadar kayıt sürer
+            if listener and not listener.triggered.is_set():
+                listener.stop()
+        
+        timings['total'] = (time.perf_counter() - turn_start) * 1000
+        # Cevaptan sonra kısa süre wake-word gerekmez
+        self.stt_engine.wake_gate.keep_awake()
+        first_audio = self.tts_engine.last_playback_start if speaking else None
+        if first_audio:
+            timings['tts_first_audio'] = (first_audio - turn_start) * 1000
+            timings['turnaround'] = (first_audio - self._speech_ended_at) * 1000
+        self._log_turn(timings)
+        
+        if listener is None or not listener.triggered.is_set():
+            return None
+        
+        self.print("\n⏸️  Araya girdiniz, dinliyorum...", style="yellow")
+        audio = listener.wait_utterance(timeout=listener.utterance_timeout)
+        self._speech_ended_at = listener.ended_at or time.perf_counter()
+        return audio
+    
+    def _log_turn(self, timings: dict):
+        """Tur süreleri (ms): konuşma sonu -> ilk ses = kullanıcının beklediği süre"""
+        labels = (
+            ('turnaround', 'konuşma sonu→ilk ses'),
+            ('stt', 'STT'),
+            ('llm_first_sentence', 'LLM ilk cümle'),
+            ('tts_first_audio', 'ilk ses'),
+            ('total', 'toplam'),
+        )
+        parts = [f"{label} {timings[key]:.0f} ms" for key, label in labels if key in timings]
+        # Yavaşlık kaynağı: prompt büyümesi / model yükleme / decode hızı
+        llm = getattr(self.llm_manager, 'last_metrics', {})
+        if 'ttft' in llm:
+            parts.append(f"TTFT {llm['ttft'] * 1000:.0f} ms")
+        if 'tokens_per_sec' in llm:
+            parts.append(f"{llm['tokens_per_sec']:.1f} token/s")
+        if 'prompt_tokens' in llm:
+            parts.append(f"prompt {llm['prompt_tokens']} token")
+        logger.info("Sesli tur: " + " | ".join(parts))
+    
     def _analyze_image(self, image_path: str):
         """Resim analizi"""
         
@@ -268,6 +464,36 @@ class ConsoleUI:
             logger.error(f"Görsel analiz hatası: {e}")
             self.print(f"\n❌ Hata: {e}", style="red")
     
+    def _toggle_profile(self, seconds: Optional[str] = None):
+        """
+        Örnekleyici profili aç/kapat
+        
+        Args:
+            seconds: Verilirse bu kadar saniye sonra kendiliğinden durur ve yazılır
+        """
+        
+        if self.profiler is None:
+            self.print("❌ Profil kapalı", style="red")
+            return
+        
+        if self.profiler.running:
+            path = self.profiler.stop_and_write()
+            if path:
+                self.print(f"📊 Profil yazıldı: {path}", style="green")
+            return
+        
+        try:
+            duration = float(seconds) if seconds else None
+        except ValueError:
+            self.print("❌ Kullanım: /profile [saniye]", style="red")
+            return
+        
+        self.profiler.start(duration)
+        if duration:
+            self.print(f"📊 Profil {duration:g} sn alınacak ({self.profiler.output_dir})", style="cyan")
+        else:
+            self.print("📊 Profil başladı, durdurmak için tekrar /profile", style="cyan")
+    
     def _web_search(self, query: str):
         """Web araması"""
         
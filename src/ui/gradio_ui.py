@@ -4,9 +4,14 @@ AI Sesli Asistan - Gradio UI
 Tek sayfa: Sohbet + Ses + Görsel — hepsi bir arada
 """
 
+from contextlib import nullcontext
+
 from loguru import logger
 import numpy as np
 
+from audio.audio_frontend import peak_level, split_gradio_audio
+from monitoring.performance import maybe_span
+
 try:
     import gradio as gr
     GRADIO_AVAILABLE = True
@@ -63,11 +68,13 @@ footer { display: none !important; }
 
 
 class GradioUI:
-    def __init__(self, config, llm_manager, stt_engine, tts_engine):
+    def __init__(self, config, llm_manager, stt_engine, tts_engine, vram_monitor=None):
         self.config = config
         self.llm = llm_manager
         self.stt = stt_engine
         self.tts = tts_engine
+        self.perf_tracker = getattr(llm_manager, 'perf_tracker', None)
+        self.vram_monitor = vram_monitor
         self.port = config['ui']['gui'].get('server_port', 7860)
         self.share = config['ui']['gui'].get('share', False)
         self.auth = self._resolve_auth(config['ui']['gui'].get('auth'))
@@ -124,12 +131,13 @@ class GradioUI:
 
             # — Ses çıkışı (otomatik oynatır) —
             # Not: Bazı tarayıcılarda gizli audio bileşeninde autoplay engellenebiliyor.
-            # Bu yüzden görünür tutuyoruz.
-            tts_out = gr.Audio(label="Sesli Yanıt", type="numpy", autoplay=True, visible=True)
+            # Bu yüzden görünür tutuyoruz. streaming=True: ilk cümle sentezlenince çalar.
+            tts_out = gr.Audio(label="Sesli Yanıt", streaming=True, autoplay=True, visible=True)
 
             # — Alt butonlar —
             with gr.Row():
                 tts_btn = gr.Button("\U0001f50a Son yanıtı seslendir", size="sm", elem_classes=["btn-sm", "btn-ghost"])
+                stop_btn = gr.Button("\u23f9\ufe0f Sesi durdur", size="sm", elem_classes=["btn-sm", "btn-ghost"])
                 clear_btn = gr.Button("\U0001f5d1\ufe0f Sohbeti temizle", size="sm", elem_classes=["btn-sm", "btn-clear"])
 
             # — Görsel Analiz (açılır) —
@@ -154,6 +162,8 @@ class GradioUI:
                     <tr><td>Sıcaklık / Top P</td><td>{c['llm']['temperature']} / {c['llm']['top_p']}</td></tr>
                     <tr><td>Maks Token</td><td>{c['llm']['max_tokens']}</td></tr>
                 </table>""")
+                gpu_info = gr.Markdown(self._gpu_status())
+                gpu_btn = gr.Button("\U0001f504 GPU durumunu yenile", size="sm", elem_classes=["btn-sm", "btn-ghost"])
 
             # ─────────────────────────────────────
             # OLAYLAR
@@ -161,27 +171,50 @@ class GradioUI:
 
             def chat_text(message, history):
                 if not message.strip():
-                    return history, "", "", None
-                resp = self.llm.generate(message, stream=False)
-                history = history or []
-                history.append({"role": "user", "content": message})
-                history.append({"role": "assistant", "content": resp})
-                audio = self._tts(resp)
-                return history, "", resp, audio
+                    yield history, "", "", None
+                    return
+                # Tur span'ı TTS'i de kapsar: yield'ler arasında açık kalır
+                turn = self._start_turn('chat_turn')
+                try:
+                    with self._activate(turn):
+                        resp = self.llm.generate(message, stream=False)
+                    history = history or []
+                    history.append({"role": "user", "content": message})
+                    history.append({"role": "assistant", "content": resp})
+                    yield history, "", resp, gr.update()
+                    for chunk in self._tts_stream(resp, turn):
+                        yield gr.update(), gr.update(), gr.update(), chunk
+                finally:
+                    if turn is not None:
+                        turn.end()
 
             def chat_voice(audio, history):
-                text = self._stt(audio)
-                if not text:
-                    return history, "", None
-                resp = self.llm.generate(text, stream=False)
-                history = history or []
-                history.append({"role": "user", "content": f"\U0001f3a4 {text}"})
-                history.append({"role": "assistant", "content": resp})
-                audio_out = self._tts(resp)
-                return history, resp, audio_out
+                turn = self._start_turn('voice_turn')
+                try:
+                    with self._activate(turn):
+                        with maybe_span(self.perf_tracker, 'stt'):
+                            text = self._stt(audio)
+                        if text:
+                            resp = self.llm.generate(text, stream=False)
+                    if not text:
+                        yield history, "", None
+                        return
+                    history = history or []
+                    history.append({"role": "user", "content": f"\U0001f3a4 {text}"})
+                    history.append({"role": "assistant", "content": resp})
+                    yield history, resp, gr.update()
+                    for chunk in self._tts_stream(resp, turn):
+                        yield gr.update(), gr.update(), chunk
+                finally:
+                    if turn is not None:
+                        turn.end()
 
             def speak_last(txt):
-                return self._tts(txt)
+                yield from self._tts_stream(txt)
+
+            def stop_audio():
+                if self.tts:
+                    self.tts.stop()
 
             def clear_chat():
                 self.llm.clear_history()
@@ -192,13 +225,17 @@ class GradioUI:
                     return "Lütfen bir resim yükle."
                 return self.llm.analyze_image(image, question)
 
-            # Bağlantılar
-            send_btn.click(chat_text, [msg, chatbot], [chatbot, msg, last_resp, tts_out])
-            msg.submit(chat_text, [msg, chatbot], [chatbot, msg, last_resp, tts_out])
-            mic_btn.click(chat_voice, [mic, chatbot], [chatbot, last_resp, tts_out])
-            tts_btn.click(speak_last, [last_resp], [tts_out])
-            clear_btn.click(clear_chat, outputs=[chatbot, msg, last_resp, tts_out])
+            # Bağlantılar (ses üreten olaylar "Sesi durdur" ile iptal edilir)
+            audio_events = [
+                send_btn.click(chat_text, [msg, chatbot], [chatbot, msg, last_resp, tts_out]),
+                msg.submit(chat_text, [msg, chatbot], [chatbot, msg, last_resp, tts_out]),
+                mic_btn.click(chat_voice, [mic, chatbot], [chatbot, last_resp, tts_out]),
+                tts_btn.click(speak_last, [last_resp], [tts_out]),
+            ]
+            stop_btn.click(stop_audio, cancels=audio_events)
+            clear_btn.click(clear_chat, outputs=[chatbot, msg, last_resp, tts_out], cancels=audio_events)
             img_btn.click(analyze_image, [img, img_q], [img_out])
+            gpu_btn.click(self._gpu_status, outputs=[gpu_info])
 
         self.interface = app
 
@@ -206,44 +243,52 @@ class GradioUI:
     # YARDIMCI FONKSİYONLAR
     # ─────────────────────────────────────────────
 
+    def _start_turn(self, name):
+        """Generator'a yayılan tur span'ı (tracker yoksa None; end() ile kapanır)"""
+        return self.perf_tracker.start_span(name) if self.perf_tracker else None
+
+    @staticmethod
+    def _activate(turn):
+        """Tur span'ını blok boyunca aktif yap (None ise etkisiz)"""
+        return turn.activate() if turn is not None else nullcontext()
+
+    def _gpu_status(self):
+        """Sistem paneli: ornekleyicinin son GPU ornegi (NVML cagrisi yok)"""
+        sampler = getattr(self.vram_monitor, 'sampler', None)
+        sample = sampler.latest() if sampler is not None else None
+        if not sample or sample['used_gb'] is None:
+            return "GPU izleme kapalı"
+        parts = [f"VRAM {sample['used_gb']:.2f} / {sample['total_gb']:.2f} GB"]
+        if sample['utilization_percent'] is not None:
+            parts.append(f"kullanım %{sample['utilization_percent']:.0f}")
+        if sample['temperature_celsius'] is not None:
+            parts.append(f"{sample['temperature_celsius']:.0f}°C")
+        return " · ".join(parts)
+
     def _stt(self, audio):
         """Ses -> Metin"""
         if audio is None:
             return None
         try:
-            sr, data = audio
-            if data.dtype != np.float32:
-                data = data.astype(np.float32) / 32767.0
-            if len(data.shape) > 1:
-                data = data.mean(axis=1)
-            if np.abs(data).max() < 0.01:
+            data = split_gradio_audio(audio)
+            if data is None or peak_level(data) < 0.01:
                 return None
-            if sr != 16000:
-                from scipy import signal
-                data = signal.resample(data, int(len(data) * 16000 / sr))
             text = self.stt.transcribe(audio_array=data, sample_rate=16000)
             return text.strip() if text and text.strip() else None
         except Exception as e:
             logger.error(f"STT hatası: {e}")
             return None
 
-    def _tts(self, text):
-        """Metin -> (sample_rate, float32_array) veya None"""
+    def _tts_stream(self, text, turn=None):
+        """Metin -> (sample_rate, float32_chunk) akışı (cümle cümle; sentez süreleri tur span'ına)"""
         if not text or not self.tts or not self.tts.model:
-            return None
+            return
         try:
-            chunks = []
-            for c in self.tts.model.synthesize(text):
-                chunks.append(c.audio_float_array)
-            if chunks:
-                arr = np.concatenate(chunks)
+            for chunk in self.tts.synthesize_stream(text, parent=turn):
                 # Gradio/browser tarafında en uyumlu format: float32 [-1, 1]
-                arr = np.asarray(arr, dtype=np.float32)
-                arr = np.clip(arr, -1.0, 1.0)
-                return (self.tts.sample_rate, arr)
+                yield (self.tts.sample_rate, np.clip(chunk, -1.0, 1.0))
         except Exception as e:
             logger.error(f"TTS hatası: {e}")
-        return None
 
     # ─────────────────────────────────────────────
     # BAŞLAT
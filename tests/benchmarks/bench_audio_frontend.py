@@ -0,0 +1,83 @@
+"""
+Benchmark - STT ses hazirligi (uzun kayit)
+Eski yol (astype/32767 + mean + FFT resample) vs ortak front-end (resample_poly)
+
+Kullanim:
+    python tests/benchmarks/bench_audio_frontend.py
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from scipy import signal
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.audio.audio_frontend import TARGET_SAMPLE_RATE, prepare_audio  # noqa: E402
+
+DURATION_SEC = 300  # 5 dakikalik kayit
+ROUNDS = 3
+
+
+def legacy_prepare(data, sr):
+    """Eski GradioUI._stt yolu (karsilastirma icin birebir kopya)"""
+    if data.dtype != np.float32:
+        data = data.astype(np.float32) / 32767.0
+    if len(data.shape) > 1:
+        data = data.mean(axis=1)
+    if np.abs(data).max() < 0.01:
+        return None
+    if sr != 16000:
+        data = signal.resample(data, int(len(data) * 16000 / sr))
+    return data
+
+
+def make_recording(sample_rate):
+    """int16 stereo konusma benzeri sinyal (Gradio mikrofon formati)"""
+    rng = np.random.default_rng(0)
+    n = sample_rate * DURATION_SEC
+    t = np.arange(n) / sample_rate
+    mono = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 0.5 * t))
+    mono += 0.02 * rng.standard_normal(n)
+    stereo = np.stack([mono, mono * 0.8], axis=1)
+    return (np.clip(stereo, -1, 1) * 32767).astype(np.int16)
+
+
+def measure(fn, data, sr):
+    """(en iyi sure ms, tepe ek bellek MB)"""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(data, sr)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(data, sr)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak / 1024 / 1024
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print(f"AUDIO FRONT-END BENCHMARK ({DURATION_SEC} sn stereo int16)")
+    print("=" * 60)
+
+    for sr in (44100, 48000):
+        data = make_recording(sr)
+        # Ilk cagri FIR katsayilarini cache'ler
+        prepare_audio(data[:sr], sr)
+
+        legacy_ms, legacy_mb = measure(legacy_prepare, data, sr)
+        new_ms, new_mb = measure(prepare_audio, data, sr)
+
+        print(f"\n{sr} Hz -> {TARGET_SAMPLE_RATE} Hz ({data.nbytes / 1024 / 1024:.1f} MB girdi):")
+        print(f"  Eski (FFT resample): {legacy_ms:8.1f} ms, ek bellek {legacy_mb:6.1f} MB")
+        print(f"  Front-end (poly):    {new_ms:8.1f} ms, ek bellek {new_mb:6.1f} MB")
+        print(f"  Hizlanma: {legacy_ms / new_ms:.2f}x")
+
+    print("\n" + "=" * 60)
@@ -0,0 +1,83 @@
+"""
+Benchmark - detect_city
+Eski alias taramasi (her cagrida sort + 4x4 kontrol) vs gazetteer indeksi
+
+Kullanim:
+    python tests/benchmarks/bench_city_detect.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.tools.utils import normalize_turkish  # noqa: E402
+from src.tools.web_search import SEHIR_ALIASES, WebSearchTool  # noqa: E402
+
+ROUNDS = 2000
+QUERIES = [
+    "bugün hava nasıl",
+    "İzmir'de hava durumu",
+    "Ankara'nın havası nasıl olacak",
+    "istanbul yarın yağmur yağacak mı",
+    "kahramanmaraş sıcaklık",
+    "Şanlıurfa'da kaç derece",
+    "eskişehir rüzgar",
+    "hava durumu zonguldak",
+    "yarın kar yağacak mı",
+    "antalya alanya hava",
+]
+
+
+def legacy_detect_city(text: str):
+    """Eski WebSearchTool.detect_city (karsilastirma icin birebir kopya)"""
+    text_lower = text.lower()
+    text_normalized = normalize_turkish(text_lower)
+
+    sorted_aliases = sorted(SEHIR_ALIASES.keys(), key=len, reverse=True)
+
+    for alias in sorted_aliases:
+        alias_lower = alias.lower()
+        alias_norm = normalize_turkish(alias_lower)
+
+        for check_text in [text_lower, text_normalized]:
+            for check_alias in [alias_lower, alias_norm]:
+                if (f' {check_alias} ' in f' {check_text} ' or
+                        check_text.startswith(check_alias + ' ') or
+                        check_text.endswith(' ' + check_alias) or
+                        check_text == check_alias):
+                    return alias_lower
+
+    return None
+
+
+def run(name, detect):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for query in QUERIES:
+            detect(query)
+    elapsed = time.perf_counter() - start
+    per_query_us = elapsed / (ROUNDS * len(QUERIES)) * 1e6
+
+    print(f"\n{name}:")
+    for query in QUERIES:
+        print(f"  {query!r:40} -> {detect(query)}")
+    print(f"  Sorgu basina: {per_query_us:.1f} us")
+    return per_query_us
+
+
+if __name__ == "__main__":
+    tool = WebSearchTool({'web_search': {'enabled': False}})
+
+    print("=" * 60)
+    print(f"DETECT_CITY BENCHMARK ({len(QUERIES)} sorgu x {ROUNDS} tur)")
+    print("=" * 60)
+
+    legacy_us = run("ESKI TARAMA", legacy_detect_city)
+    index_us = run("GAZETTEER INDEKSI", tool.detect_city)
+
+    print("\n" + "=" * 60)
+    print(f"Hizlanma: {legacy_us / index_us:.1f}x")
+    print("=" * 60)
@@ -0,0 +1,264 @@
+"""
+Benchmark - Uctan uca tur gecikmesi (GPU / model / ag YOK)
+Ollama, Faster-Whisper ve Piper yerine model_stubs taklitleri; olculen
+kendi orkestrasyon kodumuz: LLMManager (mesaj kurma, akis, son isleme,
+cache), STTEngine (front-end, cache), TTSEngine (cumle havuzu), ModelManager.
+
+Senaryolar:
+    text_turn         Metin sorusu -> cevap (stream=False, Gradio yolu)
+    voice_turn        Ses -> STT -> cumle akisi -> TTS (ilk ses + toplam)
+    image_turn        Gorsel analiz (LLM <-> VLM model degisimi dahil)
+    cached_turn       Cache'teki soru
+    concurrent_users  N kullanici ayni LLMManager'a es zamanli metin sorar
+
+Sonuc (p50/p95) JSON olarak logs/bench/e2e_<commit>.json'a yazilir
+(commit'ler arasi karsilastirma icin).
+
+Kullanim:
+    python tests/benchmarks/bench_e2e.py
+    python tests/benchmarks/bench_e2e.py --rounds 10 --users 8 --token-rate 30 --output e2e.json
+"""
+
+import argparse
+import contextvars
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_results import metadata, summarize, write_results  # noqa: E402
+from model_stubs import StubModelManager, StubOllama, StubPiperVoice, StubWhisperModel  # noqa: E402
+
+from core.cache_manager import CacheManager  # noqa: E402
+from core.llm_manager import LLMManager  # noqa: E402
+from monitoring.performance import PerformanceTracker  # noqa: E402
+import audio.stt_engine as stt_module  # noqa: E402
+from audio.stt_engine import STTEngine  # noqa: E402
+from audio.tts_engine import STREAM_QUEUE_SIZE, TTSEngine  # noqa: E402
+
+SCENARIOS = ("text_turn", "voice_turn", "image_turn", "cached_turn", "concurrent_users")
+
+
+def load_config() -> dict:
+    with open(PROJECT_ROOT / "config" / "settings.yaml", "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+    # Ag yok; cache'ler senaryo bazinda acilir
+    config['web_search']['enabled'] = False
+    config['cache']['enabled'] = False
+    config['tts'].setdefault('cache', {})['enabled'] = False
+    config['stt'].setdefault('wake_word', {})['enabled'] = False
+    return config
+
+
+class Bench:
+    def __init__(self, args):
+        self.args = args
+        self.config = load_config()
+        self.ollama = StubOllama(
+            token_rate=args.token_rate,
+            ttft=args.ttft,
+            load_delay=args.load_delay,
+            parallel=args.parallel,
+            reply_tokens=args.reply_tokens,
+        )
+        self.whisper = StubWhisperModel(rtf=args.stt_rtf)
+        self.model_manager = StubModelManager(self.config, self.ollama, self.whisper)
+
+    def llm(self, cache: bool = False):
+        tracker = PerformanceTracker()
+        cache_manager = None
+        if cache:
+            cache_config = dict(self.config, cache=dict(self.config['cache'], enabled=True))
+            cache_manager = CacheManager(cache_config)
+        manager = LLMManager(self.config, self.model_manager, cache_manager, tracker)
+        manager.warm_up()
+        return manager, tracker
+
+    # --- senaryolar -------------------------------------------------
+
+    def text_turn(self):
+        llm, tracker = self.llm()
+        samples = []
+        for i in range(self.args.rounds):
+            start = time.perf_counter()
+            llm.generate(f"Soru {i}: yarın hava nasıl olacak?", stream=False)
+            samples.append((time.perf_counter() - start) * 1000)
+        return summarize(samples), tracker
+
+    def voice_turn(self):
+        stt_module.WHISPER_AVAILABLE = True  # model taklitten gelir
+        stt = STTEngine(self.config, self.model_manager)
+        tts = TTSEngine(self.config)
+        tts.model = StubPiperVoice(rtf=self.args.tts_rtf)
+        tts.sample_rate = tts.model.sample_rate
+        llm, tracker = self.llm()
+
+        rng = np.random.default_rng(0)
+        t = np.arange(3 * 16000, dtype=np.float32) / 16000
+        first_audio, total = [], []
+        for _ in range(self.args.rounds):
+            # Her tur farkli kayit (transcript cache isabet etmesin)
+            audio = (0.2 * np.sin(2 * np.pi * 180 * t) + 0.01 * rng.standard_normal(t.size)).astype(np.float32)
+            start = time.perf_counter()
+            first = None
+            text = stt.transcribe(audio_array=audio)
+            # speak_stream ile ayni boru hatti: LLM akisi sentez is parcaciginda tuketilir,
+            # ses parcalari kuyruktan alinir (oynatma cihazi yerine)
+            chunks = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+            tts._cancel.clear()
+            producer = threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(tts._produce_chunks, llm.generate_sentences(text), chunks),
+                daemon=True, name="tts-synth"
+            )
+            producer.start()
+            while chunks.get() is not None:
+                if first is None:
+                    first = time.perf_counter()
+            producer.join()
+            end = time.perf_counter()
+            first_audio.append(((first or end) - start) * 1000)
+            total.append((end - start) * 1000)
+
+        result = summarize(total)
+        result['first_audio'] = summarize(first_audio)
+        return result, tracker
+
+    def image_turn(self):
+        llm, tracker = self.llm()
+        image_path = make_image(Path(self.workdir) / "bench.jpg")
+        samples = []
+        for _ in range(self.args.rounds):
+            start = time.perf_counter()
+            llm.analyze_image(str(image_path), "Bu resimde ne var?")
+            samples.append((time.perf_counter() - start) * 1000)
+        result = summarize(samples)
+        result['model_loads'] = self.ollama.loads
+        return result, tracker
+
+    def cached_turn(self):
+        llm, _ = self.llm(cache=True)
+        prompt = "Merhaba, bugün nasılsın?"
+        llm.generate(prompt, stream=False)
+        # Cache'i dolduran istegin TTFT'si bu senaryoya yazilmasin
+        tracker = PerformanceTracker()
+        llm.perf_tracker = tracker
+        samples = []
+        for _ in range(self.args.rounds):
+            start = time.perf_counter()
+            llm.generate(prompt, stream=False)
+            samples.append((time.perf_counter() - start) * 1000)
+        return summarize(samples), tracker
+
+    def concurrent_users(self):
+        # Gradio gibi: tum kullanicilar tek LLMManager ve tek Ollama sunucusu
+        llm, tracker = self.llm()
+        samples = []
+        lock = threading.Lock()
+
+        def user(index):
+            for i in range(self.args.rounds):
+                start = time.perf_counter()
+                llm.generate(f"Kullanıcı {index} soru {i}: dolar kaç lira?", stream=False)
+                with lock:
+                    samples.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=user, args=(i,)) for i in range(self.args.users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - start
+
+        result = summarize(samples)
+        result['users'] = self.args.users
+        result['turns_per_sec'] = round(len(samples) / wall, 3)
+        return result, tracker
+
+    def run(self, names):
+        results = {}
+        with tempfile.TemporaryDirectory() as workdir:
+            # CacheManager / TTS / STT cache'leri cwd'ye gore yazar
+            self.workdir = workdir
+            previous = os.getcwd()
+            os.chdir(workdir)
+            try:
+                for name in names:
+                    result, tracker = getattr(self, name)()
+                    ttft = tracker.get_statistics('llm_ttft')
+                    if ttft['count']:
+                        result['llm_ttft_p50_ms'] = round(ttft['p50'] * 1000, 1)
+                    results[name] = result
+                    print_result(name, result)
+            finally:
+                os.chdir(previous)
+        return results
+
+
+def make_image(path: Path) -> Path:
+    """Test gorseli (Pillow yoksa bos dosya: optimize adimi atlanir)"""
+    try:
+        from PIL import Image
+        pixels = np.random.default_rng(0).integers(0, 255, (768, 1024, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(path, quality=90)
+    except ImportError:
+        path.write_bytes(b"")
+    return path
+
+
+def print_result(name, result):
+    line = f"{name:<18} p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms"
+    if 'first_audio' in result:
+        line += f"  ilk ses p50 {result['first_audio']['p50_ms']:.1f} ms"
+    if 'turns_per_sec' in result:
+        line += f"  {result['turns_per_sec']} tur/sn"
+    print(line)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Uctan uca benchmark (model taklitleri)")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--rounds", type=int, default=5, help="Senaryo basina tur")
+    parser.add_argument("--users", type=int, default=4, help="concurrent_users kullanici sayisi")
+    parser.add_argument("--token-rate", type=float, default=50.0, help="Taklit decode hizi (token/sn)")
+    parser.add_argument("--ttft", type=float, default=0.25, help="Taklit ilk token suresi (sn)")
+    parser.add_argument("--load-delay", type=float, default=1.0, help="Taklit model yukleme suresi (sn)")
+    parser.add_argument("--parallel", type=int, default=1, help="OLLAMA_NUM_PARALLEL karsiligi")
+    parser.add_argument("--reply-tokens", type=int, default=40, help="Cevap uzunlugu (token)")
+    parser.add_argument("--stt-rtf", type=float, default=0.1, help="Taklit Whisper RTF")
+    parser.add_argument("--tts-rtf", type=float, default=0.05, help="Taklit Piper RTF")
+    parser.add_argument("--output", default=None, help="JSON yolu (varsayilan: logs/bench/e2e_<commit>.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    from loguru import logger
+    logger.remove()
+
+    print("=" * 60)
+    print(f"E2E BENCHMARK ({args.rounds} tur, {args.token_rate:g} token/sn, TTFT {args.ttft:g} sn)")
+    print("=" * 60)
+
+    scenarios = Bench(args).run(args.scenarios)
+    stub = {k: v for k, v in vars(args).items() if k not in ("scenarios", "output")}
+    path = write_results("e2e", {'meta': metadata(stub=stub), 'scenarios': scenarios}, args.output)
+
+    print("=" * 60)
+    print(f"Sonuc: {path}")
+
+
+if __name__ == "__main__":
+    main()
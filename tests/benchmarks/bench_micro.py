@@ -0,0 +1,271 @@
+"""
+Benchmark - Her turda calisan saf Python sicak yollar (timeit)
+Gercekci Turkce metinler ve cache boyutlariyla cagri basina sure (us).
+
+Olculenler:
+    post_process        LLMManager._post_process (CJK taramasi, siz->sen, yasakli kaliplar)
+    build_messages      LLMManager._build_messages (dolu gecmis + arama baglami)
+    intent_detection    smart_search niyet tespiti (is_smalltalk + detect_intents)
+    detect_city         WebSearchTool.detect_city
+    cache_set_<N>       CacheManager.set, N kayitli cache (boyut siniri kontrolu dahil)
+    gradio_stt_audio    GradioUI._stt ses donusumu (48 kHz stereo int16 -> 16 kHz)
+    logging_sync        Tur basina log cagrilari, klasik sink'ler (DEBUG text + JSON)
+    logging_async       Ayni cagrilar, logging.async (kuyruk + arka plan yazici)
+
+Sonuc logs/bench/micro_<commit>.json'a yazilir; --save-baseline ile referans
+olarak saklanir, sonraki calismalar referansla karsilastirilir.
+
+Kullanim:
+    python tests/benchmarks/bench_micro.py --save-baseline
+    python tests/benchmarks/bench_micro.py                  # referansla karsilastir
+    python tests/benchmarks/bench_micro.py --filter cache
+    python tests/benchmarks/bench_results.py eski.json yeni.json
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_results import (  # noqa: E402
+    RESULTS_DIR, compare, load_results, metadata, print_comparison, write_results,
+)
+from src.audio.audio_frontend import peak_level, split_gradio_audio  # noqa: E402
+from src.core.cache_manager import CacheManager  # noqa: E402
+from src.core.llm_manager import LLMManager  # noqa: E402
+from src.monitoring.logger import setup_logger  # noqa: E402
+from src.tools.search_intent import detect_intents, is_smalltalk  # noqa: E402
+from src.tools.utils import normalize_turkish  # noqa: E402
+from src.tools.web_search import WebSearchTool  # noqa: E402
+
+BASELINE_PATH = RESULTS_DIR / "micro_baseline.json"
+CORPUS_PATH = PROJECT_ROOT / "tests" / "data" / "search_intent_corpus.yaml"
+REPEAT = 5
+CACHE_SIZES = (100, 1000)
+
+# Modelin tipik cevaplari: temiz, "siz" hitapli, yasakli kalipli, dil kaymali
+RESPONSES = [
+    "Bugün İstanbul'da hava parçalı bulutlu ve on sekiz derece. Akşam hafif yağmur bekleniyor, "
+    "yanına şemsiye almayı unutma.",
+    "Size yardımcı olmaktan mutluluk duyarım! Sizin için dolar kurunu kontrol ettim: "
+    "bugün otuz iki lira civarında. Başka bir sorunuz var mı?",
+    "Bir yapay zeka olarak kişisel görüşlerim yok ama Python öğrenmek için resmi dokümantasyon "
+    "ve küçük projeler harika bir başlangıç.",
+    "Galatasaray dün akşam Fenerbahçe'yi iki bir yendi. Maçın yıldızı ikinci golü atan forvetti.\n"
+    "这是一个测试 ve gerisi",
+    "Tabii ki! İşte tarif:\n1. Soğanı doğra.\n2. Zeytinyağında kavur.\n3. Domatesi ekle ve "
+    "on dakika pişir.\nAfiyet olsun!",
+    "Merhaba! Ben iyiyim, teşekkür ederim. Sen nasılsın, bugün neler yapıyorsun?",
+]
+SEARCH_CONTEXT = (
+    "İstanbul hava durumu: Parçalı bulutlu, 18°C, nem %65, rüzgar kuzeydoğu 12 km/s. "
+    "Yarın: yağmurlu, en yüksek 16°C, en düşük 11°C. " * 8
+)
+CITY_QUERIES = [
+    "bugün hava nasıl",
+    "İzmir'de hava durumu",
+    "Ankara'nın havası nasıl olacak",
+    "istanbul yarın yağmur yağacak mı",
+    "kahramanmaraş sıcaklık",
+    "Şanlıurfa'da kaç derece",
+    "hava durumu zonguldak",
+    "yarın kar yağacak mı",
+]
+
+
+class _ModelManager:
+    """Model yuklemeyen yer tutucu (olculen yollar modele gitmez)"""
+
+    def load_model(self, name):
+        raise RuntimeError("micro benchmark model yuklemez")
+
+
+def _llm_manager() -> LLMManager:
+    config = {
+        "llm": {"model": "qwen2.5:7b"},
+        "vlm": {"model": "moondream"},
+        "memory": {"max_history": 15},
+        "web_search": {"enabled": False},
+    }
+    manager = LLMManager(config, _ModelManager())
+    for i in range(manager.max_history):
+        manager._update_history(f"Soru {i}: yarın hava nasıl olacak?", RESPONSES[i % len(RESPONSES)])
+    return manager
+
+
+def bench_post_process():
+    manager = _llm_manager()
+
+    def run():
+        for text in RESPONSES:
+            manager._post_process(text)
+    return run, len(RESPONSES)
+
+
+def bench_build_messages():
+    manager = _llm_manager()
+    return (lambda: manager._build_messages("Peki yarın İzmir'de hava nasıl?", None, SEARCH_CONTEXT)), 1
+
+
+def bench_intent_detection():
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        queries = [item['query'] for item in yaml.safe_load(f)['queries']]
+
+    def run():
+        for query in queries:
+            if not is_smalltalk(normalize_turkish(query.strip())):
+                detect_intents(query)
+    return run, len(queries)
+
+
+def bench_detect_city():
+    tool = WebSearchTool({'web_search': {'enabled': False}})
+
+    def run():
+        for query in CITY_QUERIES:
+            tool.detect_city(query)
+    return run, len(CITY_QUERIES)
+
+
+def make_cache_set(size: int):
+    def bench():
+        cache = CacheManager({'cache': {'enabled': True, 'ttl_seconds': 3600, 'max_size_mb': 500}})
+        for i in range(size):
+            cache.set(f"eski soru {i}", RESPONSES[i % len(RESPONSES)])
+        counter = iter(range(10 ** 9))
+
+        def run():
+            key = f"yeni soru {next(counter)}"
+            cache.set(key, RESPONSES[0])
+            # Boyut sabit kalsin: eklenen kaydi geri al
+            cache.cache_data.pop(cache._generate_key(key), None)
+        return run, 1
+    bench.__name__ = f"bench_cache_set_{size}"
+    return bench
+
+
+def bench_gradio_stt_audio():
+    rng = np.random.default_rng(0)
+    stereo = (rng.standard_normal((5 * 48000, 2)) * 3000).astype(np.int16)
+
+    def run():
+        data = split_gradio_audio((48000, stereo))
+        peak_level(data)
+    return run, 1
+
+
+def _log_turn(logger):
+    """Bir metin turunun tipik log cagrilari (cache, arama, span'lar, cevap)"""
+    prompt = "Yarın İstanbul'da hava nasıl olacak, şemsiye alayım mı?"
+    logger.debug("Cache expired: {}", "5f2b9c")
+    logger.info("Cache hit: {}", "weather_istanbul")
+    logger.info("Qwen2.5'e soruluyor: {}...", prompt[:50])
+    for name, duration in (("web_search", 0.41), ("llm_inference", 1.27), ("post_process", 0.0004)):
+        logger.debug("✅ {} tamamlandı ({:.2f}s)", name, duration)
+    logger.info("Cevap alindi ({} karakter)", len(RESPONSES[0]))
+
+
+LOG_CALLS = 7
+
+
+def make_logging(async_mode: bool):
+    def bench():
+        from loguru import logger
+        # Konsol sink'i sessiz (ERROR); dosya sink'leri DEBUG
+        config = {'logging': {'level': 'ERROR', 'save_path': 'logs/', 'format': 'json',
+                              'async': {'enabled': async_mode, 'queue_size': 1_000_000}}}
+        setup_logger(config)
+        return (lambda: _log_turn(logger)), LOG_CALLS
+    bench.__name__ = f"bench_logging_{'async' if async_mode else 'sync'}"
+    return bench
+
+
+BENCHMARKS = {
+    'post_process': bench_post_process,
+    'build_messages': bench_build_messages,
+    'intent_detection': bench_intent_detection,
+    'detect_city': bench_detect_city,
+    **{f'cache_set_{size}': make_cache_set(size) for size in CACHE_SIZES},
+    'gradio_stt_audio': bench_gradio_stt_audio,
+    'logging_sync': make_logging(False),
+    'logging_async': make_logging(True),
+}
+
+
+def measure(name: str) -> dict:
+    """En iyi tekrar: cagri basina us (items = bir calistirmadaki girdi sayisi)"""
+    run, items = BENCHMARKS[name]()
+    timer = timeit.Timer(run)
+    loops, _ = timer.autorange()
+    per_call = [t / loops / items * 1e6 for t in timer.repeat(REPEAT, loops)]
+    return {
+        'us_per_call': round(min(per_call), 3),
+        'median_us': round(statistics.median(per_call), 3),
+        'loops': loops,
+        'items': items,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Saf Python sicak yol benchmark'lari")
+    parser.add_argument("--filter", default=None, help="Sadece adinda bu metin gecenler")
+    parser.add_argument("--save-baseline", action="store_true", help="Sonucu referans olarak sakla")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Karsilastirma referansi")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regresyon esigi (yuzde)")
+    parser.add_argument("--output", default=None, help="JSON yolu (varsayilan: logs/bench/micro_<commit>.json)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    from loguru import logger
+    logger.remove()
+
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    print("=" * 60)
+    print(f"MICRO BENCHMARK ({len(names)} olcum, en iyi {REPEAT} tekrar)")
+    print("=" * 60)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        # CacheManager cwd/cache altina yazar
+        previous = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for name in names:
+                results[name] = measure(name)
+                # logging_* sink'leri kurar; yazicilar durur, sonraki olcum etkilenmez
+                logger.remove()
+                print(f"{name:<20} {results[name]['us_per_call']:>12.2f} us/cagri")
+        finally:
+            os.chdir(previous)
+
+    data = {'meta': metadata(), 'benchmarks': results}
+    path = write_results("micro", data, args.output)
+    print("=" * 60)
+    print(f"Sonuc: {path}")
+
+    if args.save_baseline:
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, BASELINE_PATH)
+        print(f"Referans kaydedildi: {BASELINE_PATH}")
+    elif Path(args.baseline).exists():
+        baseline = load_results(args.baseline)
+        rows = compare(baseline, data, args.threshold)
+        print_comparison(rows, baseline['meta'], data['meta'])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Bench Results - Benchmark sonuclarini ozetle, JSON'a yaz, karsilastir
+Commit'ler arasi karsilastirma icin her sonuc dosyasi commit/ortam bilgisi tasir.
+
+Karsilastirma (e2e veya micro sonuc dosyalari):
+    python tests/benchmarks/bench_results.py eski.json yeni.json --threshold 10
+Esigi asan yavaslama varsa cikis kodu 1 (CI'da regresyon kapisi).
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+RESULTS_DIR = PROJECT_ROOT / "logs" / "bench"
+# Karsilastirilan metrikler (dusuk = iyi)
+COMPARE_KEYS = ('us_per_call', 'p50_ms', 'p95_ms')
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples_ms: List[float]) -> Dict:
+    """Gecikme listesi (ms) -> {'runs', 'p50_ms', 'p95_ms', 'mean_ms', 'max_ms'}"""
+    if not samples_ms:
+        return {'runs': 0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'mean_ms': 0.0, 'max_ms': 0.0}
+    return {
+        'runs': len(samples_ms),
+        'p50_ms': round(percentile(samples_ms, 50), 2),
+        'p95_ms': round(percentile(samples_ms, 95), 2),
+        'mean_ms': round(statistics.mean(samples_ms), 2),
+        'max_ms': round(max(samples_ms), 2),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def metadata(**extra) -> Dict:
+    return {
+        'commit': git_commit(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        **extra,
+    }
+
+
+def write_results(name: str, results: Dict, output: str = None) -> Path:
+    """
+    Sonuclari yaz
+
+    Args:
+        name: Suite adi (dosya adi on eki)
+        results: {'meta': ..., ...}
+        output: Dosya yolu (None = logs/bench/<name>_<commit>.json)
+    """
+    path = Path(output) if output else RESULTS_DIR / f"{name}_{results['meta']['commit']}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_results(path) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _metrics(node: Dict, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """Ic ice sonuclardan karsilastirilacak metrikleri duzlestir"""
+    for key, value in node.items():
+        if key == 'meta':
+            continue
+        if isinstance(value, dict):
+            yield from _metrics(value, f"{prefix}{key}.")
+        elif key in COMPARE_KEYS and isinstance(value, (int, float)):
+            yield f"{prefix}{key}", float(value)
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 10.0) -> List[Dict]:
+    """
+    Iki sonuc dosyasini karsilastir
+
+    Args:
+        baseline: Referans sonuc
+        current: Yeni sonuc
+        threshold: Regresyon esigi (yuzde)
+
+    Returns:
+        [{'metric', 'baseline', 'current', 'change_pct', 'status'}]
+    """
+    old = dict(_metrics(baseline))
+    rows = []
+    for metric, value in _metrics(current):
+        if metric not in old:
+            continue
+        change = (value - old[metric]) / old[metric] * 100 if old[metric] else 0.0
+        status = "YAVAS" if change > threshold else "HIZLI" if change < -threshold else "ayni"
+        rows.append({'metric': metric, 'baseline': old[metric], 'current': value,
+                     'change_pct': round(change, 1), 'status': status})
+    return rows
+
+
+def print_comparison(rows: List[Dict], baseline_meta: Dict, current_meta: Dict):
+    print("=" * 60)
+    print(f"KARSILASTIRMA {baseline_meta.get('commit', '?')} -> {current_meta.get('commit', '?')}")
+    print("=" * 60)
+    for row in rows:
+        print(f"{row['metric']:<40} {row['baseline']:>10.2f} -> {row['current']:>10.2f} "
+              f"{row['change_pct']:+7.1f}%  {row['status']}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sonuclarini karsilastir")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regresyon esigi (yuzde)")
+    args = parser.parse_args()
+
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    rows = compare(baseline, current, args.threshold)
+    print_comparison(rows, baseline.get('meta', {}), current.get('meta', {}))
+    regressions = [row for row in rows if row['status'] == "YAVAS"]
+    if regressions:
+        print(f"{len(regressions)} regresyon (> %{args.threshold:g})")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark - smart_search niyet tespiti
+Eski keyword kaskadi vs derlenmis siniflandirici (hiz + yanlis pozitif)
+
+Kullanim:
+    python tests/benchmarks/bench_search_intent.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.tools.search_intent import detect_intents  # noqa: E402
+from src.tools.utils import normalize_turkish  # noqa: E402
+
+CORPUS_PATH = PROJECT_ROOT / "tests" / "data" / "search_intent_corpus.yaml"
+ROUNDS = 2000
+
+
+def legacy_detect(query: str):
+    """Eski smart_search kaskadinin niyet kismi (karsilastirma icin birebir kopya)"""
+    query_norm = normalize_turkish(query.strip())
+
+    skip_patterns = [
+        'selam', 'merhaba', 'naber', 'nasilsin', 'nabersin',
+        'iyi gunler', 'iyi aksamlar', 'iyi geceler', 'gunaydin',
+        'hey', 'sa', 'as', 'slm', 'mrb', 'nbr',
+        'tesekkurler', 'sagol', 'eyv', 'tamam', 'ok', 'peki',
+        'gorusuruz', 'bye', 'hoscakal', 'hosca kal',
+        'sen nesin', 'adin ne', 'kimsin', 'ne yapabilirsin',
+        'iyiyim', 'fena degil', 'idare eder', 'iyi',
+    ]
+    words = query_norm.split()
+    if len(words) <= 4 and all(
+        any(w == sp or w.rstrip('?.!,') == sp for sp in skip_patterns)
+        for w in words
+    ):
+        return None
+
+    cascade = [
+        ('hava', ['hava', 'sicaklik', 'derece', 'yagmur', 'kar',
+                  'ruzgar', 'nem', 'hava durumu', 'meteoroloji']),
+        ('doviz', ['dolar', 'euro', 'sterlin', 'kur', 'doviz',
+                   'pound', 'yen', 'frank']),
+        ('kripto', ['bitcoin', 'btc', 'ethereum', 'eth', 'kripto',
+                    'coin', 'solana', 'dogecoin', 'doge', 'xrp',
+                    'bnb', 'cardano', 'avax']),
+        ('altin', ['altin', 'gram altin', 'ceyrek', 'tam altin',
+                   'cumhuriyet altini', 'yarim altin', '22 ayar', '14 ayar']),
+        ('spor', ['mac', 'skor', 'lig', 'sampiyonlar', 'galatasaray',
+                  'fenerbahce', 'besiktas', 'trabzonspor', 'super lig',
+                  'milli takim', 'formula', 'f1', 'nba', 'basketbol']),
+        ('haber', ['haber', 'son dakika', 'guncel', 'ne oldu',
+                   'olay', 'gelisme', 'aciklama', 'duyuru']),
+    ]
+    for intent, keywords in cascade:
+        if any(kw in query_norm for kw in keywords):
+            return intent
+
+    explicit_time_queries = [
+        'saat kac', 'saat kactir', 'su an saat', 'kac oldu', 'zaman kac',
+        'bugunun tarihi', 'bugun tarih', 'tarih nedir',
+        'bugun gunlerden ne', 'hangi gundayiz', 'hangi gun',
+    ]
+    if any(kw in query_norm for kw in explicit_time_queries):
+        return 'zaman'
+    if query_norm.strip().rstrip('?.!') in {'saat', 'tarih', 'zaman', 'bugunun tarihi'}:
+        return 'zaman'
+
+    bilgi_keywords = [
+        'kimdir', 'nedir', 'ne demek', 'nasil', 'neden', 'nerede',
+        'ne zaman', 'kac', 'kaci', 'kacinci', 'hangi', 'kim',
+        'nereye', 'nereden', 'ara', 'bul', 'internet', 'google', 'wiki',
+        'arastir', 'anlat', 'acikla', 'tanitim', 'bilgi', 'ozet',
+        'guncel', 'populer', 'trend', 'film', 'dizi', 'sarki', 'muzik',
+        'oyun', 'recete', 'tarif', 'kalori', 'besin', 'deprem', 'sel',
+        'yangin', 'afet', 'secim', 'oy', 'siyaset', 'parti', 'universite',
+        'sinav', 'yks', 'kpss', 'ales', 'ucak', 'ucus', 'bilet', 'otel',
+        'tatil', 'hastane', 'ilac', 'doktor', 'hastalik', 'fiyat', 'fiyati',
+        'kac para', 'ucuz', 'pahali', 'magaza', 'satis', 'indirim',
+        'kampanya', 'telefon', 'bilgisayar', 'laptop', 'tablet',
+        'uygulama', 'program', 'yazilim',
+    ]
+    query_words = set(query_norm.split())
+    bilgi_single = {kw for kw in bilgi_keywords if ' ' not in kw}
+    bilgi_multi = [kw for kw in bilgi_keywords if ' ' in kw]
+    if (query_words & bilgi_single) or any(kw in query_norm for kw in bilgi_multi):
+        return 'bilgi'
+
+    if '?' in query or query_norm.rstrip().endswith(('mi', 'mu', 'mi?', 'mu?')):
+        return 'soru'
+    return None
+
+
+def compiled_detect(query: str):
+    intents = detect_intents(query)
+    return intents[0]['intent'] if intents else None
+
+
+def evaluate(name, detect, corpus):
+    """Dogruluk + yanlis pozitif (gereksiz arama) sayisi"""
+    correct = 0
+    false_searches = []
+    for item in corpus:
+        got = detect(item['query'])
+        if got == item['intent']:
+            correct += 1
+        elif got is not None and item['intent'] is None:
+            false_searches.append(f"{item['query']!r} -> {got}")
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for item in corpus:
+            detect(item['query'])
+    elapsed = time.perf_counter() - start
+    per_query_us = elapsed / (ROUNDS * len(corpus)) * 1e6
+
+    print(f"\n{name}:")
+    print(f"  Dogruluk: {correct}/{len(corpus)}")
+    print(f"  Yanlis pozitif arama: {len(false_searches)}")
+    for line in false_searches:
+        print(f"    - {line}")
+    print(f"  Sorgu basina: {per_query_us:.1f} us")
+    return per_query_us
+
+
+if __name__ == "__main__":
+    with open(CORPUS_PATH, 'r', encoding='utf-8') as f:
+        corpus = yaml.safe_load(f)['queries']
+
+    print("=" * 60)
+    print(f"SEARCH INTENT BENCHMARK ({len(corpus)} sorgu x {ROUNDS} tur)")
+    print("=" * 60)
+
+    legacy_us = evaluate("ESKI KASKAD", legacy_detect, corpus)
+    compiled_us = evaluate("DERLENMIS SINIFLANDIRICI", compiled_detect, corpus)
+
+    print("\n" + "=" * 60)
+    print(f"Hizlanma: {legacy_us / compiled_us:.2f}x")
+    print("=" * 60)
@@ -0,0 +1,94 @@
+"""
+Benchmark - smart_search uctan uca gecikme (ag YOK)
+Yerel stub sunucu + DDGS tekrar ile soguk / sicak cache / bozuk upstream senaryolari
+
+Kullanim:
+    python tests/benchmarks/bench_smart_search.py
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from search_replay import (  # noqa: E402
+    RECORD_QUERIES, FaultProfile, StubUpstreamServer, install_replay, load_fixtures,
+)
+from src.tools.web_search import WebSearchTool  # noqa: E402
+
+ROUNDS = 20
+
+SCENARIOS = [
+    # (ad, cache sicak mi, upstream profili)
+    ("SOGUK CACHE", False, dict(latency_ms=30, jitter_ms=20)),
+    ("SICAK CACHE", True, dict(latency_ms=30, jitter_ms=20)),
+    ("BOZUK UPSTREAM", False, dict(latency_ms=150, jitter_ms=150, failure_rate=0.3)),
+]
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def make_tool(stub):
+    return WebSearchTool({'web_search': {
+        'enabled': True,
+        'timeout': 5,
+        'endpoints': stub.endpoints,
+    }})
+
+
+def run_scenario(fixtures, warm, profile_kwargs):
+    """Senaryo basina sorgu gecikmeleri (ms)"""
+    profile = FaultProfile(**profile_kwargs)
+    install_replay(fixtures, profile)
+    latencies = []
+    misses = 0
+
+    with StubUpstreamServer(fixtures, profile) as stub:
+        tool = make_tool(stub)
+        if warm:
+            for query in RECORD_QUERIES:
+                tool.smart_search(query)
+
+        for _ in range(ROUNDS):
+            if not warm:
+                tool = make_tool(stub)
+            for query in RECORD_QUERIES:
+                start = time.perf_counter()
+                result = tool.smart_search(query)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if not result:
+                    misses += 1
+
+        requests_made = stub.request_count
+
+    return latencies, misses, requests_made
+
+
+if __name__ == "__main__":
+    from loguru import logger
+    logger.remove()
+
+    fixtures = load_fixtures()
+
+    print("=" * 60)
+    print(f"SMART SEARCH BENCHMARK ({len(RECORD_QUERIES)} sorgu x {ROUNDS} tur, offline)")
+    print("=" * 60)
+
+    for name, warm, profile_kwargs in SCENARIOS:
+        latencies, misses, requests_made = run_scenario(fixtures, warm, profile_kwargs)
+        print(f"\n{name}: {profile_kwargs}")
+        print(f"  p50: {percentile(latencies, 50):.1f} ms")
+        print(f"  p95: {percentile(latencies, 95):.1f} ms")
+        print(f"  ort: {statistics.mean(latencies):.1f} ms")
+        print(f"  Bos sonuc: {misses}/{len(latencies)}")
+        print(f"  Upstream HTTP istegi: {requests_made}")
+
+    print("\n" + "=" * 60)
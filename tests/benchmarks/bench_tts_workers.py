@@ -0,0 +1,122 @@
+"""
+Benchmark - TTS worker havuzu
+Real-time factor (sentez suresi / ses suresi) ve ilk chunk gecikmesi,
+worker sayisina gore (num_threads sabit, worker'lar arasinda bolunur)
+
+Piper modeli (config/settings.yaml -> tts.model_path) varsa gercek model
+olculur; yoksa CPU yuku ureten sentetik ses modeli kullanilir.
+
+Kullanim:
+    python tests/benchmarks/bench_tts_workers.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.audio.tts_engine import TTSEngine  # noqa: E402
+
+WORKER_COUNTS = (1, 2, 3, 6)
+NUM_THREADS = 6  # Ryzen 5 3600X: 6 fiziksel cekirdek
+ROUNDS = 3
+# Sentetik model: ~0.05 RTF (Piper medium'un tek cekirdekteki mertebesi)
+SYNTHETIC_PASSES = 2000
+
+TEXT = (
+    "Bugün İstanbul'da hava parçalı bulutlu ve on sekiz derece. "
+    "Akşam saatlerinde hafif yağmur bekleniyor, yanına şemsiye almayı unutma. "
+    "Yarın sıcaklık biraz düşecek ve rüzgar kuzeyden esecek. "
+    "Hafta sonu ise güneşli ve ılık bir hava var. "
+    "Dolar bugün otuz iki lira civarında işlem görüyor. "
+    "Başka bir konuda yardımcı olabileceğim bir şey var mı?"
+)
+
+
+class SyntheticVoice:
+    """Piper cumle API'si taklidi: fonem basina sabit CPU isi (GIL'siz numpy)"""
+
+    sample_rate = 22050
+
+    def phonemize(self, text):
+        return [list(sentence) for sentence in text.split(". ") if sentence]
+
+    def phonemes_to_ids(self, phonemes):
+        return list(range(len(phonemes)))
+
+    def phoneme_ids_to_audio(self, phoneme_ids):
+        n = len(phoneme_ids) * 1100  # ~50 ms ses / fonem
+        t = np.linspace(0, 1, n, dtype=np.float32)
+        audio = np.zeros(n, dtype=np.float32)
+        for k in range(SYNTHETIC_PASSES):
+            audio += np.sin(t * (200 + k))
+        return audio
+
+    def synthesize(self, text):
+        """Sirali yol (1 worker): PiperVoice.synthesize gibi cumle basina chunk"""
+        for phonemes in self.phonemize(text):
+            audio = self.phoneme_ids_to_audio(self.phonemes_to_ids(phonemes))
+            yield SimpleNamespace(audio_float_array=audio / np.max(np.abs(audio)))
+
+
+def make_engine(workers: int) -> TTSEngine:
+    os.chdir(PROJECT_ROOT)
+    engine = TTSEngine({"tts": {
+        "model_path": "models/piper/tr_TR-fettah-medium.onnx",
+        "num_workers": workers,
+        "num_threads": NUM_THREADS,
+        "cache": {"enabled": False},
+    }})
+    if engine.model is None:
+        engine.model = SyntheticVoice()
+        engine.sample_rate = SyntheticVoice.sample_rate
+    return engine
+
+
+def measure(engine: TTSEngine):
+    """(rtf, ilk_chunk_sn) - en iyi tur"""
+    best_rtf, best_first = float("inf"), float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        first = None
+        samples = 0
+        for chunk in engine.synthesize_stream(TEXT):
+            if first is None:
+                first = time.perf_counter() - start
+            samples += chunk.size
+        elapsed = time.perf_counter() - start
+        best_rtf = min(best_rtf, elapsed / (samples / engine.sample_rate))
+        best_first = min(best_first, first)
+    return best_rtf, best_first
+
+
+def main():
+    print("=" * 60)
+    print(f"TTS worker havuzu ({NUM_THREADS} thread, {ROUNDS} tur, en iyi)")
+    print("=" * 60)
+
+    baseline = None
+    for workers in WORKER_COUNTS:
+        engine = make_engine(workers)
+        if workers == WORKER_COUNTS[0]:
+            kind = "Piper" if not isinstance(engine.model, SyntheticVoice) else "sentetik"
+            print(f"Model: {kind}")
+        rtf, first = measure(engine)
+        baseline = baseline or rtf
+        print(
+            f"{workers} worker x {engine._intra_op_threads()} thread: "
+            f"RTF {rtf:.3f}  ilk chunk {first * 1000:6.1f} ms  "
+            f"hizlanma {baseline / rtf:.2f}x"
+        )
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark - STTEngine VAD kirpma
+Eski kare dongusu vs vektorel enerji kapisi + konusma bolgeleri
+
+Kullanim:
+    python tests/benchmarks/bench_vad.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.audio.vad import detect_speech_regions, trim_to_regions  # noqa: E402
+
+SAMPLE_RATE = 16000
+DURATION_SEC = 600  # 10 dakikalik kayit, ~%30 konusma
+ROUNDS = 3
+
+
+def legacy_apply_vad(vad, audio, sample_rate=16000):
+    """Eski STTEngine._apply_vad (karsilastirma icin birebir kopya)"""
+    audio_int16 = (audio * 32767).astype(np.int16)
+    frame_size = int(sample_rate * 30 / 1000)
+    voiced_frames = []
+    for i in range(0, len(audio_int16), frame_size):
+        frame = audio_int16[i:i + frame_size]
+        if len(frame) < frame_size:
+            break
+        if vad.is_speech(frame.tobytes(), sample_rate):
+            voiced_frames.append(frame)
+    if voiced_frames:
+        return np.concatenate(voiced_frames).astype(np.float32) / 32767.0
+    return audio
+
+
+def new_apply_vad(vad, audio, sample_rate=16000):
+    return trim_to_regions(audio, detect_speech_regions(audio, sample_rate, vad=vad))
+
+
+def make_recording():
+    """Konusma patlamalari + dusuk gurultulu sessizlik"""
+    rng = np.random.default_rng(0)
+    n = SAMPLE_RATE * DURATION_SEC
+    audio = (0.001 * rng.standard_normal(n)).astype(np.float32)
+    t = np.arange(SAMPLE_RATE * 2) / SAMPLE_RATE
+    burst = (0.3 * np.sin(2 * np.pi * 180 * t) * np.sin(2 * np.pi * 3 * t)).astype(np.float32)
+    for start in range(0, n - burst.size, SAMPLE_RATE * 7):
+        audio[start:start + burst.size] += burst
+    return audio
+
+
+def make_vad():
+    try:
+        import webrtcvad
+        return webrtcvad.Vad(2), "webrtcvad"
+    except ImportError:
+        class EnergyVad:
+            """webrtcvad yoksa: kare basi Python cagrisi maliyetini taklit eder"""
+
+            def is_speech(self, frame_bytes, sample_rate):
+                frame = np.frombuffer(frame_bytes, dtype=np.int16)
+                return int(np.abs(frame).max()) > 1000
+
+        return EnergyVad(), "EnergyVad (webrtcvad yuklu degil)"
+
+
+def measure(fn, vad, audio):
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        out = fn(vad, audio)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, out
+
+
+if __name__ == "__main__":
+    audio = make_recording()
+    vad, vad_name = make_vad()
+
+    print("=" * 60)
+    print(f"VAD BENCHMARK ({DURATION_SEC} sn, {vad_name})")
+    print("=" * 60)
+
+    legacy_ms, legacy_out = measure(legacy_apply_vad, vad, audio)
+    new_ms, new_out = measure(new_apply_vad, vad, audio)
+
+    print(f"\nEski kare dongusu:  {legacy_ms:8.1f} ms -> {len(legacy_out) / SAMPLE_RATE:.1f} sn ses")
+    print(f"Vektorel bolgeler:  {new_ms:8.1f} ms -> {len(new_out) / SAMPLE_RATE:.1f} sn ses")
+    print(f"\nHizlanma: {legacy_ms / new_ms:.1f}x")
+    print("=" * 60)
@@ -0,0 +1,210 @@
+"""
+Model Stubs - Ollama / Faster-Whisper / Piper yerine yerel taklitler
+====================================================================
+Benchmark'lar GPU ve model olmadan kendi orkestrasyon kodumuzu (LLMManager,
+STTEngine, TTSEngine, cache'ler) olcsun diye:
+
+- StubOllama: ollama.Client API'si (chat stream/tek parca, generate, list);
+  token hizi, ilk token suresi (TTFT), model yukleme gecikmesi, keep_alive
+  ve es zamanli istek siniri (OLLAMA_NUM_PARALLEL) ayarlanabilir; cevaplar
+  gercek Ollama sayaclarini (eval_count, prompt_eval_duration...) tasir
+- StubWhisperModel: WhisperModel.transcribe (ses suresi x rtf bekler)
+- StubPiperVoice: PiperVoice cumle API'si (ses suresi x rtf bekler)
+- StubModelManager: ModelManager, modelleri bu taklitlerden yukler
+
+Bekleme time.sleep ile yapilir (GIL birakilir), gercek modellerde oldugu gibi
+is parcaciklari birbirini bloklamaz.
+"""
+
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from core.model_loader import ModelManager  # noqa: E402
+
+REPLY_SENTENCES = [
+    "Bugün İstanbul'da hava parçalı bulutlu ve on sekiz derece.",
+    "Akşam saatlerinde hafif yağmur bekleniyor, yanına şemsiye almayı unutma.",
+    "Yarın sıcaklık biraz düşecek ve rüzgar kuzeyden esecek.",
+    "Hafta sonu ise güneşli ve ılık bir hava var.",
+    "Başka bir konuda yardımcı olabileceğim bir şey var mı?",
+]
+VLM_REPLY = "A young man with a backpack walks toward a destroyed building with broken glass."
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+class StubOllama:
+    """ollama.Client taklidi (tek sunucu: tum LLM/VLM istemcileri bunu paylasir)"""
+
+    def __init__(
+        self,
+        token_rate: float = 40.0,
+        ttft: float = 0.25,
+        load_delay: float = 2.0,
+        keep_alive: float = 300.0,
+        parallel: int = 1,
+        max_loaded: int = 1,
+        reply_tokens: int = 60,
+        models=("qwen2.5:7b", "moondream:latest"),
+    ):
+        self.token_rate = token_rate
+        self.ttft = ttft
+        self.load_delay = load_delay
+        self.keep_alive = keep_alive
+        self.max_loaded = max_loaded
+        self.reply_tokens = reply_tokens
+        self.models = list(models)
+
+        self._slots = threading.Semaphore(parallel)
+        self._lock = threading.Lock()
+        self._loaded: Dict[str, float] = {}
+        self.requests = 0
+        self.loads = 0
+
+    # --- ollama.Client API -----------------------------------------
+
+    def list(self):
+        return {"models": [{"model": name} for name in self.models]}
+
+    def generate(self, model: str, prompt: str = "", keep_alive=None, **kwargs):
+        """Bos prompt: sadece modeli yukle (LLMManager.warm_up)"""
+        with self._slots:
+            load = self._ensure_loaded(model)
+        return {"model": model, "response": "", "done": True, "load_duration": int(load * 1e9)}
+
+    def chat(self, model: str, messages: List[Dict], stream: bool = False,
+             options: Optional[Dict] = None, keep_alive=None, **kwargs):
+        with self._lock:
+            self.requests += 1
+        tokens = self._reply(model, messages, options or {})
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4 + 1
+        if stream:
+            return self._stream(model, tokens, prompt_tokens)
+
+        with self._slots:
+            load = self._ensure_loaded(model)
+            time.sleep(self.ttft + len(tokens) / self.token_rate)
+        return self._final(model, "".join(tokens), load, prompt_tokens, len(tokens))
+
+    # --- ic isleyis -------------------------------------------------
+
+    def _stream(self, model: str, tokens: List[str], prompt_tokens: int) -> Iterator[Dict]:
+        # Gercek istemci gibi istek, iterasyon baslayinca gider
+        with self._slots:
+            load = self._ensure_loaded(model)
+            time.sleep(self.ttft)
+            for token in tokens:
+                time.sleep(1.0 / self.token_rate)
+                yield {"model": model, "message": {"role": "assistant", "content": token}, "done": False}
+            yield self._final(model, "", load, prompt_tokens, len(tokens))
+
+    def _final(self, model: str, content: str, load: float, prompt_tokens: int, eval_count: int) -> Dict:
+        decode = eval_count / self.token_rate
+        return {
+            "model": model,
+            "message": {"role": "assistant", "content": content},
+            "done": True,
+            "load_duration": int(load * 1e9),
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(self.ttft * 1e9),
+            "eval_count": eval_count,
+            "eval_duration": int(decode * 1e9),
+            "total_duration": int((load + self.ttft + decode) * 1e9),
+        }
+
+    def _ensure_loaded(self, model: str) -> float:
+        """Model bellekte degilse (veya keep_alive dolduysa) yukleme gecikmesi"""
+        now = time.monotonic()
+        with self._lock:
+            for name, last in list(self._loaded.items()):
+                if now - last > self.keep_alive:
+                    del self._loaded[name]
+            hit = model in self._loaded
+            if not hit:
+                # VRAM siniri: en eski model bosaltilir (model degisimi maliyeti)
+                while len(self._loaded) >= self.max_loaded:
+                    del self._loaded[min(self._loaded, key=self._loaded.get)]
+                self.loads += 1
+            self._loaded[model] = now
+        if hit:
+            return 0.0
+        time.sleep(self.load_delay)
+        return self.load_delay
+
+    def _reply(self, model: str, messages: List[Dict], options: Dict) -> List[str]:
+        limit = min(int(options.get("num_predict", self.reply_tokens)), self.reply_tokens)
+        text = VLM_REPLY if "images" in messages[-1] else " ".join(REPLY_SENTENCES)
+        words = text.split(" ")
+        words = (words * (limit // len(words) + 1))[:max(1, limit)]
+        return [words[0]] + [" " + word for word in words[1:]]
+
+
+class StubWhisperModel:
+    """faster_whisper.WhisperModel taklidi"""
+
+    def __init__(self, text: str = "İstanbul'da bugün hava nasıl?", rtf: float = 0.1):
+        self.text = text
+        self.rtf = rtf
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        duration = len(audio) / 16000
+        time.sleep(duration * self.rtf)
+        segments = [SimpleNamespace(text=self.text, start=0.0, end=duration)]
+        return iter(segments), SimpleNamespace(language="tr", duration=duration)
+
+
+class StubPiperVoice:
+    """PiperVoice cumle API'si taklidi (~50 ms ses / karakter grubu)"""
+
+    def __init__(self, rtf: float = 0.05, sample_rate: int = 22050):
+        self.rtf = rtf
+        self.sample_rate = sample_rate
+
+    def phonemize(self, text: str):
+        return [list(sentence) for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+
+    def phonemes_to_ids(self, phonemes):
+        return list(range(len(phonemes)))
+
+    def phoneme_ids_to_audio(self, phoneme_ids):
+        n = max(1, len(phoneme_ids)) * 1100
+        time.sleep(n / self.sample_rate * self.rtf)
+        t = np.arange(n, dtype=np.float32) / self.sample_rate
+        return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    def synthesize(self, text: str):
+        for phonemes in self.phonemize(text):
+            audio = self.phoneme_ids_to_audio(self.phonemes_to_ids(phonemes))
+            yield SimpleNamespace(audio_float_array=audio)
+
+
+class StubModelManager(ModelManager):
+    """ModelManager: VRAM mantigi ayni, modeller taklitlerden"""
+
+    def __init__(self, config: dict, ollama: StubOllama, whisper: Optional[StubWhisperModel] = None):
+        super().__init__(config)
+        self.ollama = ollama
+        self.whisper = whisper or StubWhisperModel()
+
+    def _load_llm(self):
+        return self.ollama
+
+    def _load_vlm(self):
+        return self.ollama
+
+    def _load_stt(self):
+        return self.whisper
+
+    def _load_kws(self):
+        return self.whisper
@@ -0,0 +1,246 @@
+"""
+Search Replay - WebSearchTool icin kayit/tekrar + yerel stub sunucu
+===================================================================
+- record: canli Open-Meteo / er-api / CoinGecko / DDGS cevaplarini fixture'a yazar
+- StubUpstreamServer: fixture'lari yerel HTTP'den sunar (gecikme + hata enjeksiyonu)
+- ReplayDDGS: DDGS yerine fixture'dan sonuc doner (ayni gecikme/hata ayarlari)
+
+Kayit (ag gerekir):
+    python tests/benchmarks/search_replay.py record
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.tools import web_search  # noqa: E402
+
+FIXTURE_PATH = PROJECT_ROOT / "tests" / "data" / "search_replay.json"
+
+RECORD_QUERIES = [
+    "istanbul hava durumu",
+    "ankara, izmir ve antalya hava",
+    "dolar kaç tl",
+    "bitcoin ethereum fiyatı",
+    "gram altın ne kadar",
+    "galatasaray maç sonucu",
+    "son dakika haberleri",
+    "python nedir",
+    "dünya düz mü?",
+]
+
+
+def load_fixtures(path: Path = FIXTURE_PATH) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ==============================================================
+# GECIKME / HATA ENJEKSIYONU
+# ==============================================================
+
+class FaultProfile:
+    """Upstream davranisi: sabit + rastgele gecikme ve hata orani"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0,
+                 failure_rate: float = 0.0, seed: int = 42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def apply(self) -> bool:
+        """Gecikmeyi uygula; istek basarisiz olacaksa False dondur"""
+        with self._lock:
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            fail = self._random.random() < self.failure_rate
+        if delay:
+            time.sleep(delay / 1000)
+        return not fail
+
+
+# ==============================================================
+# STUB HTTP SUNUCU
+# ==============================================================
+
+class StubUpstreamServer:
+    """
+    Open-Meteo / er-api / CoinGecko yerine fixture sunan yerel HTTP sunucu
+
+    Usage:
+        with StubUpstreamServer(fixtures, FaultProfile(latency_ms=50)) as stub:
+            tool = WebSearchTool({'web_search': {'endpoints': stub.endpoints}})
+    """
+
+    def __init__(self, fixtures: dict, profile: FaultProfile = None):
+        self.fixtures = fixtures
+        self.profile = profile or FaultProfile()
+        self.request_count = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def endpoints(self) -> dict:
+        return {
+            'open_meteo': f"{self.base_url}/v1/forecast",
+            'exchange_rates': f"{self.base_url}/v6/latest/USD",
+            'coingecko': f"{self.base_url}/api/v3/simple/price",
+        }
+
+    def _route(self, path: str, params: dict):
+        if path == "/v1/forecast":
+            count = params.get("latitude", [""])[0].count(",") + 1
+            location = self.fixtures["open_meteo"]
+            return location if count == 1 else [location] * count
+        if path == "/v6/latest/USD":
+            return self.fixtures["exchange_rates"]
+        if path == "/api/v3/simple/price":
+            ids = params.get("ids", [""])[0].split(",")
+            prices = self.fixtures["coingecko"]
+            return {coin: prices.get(coin, prices["bitcoin"]) for coin in ids}
+        return None
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.request_count += 1
+                parsed = urlparse(self.path)
+                if not stub.profile.apply():
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                payload = stub._route(parsed.path, parse_qs(parsed.query))
+                if payload is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# ==============================================================
+# DDGS TEKRAR
+# ==============================================================
+
+def make_replay_ddgs(fixtures: dict, profile: FaultProfile = None):
+    """web_search.DDGS yerine gecen, fixture'dan sonuc donen sinif uret"""
+    profile = profile or FaultProfile()
+    text_results = fixtures.get("ddgs_text", {})
+    news_results = fixtures.get("ddgs_news", {})
+
+    class ReplayDDGS:
+        def text(self, query, max_results=10, **kwargs):
+            if not profile.apply():
+                raise RuntimeError("replay: DDGS hata enjeksiyonu")
+            return list(text_results.get(query, text_results.get("*", [])))[:max_results]
+
+        def news(self, query, max_results=10, **kwargs):
+            if not profile.apply():
+                raise RuntimeError("replay: DDGS hata enjeksiyonu")
+            return list(news_results.get(query, news_results.get("*", [])))[:max_results]
+
+    return ReplayDDGS
+
+
+def install_replay(fixtures: dict, profile: FaultProfile = None):
+    """DDGS'i tekrar moduna al (onceki sinifi dondurur)"""
+    previous = web_search.DDGS if web_search.DDGS_AVAILABLE else None
+    web_search.DDGS = make_replay_ddgs(fixtures, profile)
+    web_search.DDGS_AVAILABLE = True
+    return previous
+
+
+# ==============================================================
+# KAYIT
+# ==============================================================
+
+def record(path: Path = FIXTURE_PATH):
+    """RECORD_QUERIES'i canli calistir, cevaplari fixture dosyasina yaz"""
+    from src.tools.web_search import WebSearchTool
+
+    captured = {"ddgs_text": {}, "ddgs_news": {}}
+    real_get = web_search.requests.get
+    real_ddgs = web_search.DDGS
+
+    def recording_get(url, **kwargs):
+        response = real_get(url, **kwargs)
+        if response.status_code == 200:
+            data = response.json()
+            if "open-meteo" in url:
+                captured["open_meteo"] = data[0] if isinstance(data, list) else data
+            elif "er-api" in url:
+                captured["exchange_rates"] = data
+            elif "coingecko" in url:
+                captured.setdefault("coingecko", {}).update(data)
+        return response
+
+    class RecordingDDGS:
+        def __init__(self):
+            self._inner = real_ddgs()
+
+        def text(self, query, **kwargs):
+            results = list(self._inner.text(query, **kwargs))
+            captured["ddgs_text"][query] = results
+            captured["ddgs_text"].setdefault("*", results)
+            return results
+
+        def news(self, query, **kwargs):
+            results = list(self._inner.news(query, **kwargs))
+            captured["ddgs_news"][query] = results
+            captured["ddgs_news"].setdefault("*", results)
+            return results
+
+    web_search.requests.get = recording_get
+    web_search.DDGS = RecordingDDGS
+    try:
+        tool = WebSearchTool({'web_search': {'enabled': True, 'compact_context': False}})
+        for query in RECORD_QUERIES:
+            print(f"Kaydediliyor: {query}")
+            tool.smart_search(query)
+    finally:
+        web_search.requests.get = real_get
+        web_search.DDGS = real_ddgs
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(captured, f, ensure_ascii=False, indent=2)
+    print(f"Fixture yazildi: {path}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "record":
+        record()
+    else:
+        print(__doc__)
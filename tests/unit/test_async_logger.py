@@ -0,0 +1,123 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from loguru import logger
+
+from src.monitoring.logger import AsyncLogWriter, RateLimiter
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _add(writer, **kwargs):
+    return logger.add(writer, format="{message}", level="DEBUG", filter=writer.rate_limiter, **kwargs)
+
+
+def test_writer_batches_text_and_json_lines(tmp_path):
+    writer = AsyncLogWriter(save_path=str(tmp_path), flush_interval=0.05)
+    handler = _add(writer)
+
+    for i in range(20):
+        logger.debug("Cache'e eklendi: {}", i)
+    logger.remove(handler)
+
+    day = datetime.now().strftime('%Y-%m-%d')
+    text = (tmp_path / f"app_{day}.log").read_text(encoding="utf-8").splitlines()
+    records = [json.loads(line) for line in (tmp_path / f"app_{day}.json").read_text(encoding="utf-8").splitlines()]
+
+    assert len(text) == 20
+    assert text[-1].endswith("| Cache'e eklendi: 19")
+    assert records[0]['message'] == "Cache'e eklendi: 0"
+    assert records[0]['level'] == "DEBUG"
+    assert writer.get_statistics()['written'] == 20
+
+
+def test_size_rotation_compresses_old_file(tmp_path):
+    writer = AsyncLogWriter(save_path=str(tmp_path), json_output=False, flush_interval=0.05,
+                            batch_size=10, rotation_mb=0.001)
+    handler = _add(writer)
+
+    for i in range(100):
+        logger.info("satır {} " + "x" * 50, i)
+    logger.remove(handler)
+
+    compressed = sorted(tmp_path.glob("*.log.gz"))
+    assert len(compressed) > 1
+    rotated = ""
+    for path in compressed:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            rotated += f.read()
+    current = next(tmp_path.glob("*.log")).read_text(encoding="utf-8")
+    # Döndürmede satır kaybolmaz
+    assert all(f"satır {i} " in rotated + current for i in range(100))
+
+
+def test_day_change_compresses_previous_day(tmp_path):
+    writer = AsyncLogWriter(save_path=str(tmp_path), json_output=False, flush_interval=0.05)
+    yesterday = datetime.now().astimezone() - timedelta(days=1)
+    handler = _add(writer)
+
+    logger.patch(lambda record: record.update(time=yesterday)).info("dün")
+    logger.info("bugün")
+    logger.remove(handler)
+
+    assert (tmp_path / f"app_{yesterday:%Y-%m-%d}.log.gz").exists()
+    today = (tmp_path / f"app_{datetime.now():%Y-%m-%d}.log").read_text(encoding="utf-8")
+    assert "bugün" in today
+
+
+def test_rate_limiter_limits_per_module():
+    clock = _Clock()
+    limiter = RateLimiter({'core.cache_manager': 2}, clock=clock)
+
+    def record(name, level_no=20):
+        return {'name': name, 'level': type("Level", (), {'no': level_no})()}
+
+    assert [limiter(record('core.cache_manager')) for _ in range(3)] == [True, True, False]
+    assert limiter(record('core.cache_manager', level_no=30))
+    assert limiter(record('core.llm_manager'))
+
+    clock.now = 1.0
+    assert limiter(record('core.cache_manager'))
+    assert limiter.take_dropped() == {'core.cache_manager': 1}
+    assert limiter.take_dropped() == {}
+
+
+def test_rate_limited_lines_are_summarized(tmp_path):
+    writer = AsyncLogWriter(save_path=str(tmp_path), json_output=False, flush_interval=0.05,
+                            rate_limiter=RateLimiter({__name__: 1}))
+    handler = _add(writer)
+
+    for _ in range(10):
+        logger.info("cache hit")
+    logger.remove(handler)
+
+    text = (tmp_path / f"app_{datetime.now():%Y-%m-%d}.log").read_text(encoding="utf-8")
+    assert text.count("cache hit") == 1
+    assert "9 satır atlandı" in text
+    assert writer.get_statistics()['rate_limited'] == 9
+
+
+def test_console_limiter_drops_are_reported(tmp_path):
+    console = RateLimiter({__name__: 1})
+    writer = AsyncLogWriter(save_path=str(tmp_path), json_output=False, flush_interval=0.05,
+                            console_rate_limiter=console)
+    handler = logger.add(lambda message: None, level="DEBUG", filter=console)
+
+    for _ in range(5):
+        logger.info("cache hit")
+    logger.remove(handler)
+    writer.stop()
+
+    assert writer.get_statistics()['console_rate_limited'] == 4
+    assert console.dropped == {}
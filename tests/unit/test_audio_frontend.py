@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.audio.audio_frontend import (
+    TARGET_SAMPLE_RATE, peak_level, prepare_audio, resample, rms_level, to_mono_float32,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+def _tone(freq, sample_rate, seconds=1.0):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_float32_mono_16k_is_passed_through_without_copy():
+    audio = _tone(440, TARGET_SAMPLE_RATE)
+
+    assert prepare_audio(audio, TARGET_SAMPLE_RATE) is audio
+
+
+def test_int16_stereo_is_downmixed_and_scaled():
+    left = np.full(100, 16384, dtype=np.int16)
+    right = np.zeros(100, dtype=np.int16)
+
+    mono = to_mono_float32(np.stack([left, right], axis=1))
+
+    assert mono.dtype == np.float32
+    assert mono.shape == (100,)
+    np.testing.assert_allclose(mono, 0.25)
+
+
+def test_caller_array_is_not_modified():
+    audio = np.array([0.5, -0.5], dtype=np.float64)
+
+    to_mono_float32(audio)
+
+    np.testing.assert_array_equal(audio, [0.5, -0.5])
+
+
+@pytest.mark.parametrize("sample_rate", [44100, 48000, 22050])
+def test_resample_keeps_length_and_tone(sample_rate):
+    out = resample(_tone(440, sample_rate), sample_rate)
+
+    assert out.dtype == np.float32
+    assert abs(len(out) - TARGET_SAMPLE_RATE) <= 1
+    spectrum = np.abs(np.fft.rfft(out))
+    peak_hz = np.argmax(spectrum) * TARGET_SAMPLE_RATE / len(out)
+    assert abs(peak_hz - 440) < 2
+
+
+def test_levels_match_numpy_reference():
+    audio = _tone(440, TARGET_SAMPLE_RATE)
+
+    assert peak_level(audio) == pytest.approx(np.abs(audio).max())
+    assert rms_level(audio) == pytest.approx(np.sqrt(np.mean(audio ** 2)), rel=1e-5)
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from src.audio.barge_in import BargeInListener
+from src.audio.vad import FRAME_MS
+
+
+pytestmark = pytest.mark.unit
+
+FRAME = 16000 * FRAME_MS // 1000
+
+
+def _listener(calls, **barge_in):
+    config = {"ui": {"voice": {"barge_in": {
+        "min_speech_ms": 90, "preroll_ms": 60, "end_silence_ms": 90, **barge_in
+    }}}}
+    return BargeInListener(config, on_barge_in=lambda: calls.append("stop"))
+
+
+def _speech():
+    return np.full(FRAME, 0.1, dtype=np.float32)
+
+
+def _silence():
+    return np.zeros(FRAME, dtype=np.float32)
+
+
+def test_short_noise_does_not_interrupt():
+    calls = []
+    listener = _listener(calls)
+
+    for frame in (_speech(), _speech(), _silence(), _speech()):
+        listener.feed(frame)
+
+    assert calls == []
+    assert listener.wait_utterance(timeout=0) is None
+
+
+def test_sustained_speech_interrupts_and_records_utterance():
+    calls = []
+    listener = _listener(calls)
+
+    listener.feed(_silence())
+    for _ in range(3):
+        listener.feed(_speech())
+    assert calls == ["stop"]
+
+    listener.feed(_speech())
+    for _ in range(3):
+        listener.feed(_silence())
+    listener.feed(_speech())  # cumle bittikten sonra yok sayilir
+
+    audio = listener.wait_utterance(timeout=0)
+    # pre-roll (2 kare) + 1 konusma + 3 sessizlik
+    assert audio.size == 6 * FRAME
+    assert listener.utterance_done.is_set()
+
+
+def test_vad_rejects_loud_non_speech():
+    class _RejectingVad:
+        def is_speech(self, data, sample_rate):
+            return False
+
+    calls = []
+    listener = _listener(calls)
+    listener.vad = _RejectingVad()
+
+    for _ in range(5):
+        listener.feed(_speech())
+
+    assert calls == []
@@ -0,0 +1,62 @@
+import pytest
+
+from src.tools.context_compactor import compact_context, estimate_tokens, resolve_budget
+
+
+pytestmark = pytest.mark.unit
+
+
+def test_near_duplicate_snippets_are_removed():
+    text = (
+        "İNTERNET ARAŞTIRMA SONUÇLARI:\n"
+        "- Site A: Ankara Türkiye'nin başkentidir ve nüfusu 5,8 milyondur.\n"
+        "- Site B: Ankara Türkiye'nin başkentidir, nüfusu 5,8 milyondur.\n"
+        "- Site C: Şehir İç Anadolu bölgesinde yer alır.\n"
+    )
+
+    compacted, stats = compact_context(text, "ankara nüfusu", budget_tokens=500)
+
+    assert stats["duplicates_removed"] == 1
+    assert "Site B" not in compacted
+    assert compacted.startswith("İNTERNET ARAŞTIRMA SONUÇLARI:")
+
+
+def test_relevant_sentences_are_kept():
+    text = (
+        "- Haber: Hava bugün güzel. Dolar 34,20 TL seviyesinde işlem görüyor. "
+        "Maç akşam oynanacak. Piyasalar sakin.\n"
+    )
+
+    compacted, _ = compact_context(text, "dolar kaç tl", budget_tokens=500)
+
+    assert "34,20" in compacted
+    assert "Maç" not in compacted
+
+
+def test_key_value_blocks_do_not_grow():
+    text = (
+        "ANKARA HAVA DURUMU (CANLI VERİ):\nAnlık sıcaklık: 12°C\nNem: %40\nRüzgar: 8 km/sa\n\n"
+        "IZMIR HAVA DURUMU (CANLI VERİ):\nAnlık sıcaklık: 18°C\nNem: %60\nRüzgar: 12 km/sa"
+    )
+
+    compacted, stats = compact_context(text, "ankara ve izmir hava", budget_tokens=500)
+
+    assert stats["tokens_after"] <= stats["tokens_before"]
+    assert "Nem: %40" in compacted.splitlines()
+
+
+def test_budget_drops_trailing_snippets_and_reports_savings():
+    snippets = "".join(f"- Kaynak {i}: konu {i} hakkında uzun bir açıklama {'x' * 200}\n" for i in range(5))
+    text = "İNTERNET ARAŞTIRMA SONUÇLARI:\n" + snippets
+
+    compacted, stats = compact_context(text, "konu", budget_tokens=120)
+
+    assert estimate_tokens(compacted) <= 121
+    assert stats["tokens_saved"] > 0
+    assert "Kaynak 0" in compacted
+
+
+def test_budget_overrides():
+    assert resolve_budget("doviz") == 120
+    assert resolve_budget("bilinmeyen") == resolve_budget("default")
+    assert resolve_budget("haber", {"haber": 50}) == 50
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from src.monitoring.histogram import LatencyHistogram, OperationMetrics, SlidingWindowHistogram
+from src.monitoring.performance import PerformanceTracker
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_percentiles_within_bucket_error():
+    rng = random.Random(0)
+    values = [rng.lognormvariate(0, 1) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    for q in (50, 90, 99):
+        exact = values[int(q / 100 * len(values)) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=0.03)
+    assert histogram.count == len(values)
+    # Sabit bellek: kova sayisi kayit sayisindan bagimsiz
+    assert len(histogram.counts) < 1000
+
+
+def test_merge_and_round_trip_across_processes():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for value in (0.1, 0.2, 0.3):
+        a.record(value)
+    for value in (1.0, 2.0):
+        b.record(value)
+
+    merged = LatencyHistogram.from_dict(a.to_dict()).merge(LatencyHistogram.from_dict(b.to_dict()))
+
+    assert merged.count == 5
+    assert merged.max == 2.0
+    assert merged.min == 0.1
+    assert merged.total == pytest.approx(3.6)
+
+
+def test_merge_rejects_different_layout():
+    with pytest.raises(ValueError):
+        LatencyHistogram().merge(LatencyHistogram(growth=1.1))
+
+
+def test_sliding_window_drops_old_slots():
+    clock = _Clock()
+    window = SlidingWindowHistogram(60, 12, clock=clock)
+    window.record(5.0)
+    clock.now = 30
+    window.record(0.1)
+
+    assert window.histogram().count == 2
+    clock.now = 65
+    assert window.histogram().count == 1
+    assert window.histogram().max == 0.1
+    clock.now = 200
+    assert window.histogram().count == 0
+
+
+def test_operation_metrics_summary_has_windows():
+    metrics = OperationMetrics()
+    metrics.record(0.5)
+    stats = metrics.summary()
+
+    assert stats['count'] == 1
+    assert stats['p99'] == pytest.approx(0.5, rel=0.02)
+    assert stats['windows']['1m']['count'] == 1
+    assert stats['windows']['15m']['count'] == 1
+
+
+def test_tracker_exports_and_merges_histograms():
+    worker, main = PerformanceTracker(), PerformanceTracker()
+    worker.span('stt').end()
+    main.span('stt').end()
+
+    main.merge_histograms(worker.export_histograms())
+
+    assert main.get_count('stt') == 2
+    assert main.get_percentile('stt', 50) >= 0
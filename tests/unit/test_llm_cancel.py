@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+
+from src.core.llm_manager import LLMManager
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Stream:
+    def __init__(self, manager, tokens):
+        self.manager = manager
+        self.tokens = tokens
+        self.closed = False
+
+    def __iter__(self):
+        for i, token in enumerate(self.tokens):
+            if i == 2:
+                self.manager.cancel()  # kullanici araya girdi
+            yield {"message": {"content": token}}
+
+    def close(self):
+        self.closed = True
+
+
+class _EventStream:
+    """Baska bir oturumun bayragini set eden akis"""
+
+    def __init__(self, event, tokens):
+        self.event = event
+        self.tokens = tokens
+
+    def __iter__(self):
+        for token in self.tokens:
+            self.event.set()
+            yield {"message": {"content": token}}
+
+
+class _Client:
+    def __init__(self):
+        self.stream = None
+
+    def chat(self, **kwargs):
+        return self.stream
+
+
+class _ModelManager:
+    def __init__(self, client):
+        self.client = client
+
+    def load_model(self, name):
+        return self.client
+
+
+def _manager(client):
+    config = {
+        "llm": {"model": "dummy"},
+        "vlm": {"model": "dummy-vlm"},
+        "memory": {"max_history": 5},
+        "web_search": {"enabled": False},
+    }
+    return LLMManager(config, _ModelManager(client))
+
+
+def test_cancel_stops_stream_and_skips_history():
+    client = _Client()
+    manager = _manager(client)
+    client.stream = _Stream(manager, ["Bu ", "uzun ", "bir ", "cevap."])
+
+    result = manager.generate("Anlat", stream=True)
+
+    assert result == ""
+    assert client.stream.closed
+    assert manager.conversation_history == []
+
+
+def test_cancel_from_previous_turn_does_not_leak():
+    client = _Client()
+    manager = _manager(client)
+    manager.cancel()
+    client.stream = iter([{"message": {"content": "Selam!"}}])
+
+    assert manager.generate("Selam", stream=True) == "Selam!"
+
+
+def test_cancel_during_search_skips_ollama_request():
+    client = _Client()
+    manager = _manager(client)
+    manager.web_search_enabled = True
+    manager._check_and_search = lambda prompt: manager.cancel()  # arama sirasinda araya girildi
+    client.chat = lambda **kwargs: pytest.fail("iptal edilen tur Ollama'ya gitmemeli")
+
+    assert manager.generate("Bugün hava nasıl", stream=True) == ""
+    assert list(manager.generate_sentences("Bugün hava nasıl")) == []
+
+
+def test_cancel_event_is_per_call():
+    client = _Client()
+    manager = _manager(client)
+    other = threading.Event()
+    mine = threading.Event()
+    client.stream = _EventStream(other, ["Bu ", "cevap ", "kesilmez."])
+
+    assert manager.generate("Anlat", stream=True, cancel_event=mine) == "Bu cevap kesilmez."
+    assert not mine.is_set()
@@ -0,0 +1,84 @@
+import pytest
+
+from src.core.llm_manager import LLMManager
+from src.monitoring.performance import PerformanceTracker
+
+
+pytestmark = pytest.mark.unit
+
+FINAL = {
+    "done": True,
+    "message": {"content": ""},
+    "load_duration": 2_000_000_000,
+    "prompt_eval_count": 120,
+    "prompt_eval_duration": 300_000_000,
+    "eval_count": 50,
+    "eval_duration": 1_000_000_000,
+}
+
+
+class _Client:
+    def __init__(self, chunks=None, response=None):
+        self.chunks = chunks
+        self.response = response
+
+    def chat(self, **kwargs):
+        if kwargs.get("stream"):
+            return iter(self.chunks)
+        return self.response
+
+
+class _ModelManager:
+    def __init__(self, client):
+        self.client = client
+
+    def load_model(self, name):
+        return self.client
+
+
+def _manager(client):
+    config = {
+        "llm": {"model": "dummy"},
+        "vlm": {"model": "dummy-vlm"},
+        "memory": {"max_history": 5},
+        "web_search": {"enabled": False},
+    }
+    tracker = PerformanceTracker()
+    return LLMManager(config, _ModelManager(client), perf_tracker=tracker), tracker
+
+
+def test_stream_records_ttft_and_ollama_counters(capsys):
+    chunks = [{"message": {"content": "Merhaba."}}, {"message": {"content": " Nasılsın?"}}, FINAL]
+    manager, tracker = _manager(_Client(chunks=chunks))
+
+    manager.generate("selam", stream=True)
+
+    metrics = manager.last_metrics
+    assert metrics["tokens_per_sec"] == pytest.approx(50.0)
+    assert metrics["prompt_tokens"] == 120
+    assert metrics["prompt_eval"] == pytest.approx(0.3)
+    assert metrics["load"] == pytest.approx(2.0)
+    assert 0 <= metrics["ttft"] < 1
+    assert tracker.get_count("llm_ttft") == 1
+    assert tracker.get_count("llm_tokens_per_sec") == 1
+
+    inference = tracker.slowest_trace("llm_inference")
+    assert inference.attributes["prompt_tokens"] == 120
+
+
+def test_non_stream_approximates_ttft_from_server_timings():
+    manager, tracker = _manager(_Client(response=dict(FINAL, message={"content": "Tamam."})))
+
+    manager.generate("selam", stream=False)
+
+    assert manager.last_metrics["ttft"] == pytest.approx(2.3)
+    assert tracker.get_average("llm_decode") == pytest.approx(1.0, rel=0.01)
+
+
+def test_missing_counters_are_skipped():
+    manager, tracker = _manager(_Client(response={"message": {"content": "Tamam."}}))
+
+    manager.generate("selam", stream=False)
+
+    assert manager.last_metrics == {}
+    assert tracker.get_count("llm_ttft") == 0
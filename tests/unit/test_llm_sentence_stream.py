@@ -0,0 +1,77 @@
+import pytest
+
+from src.core.llm_manager import LLMManager
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Stream:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        for token in self.tokens:
+            self.consumed += 1
+            yield {"message": {"content": token}}
+
+    def close(self):
+        self.closed = True
+
+
+class _Client:
+    def __init__(self, tokens):
+        self.stream = _Stream(tokens)
+
+    def chat(self, **kwargs):
+        return self.stream
+
+
+class _ModelManager:
+    def __init__(self, client):
+        self.client = client
+
+    def load_model(self, name):
+        return self.client
+
+
+def _manager(tokens):
+    config = {
+        "llm": {"model": "dummy"},
+        "vlm": {"model": "dummy-vlm"},
+        "memory": {"max_history": 5},
+        "web_search": {"enabled": False},
+    }
+    client = _Client(tokens)
+    return LLMManager(config, _ModelManager(client)), client.stream
+
+
+def test_sentences_are_yielded_as_soon_as_they_end():
+    manager, stream = _manager(["Bugün hava ", "güzel. Yarın", " yağmur var! Şemsiye", " al"])
+    sentences = manager.generate_sentences("Hava nasıl?")
+
+    assert next(sentences) == "Bugün hava güzel."
+    assert stream.consumed == 2
+    assert list(sentences) == ["Yarın yağmur var!", "Şemsiye al"]
+    assert manager.conversation_history[-1]["content"] == "Bugün hava güzel. Yarın yağmur var! Şemsiye al"
+
+
+def test_language_drift_stops_the_stream():
+    manager, stream = _manager(["Selam! ", "你好 world. ", "Devam ", "ediyor."])
+
+    assert list(manager.generate_sentences("Selam")) == ["Selam!"]
+    assert stream.closed
+    assert stream.consumed == 2
+
+
+def test_closing_the_generator_closes_the_ollama_stream():
+    manager, stream = _manager(["Bir. ", "Iki. ", "Uc."])
+    sentences = manager.generate_sentences("Say")
+
+    next(sentences)
+    sentences.close()
+
+    assert stream.closed
+    assert manager.conversation_history == []
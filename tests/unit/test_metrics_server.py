@@ -0,0 +1,75 @@
+import urllib.request
+
+import pytest
+
+from src.monitoring.metrics_server import MetricsExporter, MetricsServer
+from src.monitoring.performance import PerformanceTracker
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Cache:
+    def get_statistics(self):
+        return {"entries": 4, "hits": 3, "misses": 1}
+
+
+class _Models:
+    def get_residency(self):
+        return {"llm": 12.5}
+
+
+class _VRAM:
+    def get_full_stats(self):
+        return {
+            "vram": {"available": True, "used_gb": 4.0, "total_gb": 8.0},
+            "utilization_percent": 55,
+            "temperature_celsius": 61,
+        }
+
+
+def _exporter():
+    tracker = PerformanceTracker()
+    tracker.record("llm_inference", 0.3)
+    tracker.record("llm_inference", 2.0)
+    tracker.record("llm_tokens_per_sec", 42.0)
+    exporter = MetricsExporter(tracker, _VRAM(), _Models(), caches={"response": _Cache(), "none": None})
+    exporter.add_queue_source(lambda: {"tts_playback": 2})
+    return exporter
+
+
+def test_render_exports_all_sources():
+    text = _exporter().render()
+
+    assert '# TYPE asistan_stage_duration_seconds histogram' in text
+    assert 'asistan_stage_duration_seconds_bucket{stage="llm_inference",le="0.5"} 1' in text
+    assert 'asistan_stage_duration_seconds_bucket{stage="llm_inference",le="+Inf"} 2' in text
+    assert 'asistan_stage_duration_seconds_count{stage="llm_inference"} 2' in text
+    assert 'asistan_stage_value{metric="llm_tokens_per_sec",quantile="0.5"}' in text
+    assert 'asistan_cache_hit_ratio{cache="response"} 0.75' in text
+    assert 'cache="none"' not in text
+    assert 'asistan_model_loaded{model="llm"} 1' in text
+    assert 'asistan_model_loaded{model="vlm"} 0' in text
+    assert f'asistan_gpu_memory_used_bytes {4 * 1024 ** 3}' in text
+    assert 'asistan_queue_depth{queue="tts_playback"} 2' in text
+
+
+def test_failing_source_does_not_break_render():
+    class _Broken:
+        def get_full_stats(self):
+            raise RuntimeError("nvml")
+
+    text = MetricsExporter(vram_monitor=_Broken(), model_manager=_Models()).render()
+    assert 'asistan_model_loaded{model="llm"} 1' in text
+
+
+def test_server_serves_metrics():
+    server = MetricsServer(_exporter(), port=0)
+    assert server.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            body = response.read().decode()
+            assert response.headers["Content-Type"].startswith("text/plain")
+        assert "asistan_queue_depth" in body
+    finally:
+        server.stop()
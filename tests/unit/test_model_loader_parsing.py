@@ -1,6 +1,10 @@
+import time
+
+import numpy as np
 import pytest
 
 from src.core.model_loader import ModelManager
+from src.monitoring.vram_monitor import VRAMSampler
 
 
 pytestmark = pytest.mark.unit
@@ -25,3 +29,32 @@ def test_resolve_model_name_matches_base_and_exact():
     assert ModelManager._resolve_model_name("qwen2.5:7b", available) == "qwen2.5:7b"
     assert ModelManager._resolve_model_name("turkce-asistan", available) == "turkce-asistan:latest"
     assert ModelManager._resolve_model_name("missing-model", available) is None
+
+
+class _GrowingMonitor:
+    """Her okumada 1 GB daha dolu GPU"""
+
+    def __init__(self):
+        self.reads = 0
+
+    def read_sample(self):
+        self.reads += 1
+        return np.array([time.time(), float(self.reads), 8.0, 50.0, np.nan])
+
+
+def test_load_and_unload_read_fresh_vram_samples(monkeypatch):
+    manager = ModelManager({"hardware": {"gpu_memory_limit": 8}})
+    monitor = _GrowingMonitor()
+    manager.vram_sampler = VRAMSampler(monitor, interval=60).start()
+    monkeypatch.setattr(manager, "_load_stt", object)
+    try:
+        before = manager.get_vram_usage()
+        manager.load_model("stt")
+        after_load = manager.get_vram_usage()
+        manager.unload_model("stt")
+
+        assert after_load > before
+        assert after_load == monitor.reads - 1
+        assert manager.get_vram_usage() == monitor.reads
+    finally:
+        manager.vram_sampler.stop()
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.monitoring.performance import PerformanceTracker, maybe_span
+
+
+pytestmark = pytest.mark.unit
+
+
+def test_concurrent_same_name_operations_do_not_clobber():
+    tracker = PerformanceTracker()
+    barrier = threading.Barrier(2)
+
+    def worker(delay):
+        tracker.start_operation('llm_inference')
+        barrier.wait()
+        time.sleep(delay)
+        tracker.end_operation('llm_inference')
+
+    threads = [threading.Thread(target=worker, args=(d,)) for d in (0.05, 0.15)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = tracker.get_statistics('llm_inference')
+    assert stats['count'] == 2
+    assert stats['min_time'] == pytest.approx(0.05, abs=0.04)
+    assert stats['max_time'] == pytest.approx(0.15, abs=0.04)
+
+
+def test_nested_spans_build_tree_with_self_time():
+    tracker = PerformanceTracker()
+
+    with tracker.span('voice_turn') as turn:
+        with tracker.span('stt'):
+            time.sleep(0.02)
+        tracker.start_operation('llm_inference')
+        with tracker.span('web_search'):
+            time.sleep(0.02)
+        tracker.end_operation('llm_inference')
+
+    assert [c.name for c in turn.children] == ['stt', 'llm_inference']
+    assert turn.children[1].children[0].name == 'web_search'
+    assert turn.self_time < turn.duration
+    assert tracker.slowest_trace('voice_turn') is turn
+    assert tracker.get_count('web_search') == 1
+
+
+def test_explicit_parent_across_threads():
+    tracker = PerformanceTracker()
+
+    with tracker.span('reply') as reply:
+        parent = tracker.current_span()
+        thread = threading.Thread(target=lambda: tracker.span('tts', parent=parent).end())
+        thread.start()
+        thread.join()
+
+    assert [c.name for c in reply.children] == ['tts']
+
+
+def test_end_operation_without_start_is_ignored():
+    tracker = PerformanceTracker()
+    tracker.end_operation('missing')
+    assert tracker.get_count('missing') == 0
+
+
+def test_asyncio_tasks_have_isolated_spans():
+    tracker = PerformanceTracker()
+
+    async def turn(name):
+        with tracker.span(name) as root:
+            await asyncio.sleep(0.01)
+            with tracker.span('llm_inference'):
+                await asyncio.sleep(0.01)
+        return root
+
+    async def main():
+        return await asyncio.gather(turn('a'), turn('b'))
+
+    roots = asyncio.run(main())
+    for root in roots:
+        assert len(root.children) == 1
+    assert tracker.get_count('llm_inference') == 2
+
+
+def test_maybe_span_without_tracker_is_noop():
+    tracker = PerformanceTracker()
+
+    with maybe_span(None, 'stt') as span:
+        assert span is None
+    with maybe_span(tracker, 'stt'):
+        pass
+
+    assert tracker.get_statistics('stt')['count'] == 1
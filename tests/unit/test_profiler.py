@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.monitoring.metrics_server import MetricsExporter, MetricsServer
+from src.monitoring.profiler import CPU_CLOCKS_AVAILABLE, MAX_DEPTH, SamplingProfiler
+
+
+pytestmark = pytest.mark.unit
+
+
+def _busy_loop(stop):
+    total = 0
+    while not stop.is_set():
+        total += sum(i * i for i in range(1000))
+    return total
+
+
+def _blocked_read(fd):
+    os.read(fd, 1)  # C icinde bloklu: yigin tepesi IDLE_FRAMES'te degil
+
+
+def _deep(depth, stop):
+    if depth:
+        return _deep(depth - 1, stop)
+    return _busy_loop(stop)
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    idle = threading.Event()
+    threads = [
+        threading.Thread(target=_busy_loop, args=(stop,), name="busy"),
+        threading.Thread(target=idle.wait, name="idle"),
+    ]
+    for thread in threads:
+        thread.start()
+    yield
+    stop.set()
+    idle.set()
+    for thread in threads:
+        thread.join()
+
+
+def test_samples_busy_thread_and_skips_idle(busy_thread, tmp_path):
+    profiler = SamplingProfiler(interval=0.005, output_dir=str(tmp_path))
+
+    assert profiler.start()
+    assert not profiler.start()
+    time.sleep(0.3)
+    summary = profiler.stop()
+
+    assert summary['samples'] > 0
+    collapsed = profiler.collapsed()
+    assert "busy;" in collapsed
+    assert "_busy_loop" in collapsed
+    assert not any(line.startswith("idle;") for line in collapsed.splitlines())
+    assert summary['modules'][0]['module'] == __name__
+
+    path = profiler.write()
+    assert path.read_text(encoding="utf-8") == collapsed
+    assert (tmp_path / path.name.replace(".collapsed", "_modules.txt")).exists()
+
+
+@pytest.mark.skipif(not CPU_CLOCKS_AVAILABLE, reason="thread CPU saati yok")
+def test_threads_blocked_in_c_are_not_sampled(tmp_path):
+    read_fd, write_fd = os.pipe()
+    reader = threading.Thread(target=_blocked_read, args=(read_fd,), name="reader")
+    reader.start()
+    try:
+        profiler = SamplingProfiler(interval=0.005, output_dir=str(tmp_path))
+        collapsed = profiler.profile(0.3)
+    finally:
+        os.write(write_fd, b"x")
+        reader.join()
+        os.close(read_fd)
+        os.close(write_fd)
+
+    assert "reader;" not in collapsed
+    assert "MainThread;" not in collapsed
+    assert profiler.samples < 10
+
+
+def test_profile_skips_calling_thread(busy_thread, tmp_path):
+    profiler = SamplingProfiler(interval=0.005, output_dir=str(tmp_path), include_idle=True)
+
+    collapsed = profiler.profile(0.2)
+
+    assert "busy;" in collapsed
+    assert "MainThread;" not in collapsed
+
+
+def test_deep_stacks_keep_leaf_frames(tmp_path):
+    stop = threading.Event()
+    deep = threading.Thread(target=_deep, args=(MAX_DEPTH + 50, stop), name="deep")
+    deep.start()
+    try:
+        profiler = SamplingProfiler(interval=0.005, output_dir=str(tmp_path))
+        collapsed = profiler.profile(0.3)
+    finally:
+        stop.set()
+        deep.join()
+
+    stack = next(line for line in collapsed.splitlines() if line.startswith("deep;"))
+    assert "_busy_loop" in stack
+    assert len(stack.split(";")) == MAX_DEPTH + 1
+
+
+def test_timed_start_stops_and_writes(busy_thread, tmp_path):
+    profiler = SamplingProfiler(interval=0.005, output_dir=str(tmp_path))
+
+    profiler.start(duration=0.1)
+    deadline = time.time() + 5
+    while profiler.running and time.time() < deadline:
+        time.sleep(0.02)
+    time.sleep(0.05)
+
+    assert not profiler.running
+    assert list(tmp_path.glob("*.collapsed"))
+
+
+def test_debug_profile_endpoint(busy_thread, tmp_path):
+    profiler = SamplingProfiler(interval=0.005, output_dir=str(tmp_path))
+    server = MetricsServer(MetricsExporter(), port=0, profiler=profiler)
+    assert server.start()
+    try:
+        url = f"http://127.0.0.1:{server.port}/debug/profile?seconds=0.2"
+        with urllib.request.urlopen(url, timeout=10) as response:
+            body = response.read().decode("utf-8")
+        assert "_busy_loop" in body
+    finally:
+        server.stop()
+
+
+def test_debug_profile_disabled_without_profiler():
+    server = MetricsServer(MetricsExporter(), port=0)
+    assert server.start()
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"http://127.0.0.1:{server.port}/debug/profile", timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.stop()
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.tools.search_intent import classify_intents, detect_intents, is_smalltalk
+from src.tools.utils import normalize_turkish
+
+
+pytestmark = pytest.mark.unit
+
+CORPUS_PATH = Path(__file__).resolve().parents[1] / "data" / "search_intent_corpus.yaml"
+
+
+def _load_corpus():
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)["queries"]
+
+
+@pytest.mark.parametrize("item", _load_corpus(), ids=lambda item: item["query"])
+def test_corpus_top_intent(item):
+    intents = detect_intents(item["query"])
+    top = intents[0]["intent"] if intents else None
+    assert top == item["intent"]
+
+
+def test_short_keywords_need_word_boundary():
+    assert classify_intents(normalize_turkish("karar verdim")) == []
+    assert classify_intents(normalize_turkish("çok önemli")) == []
+    assert classify_intents(normalize_turkish("yeni yıl")) == []
+
+
+def test_suffixed_keywords_still_match():
+    intents = classify_intents(normalize_turkish("İzmir'in havası"))
+    assert intents[0]["intent"] == "hava"
+
+
+def test_multiword_greeting_is_smalltalk():
+    assert is_smalltalk(normalize_turkish("iyi geceler"))
+    assert not is_smalltalk(normalize_turkish("iyi bir film öner"))
+
+
+def test_run_together_phrases_are_not_smalltalk():
+    assert is_smalltalk(normalize_turkish("selam selam"))
+    assert is_smalltalk(normalize_turkish("selam, nasılsın?"))
+    assert not is_smalltalk(normalize_turkish("selamselam"))
+    assert not is_smalltalk(normalize_turkish("sasa"))
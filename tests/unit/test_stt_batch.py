@@ -0,0 +1,99 @@
+import random
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.audio import stt_engine
+from src.audio.stt_engine import STTEngine
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Segment:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeWhisper:
+    """Rastgele gecikmeli model: sonuclar sirasiz biter"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(random.uniform(0.001, 0.02))
+        with self._lock:
+            self.active -= 1
+        return [_Segment(f"kayit {len(audio)}")], None
+
+
+class _FakeModelManager:
+    def __init__(self, model):
+        self.model = model
+        self.loads = 0
+
+    def load_model(self, name):
+        self.loads += 1
+        return self.model
+
+
+def _engine(model, num_workers=4):
+    config = {"stt": {"vad_filter": False, "num_workers": num_workers}}
+    return STTEngine(config, _FakeModelManager(model))
+
+
+def test_batch_results_stream_in_input_order(monkeypatch):
+    monkeypatch.setattr(stt_engine, "WHISPER_AVAILABLE", True)
+    model = _FakeWhisper()
+    items = [np.zeros(1000 + i, dtype=np.float32) for i in range(20)]
+
+    results = list(_engine(model).transcribe_batch(items))
+
+    assert [r["index"] for r in results] == list(range(20))
+    assert [r["text"] for r in results] == [f"kayit {1000 + i}" for i in range(20)]
+    assert 1 < model.max_active <= 4
+
+
+def test_batch_resamples_tuple_items_and_reports_errors(monkeypatch):
+    monkeypatch.setattr(stt_engine, "WHISPER_AVAILABLE", True)
+    items = [(48000, np.zeros(48000, dtype=np.int16)), "missing.wav"]
+
+    first, second = _engine(_FakeWhisper()).transcribe_batch(items)
+
+    assert first["text"] == "kayit 16000"
+    assert first["duration"] == pytest.approx(1.0)
+    assert second["error"] and second["text"] == ""
+
+
+def test_cached_audio_does_not_load_model(monkeypatch):
+    monkeypatch.setattr(stt_engine, "WHISPER_AVAILABLE", True)
+    engine = _engine(_FakeWhisper())
+    engine.transcript_cache.persist = False
+    audio = np.zeros(1600, dtype=np.float32)
+    engine.transcript_cache.set(engine.transcript_cache.make_key(audio), "merhaba")
+
+    assert engine.transcribe(audio_array=audio) == "merhaba"
+    assert [r["text"] for r in engine.transcribe_batch([audio, audio])] == ["merhaba", "merhaba"]
+    assert engine.model_manager.loads == 0
+
+
+def test_batch_does_not_touch_last_vad_regions(monkeypatch):
+    monkeypatch.setattr(stt_engine, "WHISPER_AVAILABLE", True)
+    monkeypatch.setattr(stt_engine, "apply_vad", lambda audio, sr, **kwargs: (audio, [(0, len(audio))]))
+    engine = _engine(_FakeWhisper())
+    engine.config["vad_filter"] = True
+    engine.vad, engine.vad_available = object(), True
+
+    list(engine.transcribe_batch([np.zeros(1000 + i, dtype=np.float32) for i in range(4)]))
+    assert engine.last_vad_regions == []
+
+    engine.transcribe(audio_array=np.ones(1600, dtype=np.float32) * 0.1)
+    assert engine.last_vad_regions == [(0, 1600)]
@@ -0,0 +1,130 @@
+import json
+import threading
+
+import pytest
+
+from src.core.llm_manager import LLMManager
+from src.monitoring.performance import PerformanceTracker
+from src.monitoring.trace_export import TraceExporter, to_chrome_trace
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Client:
+    def __init__(self, chunks=None, response=None):
+        self.chunks = chunks
+        self.response = response
+
+    def chat(self, **kwargs):
+        if kwargs.get("stream"):
+            return iter(self.chunks)
+        return self.response
+
+
+class _ModelManager:
+    def __init__(self, client):
+        self.client = client
+
+    def load_model(self, name):
+        return self.client
+
+
+def _manager(client, tracker):
+    config = {
+        "llm": {"model": "dummy"},
+        "vlm": {"model": "dummy-vlm"},
+        "memory": {"max_history": 5},
+        "web_search": {"enabled": False},
+    }
+    return LLMManager(config, _ModelManager(client), perf_tracker=tracker)
+
+
+def _names(trace):
+    return [e["name"] for e in trace["traceEvents"] if e["ph"] == "X"]
+
+
+def test_chrome_trace_nests_spans_and_names_threads():
+    tracker = PerformanceTracker()
+    with tracker.span('voice_turn') as turn:
+        with tracker.span('stt'):
+            pass
+        parent = tracker.current_span()
+        worker = threading.Thread(target=lambda: tracker.span('tts_synthesis', parent).end(), name="tts-synth")
+        worker.start()
+        worker.join()
+
+    trace = to_chrome_trace(turn)
+    events = {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+
+    assert set(events) == {'voice_turn', 'stt', 'tts_synthesis'}
+    assert events['voice_turn']["ts"] == 0
+    assert events['stt']["ts"] + events['stt']["dur"] <= events['voice_turn']["dur"]
+    assert events['tts_synthesis']["tid"] != events['stt']["tid"]
+    threads = {e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"}
+    assert "tts-synth" in threads
+    assert trace["otherData"]["turn"] == 'voice_turn'
+    json.dumps(trace)
+
+
+def test_non_stream_request_gets_ollama_server_phases():
+    tracker = PerformanceTracker()
+    response = {
+        "message": {"content": "Merhaba!"},
+        "load_duration": 0, "prompt_eval_count": 10,
+        "prompt_eval_duration": 100, "eval_count": 5, "eval_duration": 500,
+    }
+    manager = _manager(_Client(response=response), tracker)
+
+    with tracker.span('chat_turn') as turn:
+        manager.generate("selam", stream=False)
+
+    names = _names(to_chrome_trace(turn))
+    for name in ('model_load', 'prompt_build', 'llm_request', 'post_process'):
+        assert name in names
+    assert 'ollama_prompt_eval' in names
+    assert 'ollama_decode' in names
+
+
+def test_stream_splits_first_token_and_decode():
+    tracker = PerformanceTracker()
+    chunks = [{"message": {"content": "Merhaba."}}, {"message": {"content": " Nasılsın?"}}, {"done": True}]
+    manager = _manager(_Client(chunks=chunks), tracker)
+
+    with tracker.span('voice_turn') as turn:
+        list(manager.generate_sentences("selam"))
+
+    inference = next(c for c in turn.children if c.name == 'llm_inference')
+    children = [c.name for c in sorted(inference.children, key=lambda c: c.start_ns)]
+    assert children == ['model_load', 'prompt_build', 'first_token', 'token_stream']
+
+
+def test_exporter_samples_and_always_keeps_slow_turns(tmp_path):
+    tracker = PerformanceTracker()
+    exporter = TraceExporter(output_dir=str(tmp_path), sample_rate=0.1, slow_threshold=0.0,
+                             rng=lambda: 0.99).attach(tracker)
+
+    with tracker.span('chat_turn'):
+        pass
+    with tracker.span('warm_up'):
+        pass
+
+    files = list(tmp_path.glob("*.json"))
+    assert len(files) == 1
+    assert "chat_turn" in files[0].name
+
+    exporter.slow_threshold = None
+    with tracker.span('chat_turn'):
+        pass
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_exporter_prunes_old_files(tmp_path):
+    tracker = PerformanceTracker()
+    TraceExporter(output_dir=str(tmp_path), sample_rate=1.0, max_files=2).attach(tracker)
+
+    for _ in range(4):
+        with tracker.span('text_turn'):
+            pass
+
+    assert len(list(tmp_path.glob("*.json"))) == 2
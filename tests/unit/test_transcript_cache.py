@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from src.audio.transcript_cache import TranscriptCache
+
+
+pytestmark = pytest.mark.unit
+
+
+def _config(**cache):
+    return {
+        "model_size": "base", "language": "tr", "beam_size": 1,
+        "transcript_cache": {"enabled": True, "persist": True, **cache},
+    }
+
+
+def test_same_audio_hits_and_counts(tmp_path):
+    cache = TranscriptCache(_config(), cache_dir=tmp_path)
+    audio = np.linspace(-1, 1, 16000, dtype=np.float32)
+
+    key = cache.make_key(audio)
+    assert cache.get(key) is None
+    cache.set(key, "merhaba")
+
+    assert cache.get(cache.make_key(audio.copy())) == "merhaba"
+    assert cache.get_statistics()["hits"] == 1
+    assert cache.get_statistics()["misses"] == 1
+
+
+def test_settings_change_invalidates_key(tmp_path):
+    audio = np.zeros(1600, dtype=np.float32)
+    base = TranscriptCache(_config(), cache_dir=tmp_path)
+    other = _config()
+    other["beam_size"] = 5
+
+    assert base.make_key(audio) != TranscriptCache(other, cache_dir=tmp_path).make_key(audio)
+
+
+@pytest.mark.parametrize("key, value", [
+    ("vad_energy_threshold", 0.01), ("vad_hangover_ms", 500), ("vad_preroll_ms", 150),
+])
+def test_vad_trim_settings_invalidate_key(tmp_path, key, value):
+    audio = np.zeros(1600, dtype=np.float32)
+    base = TranscriptCache(_config(), cache_dir=tmp_path)
+
+    assert base.make_key(audio) != TranscriptCache({**_config(), key: value}, cache_dir=tmp_path).make_key(audio)
+
+
+def test_memory_budget_evicts_least_recently_used(tmp_path):
+    cache = TranscriptCache(_config(max_size_mb=0.001), cache_dir=tmp_path)
+
+    for i in range(10):
+        cache.set(f"k{i}", "x" * 100)
+
+    assert cache.get("k0") is None
+    assert cache.get("k9") == "x" * 100
+    assert cache.get_statistics()["size_kb"] <= 1.0
+
+
+def test_persisted_entries_are_reloaded(tmp_path):
+    cache = TranscriptCache(_config(), cache_dir=tmp_path)
+    key = cache.make_key(np.ones(160, dtype=np.float32))
+    cache.set(key, "tekrar")
+    cache.save()
+
+    reloaded = TranscriptCache(_config(), cache_dir=tmp_path)
+
+    assert reloaded.get(key) == "tekrar"
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from src.audio.tts_cache import TTSCache, normalize_phrase
+
+
+pytestmark = pytest.mark.unit
+
+
+def _cache(tmp_path, **cache_config):
+    return TTSCache({"cache": cache_config}, "test-voice", cache_dir=str(tmp_path))
+
+
+def test_roundtrip_returns_memory_mapped_audio(tmp_path):
+    cache = _cache(tmp_path)
+    audio = np.linspace(-1, 1, 4410, dtype=np.float32)
+
+    cache.set("Selam!", audio)
+    cached = cache.get("  Selam!  ")
+
+    assert isinstance(cached, np.memmap)
+    np.testing.assert_array_equal(cached, audio)
+    assert cache.get_statistics()["hits"] == 1
+
+
+def test_key_depends_on_speed_and_punctuation(tmp_path):
+    cache = _cache(tmp_path)
+    cache.set("Selam!", np.ones(100, dtype=np.float32), speed=1.0)
+
+    assert cache.get("Selam!", speed=1.2) is None
+    assert cache.get("Selam.") is None
+    assert normalize_phrase("Bir\n  sorun ") == "Bir sorun"
+
+
+def test_byte_budget_evicts_least_recently_used(tmp_path):
+    # ~0.4 MB butce, her ses ~0.16 MB
+    cache = _cache(tmp_path, max_size_mb=0.4)
+    audio = np.zeros(40000, dtype=np.float32)
+
+    cache.set("Bir", audio)
+    cache.set("Iki", audio)
+    cache.get("Bir")
+    cache.set("Uc", audio)
+
+    assert cache.get("Iki") is None
+    assert cache.get("Bir") is not None
+    assert len(list((tmp_path / "test-voice").glob("*.npy"))) == 2
+
+
+def test_long_text_is_not_cached(tmp_path):
+    cache = _cache(tmp_path, max_chars=10)
+    cache.set("Bu cumle on karakterden uzun.", np.ones(10, dtype=np.float32))
+
+    assert cache.get_statistics()["entries"] == 0
+
+
+def test_prewarm_skips_existing_and_persists(tmp_path):
+    calls = []
+
+    def synthesize(text):
+        calls.append(text)
+        return np.full(50, 0.5, dtype=np.float32)
+
+    cache = _cache(tmp_path)
+    assert cache.prewarm(synthesize, ["Selam!", "Merhaba!"]) == 2
+
+    reloaded = _cache(tmp_path)
+    assert reloaded.prewarm(synthesize, ["Selam!", "Merhaba!"]) == 0
+    assert calls == ["Selam!", "Merhaba!"]
+    assert reloaded.get("Merhaba!") is not None
@@ -0,0 +1,173 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.audio import tts_engine
+from src.audio.tts_engine import TTSEngine
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Chunk:
+    def __init__(self, value, size=2205):
+        self.audio_float_array = np.full(size, value, dtype=np.float32)
+
+
+class _FakeVoice:
+    def __init__(self, sentences=5):
+        self.sentences = sentences
+        self.produced = 0
+
+    def synthesize(self, text):
+        for i in range(self.sentences):
+            self.produced += 1
+            yield _Chunk(i / 10)
+
+
+class _FakeOutputStream:
+    """sounddevice.OutputStream arayuzu: yazilan bloklari toplar"""
+
+    instances = []
+
+    def __init__(self, samplerate, channels, dtype):
+        self.blocks = []
+        self.aborted = False
+        _FakeOutputStream.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def write(self, block):
+        self.blocks.append(block.copy())
+
+    def abort(self):
+        self.aborted = True
+
+
+@pytest.fixture
+def engine(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # TTS cache dizini (cache/tts) testte kalsin
+    _FakeOutputStream.instances.clear()
+    monkeypatch.setattr(tts_engine.sd, "OutputStream", _FakeOutputStream, raising=False)
+    engine = TTSEngine({"tts": {"sample_rate": 22050}})
+    engine.model = _FakeVoice()
+    return engine
+
+
+def test_synthesize_stream_yields_each_chunk_lazily(engine):
+    stream = engine.synthesize_stream("Bir. Iki. Uc.")
+
+    first = next(stream)
+
+    assert first.dtype == np.float32
+    assert engine.model.produced == 1
+
+
+def test_speak_writes_all_chunks_in_order(engine):
+    engine.speak("Bir. Iki.")
+
+    played = np.concatenate(_FakeOutputStream.instances[0].blocks).ravel()
+    assert played.size == 5 * 2205
+    assert played[0] == 0.0 and played[-1] == pytest.approx(0.4)
+
+
+def test_stop_aborts_playback_and_synthesis(engine, monkeypatch):
+    class _StoppingStream(_FakeOutputStream):
+        def write(self, block):
+            super().write(block)
+            engine.stop()
+
+    monkeypatch.setattr(tts_engine.sd, "OutputStream", _StoppingStream, raising=False)
+
+    engine.speak("Uzun bir cevap.")
+
+    stream = _FakeOutputStream.instances[0]
+    assert stream.aborted
+    assert len(stream.blocks) == 1
+
+
+def test_short_phrase_is_served_from_cache_second_time(engine):
+    first = np.concatenate(list(engine.synthesize_stream("Selam!")))
+    produced = engine.model.produced
+
+    second = list(engine.synthesize_stream("Selam!"))
+
+    assert engine.model.produced == produced
+    assert len(second) == 1
+    np.testing.assert_array_equal(second[0], first)
+
+
+def test_cancelled_synthesis_is_not_cached(engine):
+    cancel = threading.Event()
+    stream = engine.synthesize_stream("Merhaba!", cancel_event=cancel)
+    next(stream)
+    cancel.set()
+    list(stream)
+
+    assert engine.phrase_cache.get("Merhaba!") is None
+
+
+class _SentenceVoice:
+    """piper-tts 1.3 cumle API'si: ilk cumleler en yavas (sira karisma riski)"""
+
+    def __init__(self, sentences=6):
+        self.sentences = sentences
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def phonemize(self, text):
+        return [[str(i)] for i in range(self.sentences)]
+
+    def phonemes_to_ids(self, phonemes):
+        return [int(phonemes[0])]
+
+    def phoneme_ids_to_audio(self, phoneme_ids):
+        index = phoneme_ids[0]
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.02 * (self.sentences - index))
+        with self.lock:
+            self.active -= 1
+        return np.full(100 + index, 2.0, dtype=np.float32)
+
+
+def test_parallel_workers_keep_sentence_order(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    engine = TTSEngine({"tts": {"num_workers": 3, "num_threads": 6, "cache": {"enabled": False}}})
+    engine.model = _SentenceVoice()
+
+    chunks = list(engine.synthesize_stream("Uzun bir cevap."))
+
+    assert engine._intra_op_threads() == 2
+    assert engine.model.max_active > 1
+    # Sira korunur, her cumle tepe degerine normalize edilir
+    assert [chunk.size for chunk in chunks] == [100, 101, 102, 103, 104, 105]
+    assert all(np.all(chunk == 1.0) for chunk in chunks)
+    assert engine._pool._max_workers == 3
+
+
+def test_speak_stream_plays_every_sentence_and_closes_source(engine):
+    closed = []
+
+    def sentences():
+        try:
+            yield "Bir."
+            yield "Iki."
+            yield "Uc."
+        finally:
+            closed.append(True)
+
+    engine.speak_stream(sentences())
+
+    assert closed == [True]
+    assert engine.last_playback_start is not None
+    played = np.concatenate(_FakeOutputStream.instances[0].blocks)
+    assert played.size == 3 * 5 * 2205
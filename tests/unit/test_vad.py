@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from src.audio.vad import detect_speech_regions, frame_view, trim_to_regions
+
+
+pytestmark = pytest.mark.unit
+
+SR = 16000
+FRAME = 480  # 30 ms
+
+
+class _CountingVad:
+    """webrtcvad.Vad arayuzu: int16 karede genlik > 1000 ise konusma"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def is_speech(self, frame_bytes, sample_rate):
+        self.calls += 1
+        return np.abs(np.frombuffer(frame_bytes, dtype=np.int16)).max() > 1000
+
+
+def _speech_between(total_frames, start_frame, end_frame):
+    audio = np.zeros(total_frames * FRAME, dtype=np.float32)
+    t = np.arange((end_frame - start_frame) * FRAME) / SR
+    audio[start_frame * FRAME:end_frame * FRAME] = 0.3 * np.sin(2 * np.pi * 200 * t)
+    return audio
+
+
+def test_frame_view_is_a_view():
+    audio = np.zeros(FRAME * 3 + 7, dtype=np.float32)
+
+    frames = frame_view(audio, FRAME)
+
+    assert frames.shape == (3, FRAME)
+    assert np.shares_memory(frames, audio)
+
+
+def test_silent_frames_skip_the_classifier():
+    audio = _speech_between(100, 40, 60)
+    vad = _CountingVad()
+
+    detect_speech_regions(audio, SR, vad=vad, hangover_ms=0, preroll_ms=0)
+
+    assert vad.calls == 20
+
+
+def test_regions_include_preroll_and_hangover():
+    audio = _speech_between(100, 40, 60)
+
+    regions = detect_speech_regions(audio, SR, vad=_CountingVad(), hangover_ms=300, preroll_ms=90)
+
+    assert regions == [(37 * FRAME, 70 * FRAME)]
+
+
+def test_short_gaps_are_bridged_by_hangover():
+    audio = _speech_between(100, 10, 20) + _speech_between(100, 25, 35)
+
+    regions = detect_speech_regions(audio, SR, vad=_CountingVad(), hangover_ms=300, preroll_ms=0)
+
+    assert len(regions) == 1
+
+
+def test_trim_keeps_region_samples_in_order():
+    audio = np.arange(10, dtype=np.float32)
+
+    trimmed = trim_to_regions(audio, [(1, 3), (6, 8)])
+
+    np.testing.assert_array_equal(trimmed, [1, 2, 6, 7])
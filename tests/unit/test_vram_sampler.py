@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.monitoring import vram_monitor
+from src.monitoring.vram_monitor import SAMPLE_FIELDS, VRAMMonitor, VRAMSampler
+
+
+pytestmark = pytest.mark.unit
+
+
+class _FakeMonitor:
+    def __init__(self):
+        self.reads = 0
+        self.warnings = 0
+
+    def read_sample(self):
+        self.reads += 1
+        return np.array([time.time(), float(self.reads), 8.0, 50.0, np.nan])
+
+    def check_memory_warning(self):
+        self.warnings += 1
+
+
+def test_ring_buffer_keeps_latest_in_order():
+    monitor = _FakeMonitor()
+    sampler = VRAMSampler(monitor, interval=60, history=3)
+    for _ in range(5):
+        sampler.sample()
+
+    history = sampler.history()
+    assert history.shape == (3, len(SAMPLE_FIELDS))
+    assert list(history[:, 1]) == [3.0, 4.0, 5.0]
+
+
+def test_latest_reads_buffer_without_nvml():
+    monitor = _FakeMonitor()
+    sampler = VRAMSampler(monitor, interval=60).start()
+    try:
+        reads = monitor.reads
+        for _ in range(10):
+            sample = sampler.latest()
+        assert monitor.reads == reads
+        assert sample["used_gb"] == 1.0
+        assert sample["temperature_celsius"] is None
+    finally:
+        sampler.stop()
+
+    # Durdurulan ornekleyici canli veri sunmaz
+    assert sampler.latest() is None
+
+
+def test_background_thread_samples_at_interval():
+    monitor = _FakeMonitor()
+    sampler = VRAMSampler(monitor, interval=0.1).start()
+    time.sleep(0.35)
+    sampler.stop()
+
+    assert monitor.reads >= 3
+    assert monitor.warnings >= 2
+
+
+def test_stale_sample_is_ignored():
+    sampler = VRAMSampler(_FakeMonitor(), interval=60).start()
+    try:
+        assert sampler.latest(max_age=-1) is None
+    finally:
+        sampler.stop()
+
+
+def test_without_gpu_monitor_uses_null_sampler(monkeypatch):
+    monkeypatch.setattr(vram_monitor, "PYNVML_AVAILABLE", False)
+    monitor = VRAMMonitor({"hardware": {"gpu_memory_limit": 8}})
+
+    sampler = monitor.start_sampler()
+
+    assert not sampler.enabled
+    assert sampler.latest() is None
+    assert sampler.history().shape == (0, len(SAMPLE_FIELDS))
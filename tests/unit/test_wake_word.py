@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from src.audio.wake_word import WakeWordGate, match_phrase, normalize_words
+
+
+pytestmark = pytest.mark.unit
+
+
+class _Segment:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeTiny:
+    def __init__(self, heard):
+        self.heard = heard
+        self.windows = []
+
+    def transcribe(self, audio, **kwargs):
+        self.windows.append(audio.size)
+        return [_Segment(self.heard)], None
+
+
+class _FakeModelManager:
+    def __init__(self, heard):
+        self.model = _FakeTiny(heard)
+        self.loads = []
+
+    def load_model(self, name):
+        self.loads.append(name)
+        return self.model
+
+
+def _gate(heard, **wake_word):
+    config = {"language": "tr", "wake_word": {"enabled": True, "phrases": ["hey asistan"], **wake_word}}
+    manager = _FakeModelManager(heard)
+    return WakeWordGate(config, manager), manager
+
+
+def _speech(seconds=4.0):
+    t = np.arange(int(16000 * seconds)) / 16000
+    return (0.2 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def test_silence_never_reaches_a_model():
+    gate, manager = _gate("hey asistan")
+
+    result = gate.check(np.zeros(16000 * 3, dtype=np.float32))
+
+    assert not result["passed"] and result["reason"] == "no_speech"
+    assert manager.loads == []
+
+
+def test_wake_phrase_passes_with_short_window():
+    gate, manager = _gate(" Hey asistanım, hava nasıl?", window_sec=1.5)
+
+    result = gate.check(_speech())
+
+    assert result["passed"] and result["reason"] == "wake_word"
+    assert manager.loads == ["kws"]
+    assert manager.model.windows == [24000]
+
+
+def test_background_talk_is_rejected():
+    gate, _ = _gate("Akşam yemeğinde ne var?")
+
+    result = gate.check(_speech())
+
+    assert not result["passed"]
+    assert gate.get_statistics()["skip_rate"] == 1.0
+
+
+def test_follow_up_window_skips_the_model():
+    gate, manager = _gate("hey asistan")
+    gate.check(_speech())
+    manager.model.heard = "ve yarın?"
+
+    result = gate.check(_speech())
+
+    assert result["passed"] and result["reason"] == "follow_up"
+    assert manager.model.windows == [32000]
+
+
+def test_strip_wake_phrase_and_turkish_normalization():
+    gate, _ = _gate("")
+
+    assert gate.strip_wake_phrase("Hey Asistan, hava nasıl?") == "hava nasıl?"
+    assert gate.strip_wake_phrase("Hey asistan,hava nasıl?") == "hava nasıl?"
+    assert gate.strip_wake_phrase("Hava nasıl?") == "Hava nasıl?"
+    assert normalize_words("İSTANBUL'DA IŞIK") == ["istanbul", "da", "ışık"]
+    assert match_phrase(["şey", "asistam"], ["asistan"])[0] > 0.8
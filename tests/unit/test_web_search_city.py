@@ -0,0 +1,45 @@
+import pytest
+
+from src.tools.web_search import SEHIR_ALIASES, SEHIR_COORDS, WebSearchTool
+
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def tool():
+    return WebSearchTool({"web_search": {"enabled": True}})
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("İzmir'de hava nasıl", "izmir"),
+    ("Ankara'nın havası", "ankara"),
+    ("ankarada yarın yağmur var mı", "ankara"),
+    ("İstanbul hava durumu", "istanbul"),
+    ("Van'da kar", "van"),
+    ("antepte hava", "antep"),
+])
+def test_detect_city_handles_turkish_suffixes(tool, text, expected):
+    assert tool.detect_city(text) == expected
+
+
+def test_short_aliases_do_not_match_inside_words(tool):
+    assert tool.detect_city("vana lazım") is None
+    assert tool.detect_city("kasa nerede") is None
+
+
+@pytest.mark.parametrize("text", [
+    "yağmura karşı ne giymeli hava",
+    "ağrısı",
+    "aydınlık",
+])
+def test_derivational_suffixes_are_not_cities(tool, text):
+    assert tool.detect_city(text) is None
+
+
+def test_detect_cities_keeps_text_order(tool):
+    assert tool.detect_cities("İstanbul, Ankara ve İzmir'de hava") == ["istanbul", "ankara", "izmir"]
+
+
+def test_every_alias_has_coordinates():
+    assert set(SEHIR_ALIASES.values()) <= set(SEHIR_COORDS)
@@ -0,0 +1,116 @@
+import pytest
+
+from src.tools import web_search
+from src.tools.web_search import WebSearchTool
+
+
+pytestmark = pytest.mark.unit
+
+
+def _location(temp):
+    return {
+        "current": {
+            "temperature_2m": temp,
+            "apparent_temperature": temp,
+            "relative_humidity_2m": 50,
+            "wind_speed_10m": 10,
+            "weather_code": 0,
+        },
+        "daily": {
+            "temperature_2m_max": [temp + 5, temp + 6],
+            "temperature_2m_min": [temp - 5, temp - 4],
+            "weather_code": [0, 1],
+            "precipitation_probability_max": [0, 10],
+        },
+    }
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+@pytest.fixture
+def fake_requests(monkeypatch):
+    calls = []
+
+    def fake_get(url, timeout=None):
+        calls.append(url)
+        count = url.split("latitude=", 1)[1].split("&", 1)[0].count(",") + 1
+        payload = [_location(10 + i) for i in range(count)]
+        return _Response(payload if count > 1 else payload[0])
+
+    monkeypatch.setattr(web_search, "REQUESTS_AVAILABLE", True)
+    monkeypatch.setattr(web_search.requests, "get", fake_get)
+    return calls
+
+
+def test_multi_city_weather_uses_single_request(fake_requests):
+    tool = WebSearchTool({"web_search": {"enabled": True}})
+
+    result = tool.get_weather_multi(["istanbul", "ankara", "izmir"])
+
+    assert len(fake_requests) == 1
+    assert "Anlık sıcaklık: 10°C" in result["istanbul"]
+    assert "Anlık sıcaklık: 12°C" in result["izmir"]
+    assert tool._get_cache("weather_Ankara") == result["ankara"]
+
+
+def test_multi_city_query_returns_block_per_city(fake_requests):
+    tool = WebSearchTool({"web_search": {"enabled": True}})
+
+    text = tool.smart_search("İstanbul, Ankara ve İzmir'de hava nasıl")
+
+    assert len(fake_requests) == 1
+    for header in ("ISTANBUL HAVA DURUMU", "ANKARA HAVA DURUMU", "IZMIR HAVA DURUMU"):
+        assert header in text
+
+
+def test_four_city_weather_is_not_truncated(fake_requests):
+    tool = WebSearchTool({"web_search": {"enabled": True}})
+
+    text = tool.smart_search("İstanbul, Ankara, İzmir ve Bursa'da hava nasıl")
+
+    assert len(fake_requests) == 1
+    assert " ..." not in text
+    assert text.count("Yarın:") == 4
+    assert tool.last_context_stats["tokens_after"] <= tool.last_context_stats["tokens_before"]
+
+
+def test_prefetch_warms_most_asked_cities(fake_requests):
+    tool = WebSearchTool({"web_search": {"enabled": True, "weather_prefetch_top": 2}})
+    tool._city_requests.update({"Trabzon": 3, "Rize": 2, "Van": 1})
+
+    assert tool.prefetch_weather() == 2
+    assert "latitude=41.0,41.02" in fake_requests[0]
+    assert tool._get_cache("weather_Trabzon") is not None
+    assert tool._get_cache("weather_Van") is None
+
+
+def test_prefetch_thread_starts_only_when_enabled(fake_requests, monkeypatch):
+    monkeypatch.setattr(web_search, "DDGS_AVAILABLE", True)
+    disabled = WebSearchTool({"web_search": {"enabled": False, "weather_prefetch_interval": 60}})
+    tool = WebSearchTool({"web_search": {"enabled": True, "weather_prefetch_interval": 60}})
+    try:
+        assert disabled._prefetch_thread is None
+        thread = tool._prefetch_thread
+        assert thread.is_alive()
+    finally:
+        tool.stop_weather_prefetch()
+
+    assert not thread.is_alive()
+
+
+def test_endpoint_override_routes_requests(fake_requests):
+    stub = "http://127.0.0.1:9999/v1/forecast"
+    tool = WebSearchTool({"web_search": {"enabled": True, "endpoints": {"open_meteo": stub}}})
+
+    tool.get_weather_multi(["istanbul"])
+
+    assert fake_requests[0].startswith(stub + "?")
+    assert tool.endpoints["coingecko"] == web_search.DEFAULT_ENDPOINTS["coingecko"]